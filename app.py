@@ -1,8 +1,13 @@
 # app.py
 
 from flask import Flask, request, redirect, url_for, jsonify
+from werkzeug.serving import make_server, WSGIRequestHandler
 import os
 import sys
+import time
+import argparse
+import threading
+import multiprocessing
 
 # Importez les classes de modèles (ConfigManager et StravaClient)
 # Elles seront utilisées via les instances passées en argument.
@@ -14,6 +19,31 @@ app = Flask(__name__)
 # Une clé secrète est nécessaire pour les sessions Flask
 app.secret_key = os.urandom(24) 
 
+# Serveur HTTP en cours (créé par run_flask_server), pour pouvoir l'arrêter proprement
+_server = None
+_server_lock = threading.Lock()
+_started_at = time.time()
+
+
+@app.route('/health')
+def health():
+    """État du service (supervision, load-balancer) : toujours rapide, sans appel externe."""
+    status = {
+        "status": "ok",
+        "uptime_s": round(time.time() - _started_at, 1),
+        "server": app.config.get('SERVER_BACKEND'),
+    }
+    scheduler = app.config.get('POLLING_SCHEDULER')
+    if scheduler is not None:
+        status["polling"] = scheduler.is_running
+        status["last_check_time"] = scheduler.last_check_time
+        status["sync_queue"] = scheduler.sync_queue.qsize()
+        notion_client = scheduler.notion_client
+        if notion_client is not None and notion_client.concurrency is not None:
+            status["notion_concurrency"] = notion_client.concurrency.limit
+            status["notion_throughput_rps"] = round(notion_client.concurrency.throughput(), 2)
+    return jsonify(status)
+
 
 @app.route('/auth/callback')
 def strava_callback():
@@ -49,39 +79,168 @@ def strava_callback():
     return "Code d'autorisation manquant.", 400
 
 
+# --- Serveurs HTTP ---
+class _TimeoutRequestHandler(WSGIRequestHandler):
+    """Requêtes Werkzeug avec délai d'inactivité sur la socket (une connexion lente ne bloque pas un thread)."""
+    timeout = 30
+
+
+class _WaitressServer:
+    """Adaptateur : même interface (serve_forever / shutdown / server_close) que le serveur Werkzeug."""
+
+    def __init__(self, server):
+        self._server = server
+        self._stopped = threading.Event()
+
+    def serve_forever(self):
+        try:
+            self._server.run()
+        finally:
+            self._stopped.set()
+
+    def shutdown(self):
+        # La boucle de waitress se termine lorsque plus aucune socket n'est surveillée. Les sockets
+        # sont fermées dans le thread de la boucle (trigger) : fermées depuis un autre thread, elles
+        # feraient échouer le select en cours (« Bad file descriptor »).
+        def close_all_channels():
+            for channel in list(self._server._map.values()):
+                channel.close()
+
+        self._server.trigger.pull_trigger(close_all_channels)
+        self._stopped.wait()
+        self._server.task_dispatcher.shutdown()
+
+    def server_close(self):
+        # Sans effet si shutdown() a déjà arrêté les threads de traitement
+        self._server.task_dispatcher.shutdown()
+
+
+def create_server(host: str, port: int, mode: str = "production", threads: int = 8, request_timeout: int = 30):
+    """
+    Crée le serveur HTTP de l'application :
+    - mode 'production' : waitress (pool de threads borné, délai par connexion) si installé,
+      sinon serveur Werkzeug multi-threadé avec délai par requête ;
+    - mode 'dev' : serveur Werkzeug multi-threadé (usage OAuth ponctuel).
+    Retourne (serveur, nom du backend).
+    """
+    if mode == "production":
+        try:
+            import waitress
+            server = waitress.create_server(app, host=host, port=port, threads=threads,
+                                            channel_timeout=request_timeout)
+            return _WaitressServer(server), f"waitress ({threads} threads)"
+        except ImportError:
+            print("AVERTISSEMENT: waitress non installé (pip install waitress). Repli sur le serveur Werkzeug multi-threadé.")
+
+    _TimeoutRequestHandler.timeout = request_timeout
+    return make_server(host, port, app, threaded=True, request_handler=_TimeoutRequestHandler), "werkzeug (threads)"
+
+
 # --- Fonction de Démarrage en Thread ---
-def run_flask_server(config_manager_instance, strava_client_instance):
+def run_flask_server(config_manager_instance, strava_client_instance, polling_scheduler=None, port: int = None):
     """
-    Lance le serveur Flask. C'est cette fonction qui est appelée par gui.py dans un nouveau thread.
+    Lance le serveur Flask. C'est cette fonction qui est appelée par gui.py dans un nouveau thread
+    (et par le mode sans interface : python app.py).
     Les instances de ConfigManager et StravaClient sont passées ici.
+    port : port ponctuel (--port) ; sinon FLASK_PORT de la configuration.
     """
     
     # Stocker les instances dans le contexte de l'application Flask pour usage dans les routes
     app.config['CONFIG_MANAGER'] = config_manager_instance
     app.config['STRAVA_CLIENT'] = strava_client_instance
+    app.config['POLLING_SCHEDULER'] = polling_scheduler
     
-    # Récupérer le port configuré
+    # Récupérer le port configuré (sauf port ponctuel passé en argument)
     port_str = config_manager_instance.get("FLASK_PORT")
-    if port_str and port_str.isdigit():
-        port = int(port_str)
-    else:
-        port = 5000
-        print("Avertissement: FLASK_PORT non défini ou invalide, utilisant le port 5000.")
-        
-    print(f"Démarrage du micro-serveur Flask sur http://0.0.0.0:{port}...")
+    if not port:
+        if port_str and port_str.isdigit():
+            port = int(port_str)
+        else:
+            port = 5000
+            print("Avertissement: FLASK_PORT non défini ou invalide, utilisant le port 5000.")
+    
+    # Serveur créé explicitement (plutôt que app.run) pour pouvoir l'arrêter avec stop_flask_server
+    global _server
+    server, backend = create_server(
+        '0.0.0.0', port,
+        mode=(config_manager_instance.get("SERVER_MODE") or "production").strip().lower(),
+        threads=config_manager_instance.get_int("SERVER_THREADS", 8),
+        request_timeout=config_manager_instance.get_int("SERVER_REQUEST_TIMEOUT", 30)
+    )
+    app.config['SERVER_BACKEND'] = backend
+    with _server_lock:
+        _server = server
+    
+    print(f"Démarrage du serveur {backend} sur http://0.0.0.0:{port}...")
     print("Veuillez effectuer l'autorisation Strava dans le navigateur qui va s'ouvrir.")
     
-    # use_reloader=False et debug=False sont ESSENTIELS pour le threading
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+    try:
+        server.serve_forever()
+    finally:
+        with _server_lock:
+            if _server is server:
+                _server = None
+        server.server_close()
+
+
+def stop_flask_server(timeout: float = 5.0) -> bool:
+    """
+    Arrête le serveur lancé par run_flask_server : plus de nouvelles connexions, les requêtes
+    en cours se terminent. Retourne False si le serveur ne s'est pas arrêté dans le délai.
+    """
+    with _server_lock:
+        server = _server
+    if server is None:
+        return True
+    # shutdown() attend la fin de serve_forever : exécuté à part pour respecter le délai
+    stopper = threading.Thread(target=server.shutdown, daemon=True)
+    stopper.start()
+    stopper.join(timeout)
+    if not stopper.is_alive():
+        print("INFO: Serveur Flask arrêté.")
+    return not stopper.is_alive()
+
+
+def run_headless(port: int = None, polling: bool = False, interval_minutes: int = 15):
+    """
+    Mode sans interface : serveur HTTP (et éventuellement polling) dans le processus courant,
+    arrêt ordonné sur Ctrl+C / SIGTERM.
+    """
+    from models.lifecycle_manager import LifecycleManager
+    
+    cfg = ConfigManager()
+    st_client = StravaClient(cfg)
+    lifecycle = LifecycleManager(deadline_seconds=cfg.get_int("SHUTDOWN_TIMEOUT", 10))
+    
+    scheduler = None
+    if polling:
+        from models.polling_scheduler import PollingScheduler
+        scheduler = PollingScheduler(cfg, interval_minutes=interval_minutes)
+        scheduler._create_notion_client()
+        scheduler.start()
+        lifecycle.register("Synchronisation", scheduler.shutdown)
+    lifecycle.register("Serveur HTTP", stop_flask_server)
+    
+    # Le serveur tourne dans un thread : le thread principal reste libre pour les signaux
+    # (un --port ponctuel n'est pas enregistré dans le .env)
+    server_thread = threading.Thread(target=run_flask_server, args=(cfg, st_client, scheduler, port), daemon=True)
+    server_thread.start()
+    lifecycle.install_signal_handlers()
+    while server_thread.is_alive():
+        server_thread.join(0.5)
 
     
 if __name__ == '__main__':
-    # Logique de démarrage pour les tests manuels de app.py
+    # Exécutable PyInstaller : les processus du pool CPU (spawn) ne doivent pas relancer l'application
+    multiprocessing.freeze_support()
+    # Mode sans interface (serveur de production, polling optionnel) et tests manuels de app.py
+    parser = argparse.ArgumentParser(description="Serveur Strava-Notion sans interface graphique.")
+    parser.add_argument("--port", type=int, help="Port HTTP (défaut : FLASK_PORT du .env).")
+    parser.add_argument("--polling", action="store_true", help="Lance aussi le polling Strava -> Notion.")
+    parser.add_argument("--interval", type=int, default=15, help="Intervalle de polling en minutes (défaut : 15).")
+    args = parser.parse_args()
     try:
-        # NOTE: Assurez-vous que ConfigManager et StravaClient sont bien importables
-        cfg = ConfigManager()
-        st_client = StravaClient(cfg)
-        run_flask_server(cfg, st_client)
+        run_headless(port=args.port, polling=args.polling, interval_minutes=args.interval)
     except Exception as e:
         print(f"Erreur lors du lancement manuel de app.py: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
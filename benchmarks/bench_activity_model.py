@@ -0,0 +1,87 @@
+# benchmarks/bench_activity_model.py
+"""
+Benchmark du modèle Activity (dataclass à slots) face aux dicts JSON de Strava,
+sur un historique synthétique (50 000 activités par défaut).
+
+Pour chaque représentation :
+- mémoire conservée par l'historique complet (tracemalloc) ;
+- temps de construction depuis les pages JSON ;
+- temps d'un passage "consommateur" (valeurs des propriétés Notion + agrégats), comme dans
+  _sync_activities_list.
+
+Usage : python benchmarks/bench_activity_model.py [--activities 50000]
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_json_decode import make_pages
+from models import json_codec
+from models.activity import decode_activities
+
+
+def consume_dicts(activities):
+    """Ancien code : conversions refaites à chaque lecture d'un dict Strava."""
+    total = 0.0
+    for activity in activities:
+        distance_km = activity.get('distance', 0) / 1000.0
+        duration_min = activity.get('moving_time', 0) / 60.0
+        day = activity['start_date_local'].split('T')[0]
+        values = (activity['id'], activity.get('name', 'Activité sans nom'), day,
+                  round(distance_km, 2), round(duration_min, 2), activity.get('type', 'Inconnu'),
+                  activity.get('total_elevation_gain'), activity.get('average_heartrate'),
+                  activity.get('description', ''))
+        suffer_score = activity.get('suffer_score')
+        total += suffer_score if suffer_score is not None else activity.get('moving_time', 0) / 60.0
+        total += len(values)
+    return total
+
+
+def consume_activities(activities):
+    """Nouveau code : attributs déjà convertis à l'ingestion."""
+    total = 0.0
+    for activity in activities:
+        values = (activity.id, activity.name, activity.local_date,
+                  round(activity.distance_km, 2), round(activity.duration_min, 2), activity.type,
+                  activity.elevation_gain, activity.average_heartrate, activity.description)
+        total += activity.suffer_score if activity.suffer_score is not None else activity.duration_min
+        total += len(values)
+    return total
+
+
+def measure(label: str, decode_page, consume, pages):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    history = [activity for page in pages for activity in decode_page(page)]
+    build_time = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    consume(history)
+    consume_time = time.perf_counter() - start
+
+    print(f"{label:<32}{retained / 1e6:>10.1f} Mo{retained / len(history):>10.0f} o"
+          f"{build_time * 1000:>12.0f} ms{consume_time * 1000:>12.1f} ms")
+    del history
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du modèle Activity.")
+    parser.add_argument("--activities", type=int, default=50000)
+    args = parser.parse_args()
+
+    pages = make_pages(args.activities)
+    print(f"{args.activities} activités, backend JSON : {json_codec.BACKEND}\n")
+    print(f"{'Représentation':<32}{'Mémoire':>13}{'/activité':>12}{'Construction':>15}{'Lecture':>15}")
+
+    measure("dict Strava complet", json.loads, consume_dicts, pages)
+    measure("dict réduit (decode_summaries)", json_codec.decode_activity_summaries, consume_dicts, pages)
+    measure("Activity (slots)", decode_activities, consume_activities, pages)
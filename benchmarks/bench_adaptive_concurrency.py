@@ -0,0 +1,95 @@
+# benchmarks/bench_adaptive_concurrency.py
+"""
+Simulation du contrôleur de concurrence adaptative (models/adaptive_concurrency.py) face à une API
+simulée dont la capacité dépend de la charge de l'espace de travail : la latence augmente au-delà de
+`capacity` requêtes simultanées, et l'API répond 429 (avec Retry-After) au-delà de 1,5 × capacity.
+La capacité chute à mi-parcours. Compare le débit obtenu avec des concurrences fixes.
+
+Usage : python benchmarks/bench_adaptive_concurrency.py [--seconds 20] [--workers 16]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+
+class SimulatedApi:
+    """API simulée : latence de base, ralentie au-delà de `capacity` requêtes simultanées."""
+
+    def __init__(self, capacity: int, latency: float = 0.05, retry_after: float = 0.5):
+        self.capacity, self.latency, self.retry_after = capacity, latency, retry_after
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def call(self):
+        """Retourne (code HTTP, Retry-After)."""
+        with self._lock:
+            if self.in_flight >= 1.5 * self.capacity:
+                return 429, self.retry_after
+            self.in_flight += 1
+            load = self.in_flight
+        time.sleep(self.latency * max(1.0, load / self.capacity))
+        with self._lock:
+            self.in_flight -= 1
+        return 200, None
+
+
+def run(api: SimulatedApi, limiter, workers: int, seconds: float, phases):
+    """Workers en boucle pendant `seconds` ; phases = [(instant, capacité)] appliquées au fil de l'eau."""
+    stop = threading.Event()
+    done = [0]
+    throttled = [0]
+    count_lock = threading.Lock()
+
+    def worker():
+        while not stop.is_set():
+            if limiter:
+                limiter.acquire()
+            start = time.perf_counter()
+            status, retry_after = api.call()
+            if limiter:
+                limiter.release(time.perf_counter() - start, status, retry_after)
+            elif status == 429:
+                time.sleep(retry_after)
+            with count_lock:
+                if status == 200:
+                    done[0] += 1
+                else:
+                    throttled[0] += 1
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    start = time.monotonic()
+    timeline = []
+    for second in range(int(seconds)):
+        api.capacity = [capacity for at, capacity in phases if at <= second][-1]
+        time.sleep(max(0.0, start + second + 1 - time.monotonic()))
+        if limiter:
+            timeline.append(limiter.limit)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return done[0] / seconds, throttled[0], timeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulation de la concurrence adaptative Notion.")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+    phases = [(0, 8), (args.seconds / 2, 3)] # espace de travail plus chargé à mi-parcours
+
+    print(f"API simulée : capacité 8 puis 3 requêtes simultanées après {args.seconds / 2:.0f} s, latence 50 ms\n")
+    for label, limiter, workers in (("fixe, 3 workers", None, 3),
+                                    (f"fixe, {args.workers} workers", None, args.workers),
+                                    ("adaptative (AIMD)", AdaptiveConcurrencyLimiter(3, 1, args.workers), args.workers)):
+        rate, throttled, timeline = run(SimulatedApi(8), limiter, workers, args.seconds, phases)
+        print(f"{label:<22}{rate:>8.1f} req/s{throttled:>8} × 429")
+        if timeline:
+            print(f"{'':<22}limite seconde par seconde : {' '.join(map(str, timeline))}")
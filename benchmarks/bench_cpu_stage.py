@@ -0,0 +1,82 @@
+# benchmarks/bench_cpu_stage.py
+"""
+Benchmark de l'étape CPU (models/cpu_stage.py) : décodage des tracés et calcul de leur distance
+pour 10 000 activités synthétiques, dans le thread appelant puis dans le pool de processus.
+Mesure aussi la latence maximale d'un thread « E/S » qui se réveille toutes les 5 ms pendant le
+calcul : c'est le blocage que subiraient les workers Notion et la boucle Tkinter.
+
+Usage : python benchmarks/bench_cpu_stage.py [--activities 10000] [--points 300] [--workers 4]
+"""
+import os
+import sys
+import time
+import math
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.cpu_stage import CpuStage
+from models.polyline import encode, route_summary
+
+
+def synthetic_polylines(count: int, points: int):
+    """Boucles aléatoires autour de Lyon, d'environ `points` points chacune."""
+    rng = random.Random(42)
+    polylines = []
+    for _ in range(count):
+        lat, lon = 45.76 + rng.uniform(-0.2, 0.2), 4.83 + rng.uniform(-0.2, 0.2)
+        heading = rng.uniform(0, 2 * math.pi)
+        route = []
+        for _ in range(points):
+            heading += rng.uniform(-0.3, 0.3)
+            lat += 0.0004 * math.cos(heading)
+            lon += 0.0006 * math.sin(heading)
+            route.append((lat, lon))
+        polylines.append(encode(route))
+    return polylines
+
+
+def measure(stage: CpuStage, polylines):
+    """Durée du calcul et pire retard d'un thread qui se réveille toutes les 5 ms."""
+    stop = threading.Event()
+    worst_delay = [0.0]
+
+    def ticker():
+        while not stop.is_set():
+            expected = time.perf_counter() + 0.005
+            time.sleep(0.005)
+            worst_delay[0] = max(worst_delay[0], time.perf_counter() - expected)
+
+    thread = threading.Thread(target=ticker)
+    thread.start()
+    start = time.perf_counter()
+    summaries = stage.map(route_summary, polylines)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    return summaries, elapsed, worst_delay[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de l'étape CPU (tracés).")
+    parser.add_argument("--activities", type=int, default=10000)
+    parser.add_argument("--points", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    polylines = synthetic_polylines(args.activities, args.points)
+    print(f"{args.activities} tracés de {args.points} points\n")
+    print(f"{'Exécution':<24}{'Durée':>10}{'Tracés/s':>12}{'Retard E/S max':>17}")
+
+    reference = None
+    for label, stage in (("thread appelant", CpuStage(workers=1)),
+                         (f"{args.workers} processus", CpuStage(workers=args.workers, chunk_size=args.chunk_size))):
+        stage.map(route_summary, polylines[:args.chunk_size + 1]) # démarrage du pool hors mesure
+        summaries, elapsed, delay = measure(stage, polylines)
+        stage.shutdown()
+        reference = reference or summaries
+        assert summaries == reference
+        print(f"{label:<24}{elapsed:>8.2f} s{len(polylines) / elapsed:>12.0f}{delay * 1000:>14.1f} ms")
@@ -0,0 +1,47 @@
+# benchmarks/bench_dates.py
+"""
+Benchmark de la conversion des dates Strava en timestamps (models/date_utils.py) sur
+100 000 dates par défaut : datetime.fromisoformat date par date vs conversion NumPy vectorisée,
+puis regroupement par jour local (chaînes ISO vs local_epoch).
+
+Usage : python benchmarks/bench_dates.py [--timestamps 100000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, date, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.date_utils import parse_epoch, parse_epochs, epoch_to_day
+
+
+def synthetic_dates(count: int):
+    rng = random.Random(42)
+    start = int(datetime(2015, 1, 1, tzinfo=timezone.utc).timestamp())
+    return [datetime.fromtimestamp(start + rng.randrange(10 * 365 * 86400), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            for _ in range(count)]
+
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label:<44}{(time.perf_counter() - start) * 1000:>8.0f} ms")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la conversion des dates Strava.")
+    parser.add_argument("--timestamps", type=int, default=100000)
+    args = parser.parse_args()
+
+    values = synthetic_dates(args.timestamps)
+    print(f"{args.timestamps} dates\n")
+    looped = timed("parse_epoch (fromisoformat, date par date)", lambda: [parse_epoch(v) for v in values])
+    vectorised = timed("parse_epochs (NumPy datetime64)", parse_epochs, values)
+    assert looped == vectorised
+
+    timed("jour local depuis la chaîne ISO", lambda: [date.fromisoformat(v[:10]) for v in values])
+    timed("jour local depuis local_epoch", lambda: [epoch_to_day(e) for e in vectorised])
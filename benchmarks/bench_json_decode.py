@@ -0,0 +1,102 @@
+# benchmarks/bench_json_decode.py
+"""
+Benchmark du décodage des pages /athlete/activities pour un historique synthétique.
+
+Compare, pour chaque backend JSON disponible (json, orjson, msgspec) :
+- le décodage complet (équivalent de response.json()) ;
+- le décodage réduit aux champs utiles (decode_activity_summaries, et decode_activity_structs avec msgspec).
+Mesure le temps de décodage et la mémoire conservée par le résultat (tracemalloc).
+
+Usage : python benchmarks/bench_json_decode.py [--activities 10000]
+"""
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import json_codec
+
+PAGE_SIZE = 200
+SPORTS = ["Run", "Ride", "Swim", "Walk", "Hike", "WeightTraining", "VirtualRide"]
+
+
+def fake_activity(rng: random.Random, activity_id: int) -> dict:
+    """Résumé d'activité avec l'ensemble des champs renvoyés par Strava (dont polyline et carte)."""
+    sport = rng.choice(SPORTS)
+    return {
+        "resource_state": 2, "athlete": {"id": 123456, "resource_state": 1},
+        "name": f"Sortie {activity_id}", "distance": round(rng.uniform(1000, 80000), 1),
+        "moving_time": rng.randint(600, 14400), "elapsed_time": rng.randint(600, 16000),
+        "total_elevation_gain": round(rng.uniform(0, 1500), 1), "type": sport, "sport_type": sport,
+        "workout_type": None, "id": activity_id,
+        "start_date": "2024-03-01T08:00:00Z", "start_date_local": "2024-03-01T09:00:00Z",
+        "timezone": "(GMT+01:00) Europe/Paris", "utc_offset": 3600.0,
+        "location_city": None, "location_state": None, "location_country": "France",
+        "achievement_count": rng.randint(0, 10), "kudos_count": rng.randint(0, 50),
+        "comment_count": 0, "athlete_count": 1, "photo_count": 0,
+        "map": {"id": f"a{activity_id}", "resource_state": 2,
+                "summary_polyline": "".join(rng.choice("abcdefghijklmnopqrstuvwxyz_~@?") for _ in range(600))},
+        "trainer": False, "commute": False, "manual": False, "private": False, "visibility": "everyone",
+        "flagged": False, "gear_id": "g123", "start_latlng": [48.85, 2.35], "end_latlng": [48.86, 2.34],
+        "average_speed": 3.1, "max_speed": 6.2, "average_cadence": 85.0, "has_heartrate": True,
+        "average_heartrate": 145.2, "max_heartrate": 180.0, "heartrate_opt_out": False,
+        "display_hide_heartrate_option": True, "elev_high": 120.0, "elev_low": 30.0,
+        "upload_id": activity_id * 10, "upload_id_str": str(activity_id * 10),
+        "external_id": f"garmin_{activity_id}.fit", "from_accepted_tag": False, "pr_count": 0,
+        "total_photo_count": 0, "has_kudoed": False, "suffer_score": 42.0,
+    }
+
+
+def make_pages(activity_count: int):
+    rng = random.Random(42)
+    activities = [fake_activity(rng, 10_000_000 + i) for i in range(activity_count)]
+    return [json.dumps(activities[i:i + PAGE_SIZE]).encode("utf-8")
+            for i in range(0, activity_count, PAGE_SIZE)]
+
+
+def pruned_with(loads):
+    """Décodage complet avec 'loads' puis réduction aux champs utiles."""
+    def decode_page(page):
+        return [{key: activity[key] for key in json_codec.ACTIVITY_SUMMARY_FIELDS if key in activity}
+                for activity in loads(page)]
+    return decode_page
+
+
+def measure(label: str, decode_page, pages):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = [activity for page in pages for activity in decode_page(page)]
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40}{elapsed * 1000:>10.1f} ms{retained / 1e6:>12.1f} Mo{peak / 1e6:>12.1f} Mo"
+          f"{len(result):>10}")
+    del result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du décodage JSON des activités Strava.")
+    parser.add_argument("--activities", type=int, default=10000)
+    args = parser.parse_args()
+
+    pages = make_pages(args.activities)
+    print(f"{args.activities} activités, {len(pages)} pages, {sum(map(len, pages)) / 1e6:.1f} Mo de JSON")
+    print(f"Backend par défaut : {json_codec.BACKEND}\n")
+    print(f"{'Décodage':<40}{'Temps':>13}{'Conservé':>15}{'Pic':>15}{'Activités':>10}")
+
+    measure("json (complet, = response.json())", json.loads, pages)
+    measure("json (réduit)", pruned_with(json.loads), pages)
+    if json_codec.orjson is not None:
+        measure("orjson (complet)", json_codec.orjson.loads, pages)
+        measure("orjson (réduit)", pruned_with(json_codec.orjson.loads), pages)
+    if json_codec.msgspec is not None:
+        measure("msgspec (complet)", json_codec.msgspec.json.decode, pages)
+        measure("msgspec (réduit, structs)", json_codec.decode_activity_structs, pages)
+    measure("decode_activity_summaries (par défaut)", json_codec.decode_activity_summaries, pages)
@@ -0,0 +1,87 @@
+# benchmarks/bench_route_index.py
+"""
+Benchmark des tracés (models/polyline.py, models/route_index.py) sur 20 000 activités synthétiques
+réparties sur quelques centaines de parcours habituels (avec bruit GPS) :
+décodage Python pur vs NumPy, construction de l'index, puis recherche des parcours identiques.
+
+Usage : python benchmarks/bench_route_index.py [--activities 20000] [--routes 300]
+"""
+import os
+import sys
+import math
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.polyline import encode, decode, decode_array, route_summary
+from models.route_index import RouteIndex
+
+
+def synthetic_routes(count: int, rng: random.Random):
+    """Parcours de référence autour de Lyon (environ 100 à 400 points chacun)."""
+    routes = []
+    for _ in range(count):
+        lat, lon = 45.76 + rng.uniform(-0.3, 0.3), 4.83 + rng.uniform(-0.3, 0.3)
+        heading = rng.uniform(0, 2 * math.pi)
+        route = []
+        for _ in range(rng.randint(100, 400)):
+            heading += rng.uniform(-0.3, 0.3)
+            lat += 0.0004 * math.cos(heading)
+            lon += 0.0006 * math.sin(heading)
+            route.append((lat, lon))
+        routes.append(route)
+    return routes
+
+
+def synthetic_polylines(count: int, route_count: int):
+    """Chaque activité reprend un parcours de référence avec un bruit GPS d'une dizaine de mètres."""
+    rng = random.Random(42)
+    routes = synthetic_routes(route_count, rng)
+    polylines = []
+    for _ in range(count):
+        route = rng.choice(routes)
+        polylines.append(encode([(lat + rng.gauss(0, 0.0001), lon + rng.gauss(0, 0.0001)) for lat, lon in route]))
+    return polylines
+
+
+def timed(label, function, count):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed * 1000:>10.0f} ms{elapsed / count * 1e6:>12.1f} µs/activité")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du décodage des tracés et de l'index spatial.")
+    parser.add_argument("--activities", type=int, default=20000)
+    parser.add_argument("--routes", type=int, default=300)
+    args = parser.parse_args()
+
+    polylines = synthetic_polylines(args.activities, args.routes)
+    print(f"{args.activities} activités sur {args.routes} parcours\n")
+    timed("decode (Python pur)", lambda: [decode(p) for p in polylines], len(polylines))
+    timed("decode_array (NumPy)", lambda: [decode_array(p) for p in polylines], len(polylines))
+    summaries = timed("route_summary", lambda: [route_summary(p) for p in polylines], len(polylines))
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = RouteIndex(os.path.join(directory, "route_index.json"))
+        timed("indexation", lambda: [index.add(i, s, i) for i, s in enumerate(summaries)], len(summaries))
+        timed("sauvegarde", index.save, len(summaries))
+        timed("rechargement", lambda: RouteIndex(index.file_path), len(summaries))
+
+        matches = timed("recherche des parcours identiques", lambda: [index.find_similar(i) for i in range(len(summaries))],
+                        len(summaries))
+        latencies = []
+        for activity_id in range(0, len(summaries), 10):
+            start = time.perf_counter()
+            index.find_similar(activity_id)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f"\nRecherche : p50 {latencies[len(latencies) // 2] * 1e6:.0f} µs, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f} µs, max {latencies[-1] * 1e6:.0f} µs")
+        print(f"Parcours identiques trouvés en moyenne : {sum(map(len, matches)) / len(matches):.1f} "
+              f"(attendu ≈ {args.activities / args.routes - 1:.1f})")
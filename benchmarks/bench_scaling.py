@@ -0,0 +1,186 @@
+# benchmarks/bench_scaling.py
+"""
+Benchmark de montée en charge du pipeline complet sur des historiques synthétiques
+(benchmarks/synthetic_strava.py) : téléchargement de l'historique Strava (fenêtres parallèles),
+puis PollingScheduler._sync_activities_list (pré-scan, options de sélection, tracés, workers Notion),
+contre le faux serveur Strava + Notion local.
+
+Chaque taille est exécutée dans un processus neuf (mémoire maximale mesurée sans interférence) ;
+le faux serveur tourne dans son propre processus. Affiche, pour chaque taille d'historique :
+durée, mémoire maximale (RSS), nombre de requêtes Strava/Notion et de lignes de log envoyées au
+tableau de bord, puis un graphique texte durée/mémoire en fonction de la taille.
+
+Usage : python benchmarks/bench_scaling.py [--sizes 1000,5000,10000] [--csv scaling.csv]
+(l'espacement de 0,1 s entre requêtes Strava est désactivé, sauf avec --strava-spacing)
+"""
+import os
+import sys
+import csv
+import json
+import time
+import queue
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+FAKE_DATABASE_ID = "0123456789abcdef0123456789abcdef"
+
+
+def peak_rss_mb():
+    """Mémoire résidente maximale du processus (Mo), ou None si indisponible (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_once(base_url: str, work_dir: str, strava_spacing: bool) -> dict:
+    """Une exécution complète (processus enfant) : téléchargement puis synchronisation vers Notion."""
+    os.environ.update({
+        "STRAVA_API_URL": f"{base_url}/api/v3",
+        "NOTION_API_URL": f"{base_url}/v1",
+        "STRAVA_ACCESS_TOKEN": "synthetic",
+        "NOTION_TOKEN": "synthetic",
+        "NOTION_DATABASE_URL": FAKE_DATABASE_ID,
+        "NOTION_SUMMARY_DATABASE_URL": "",
+        "ENABLE_STREAMS": "false",
+        "EXPORT_SINKS": "",
+        "PROFILING": "off",
+        "SYNC_HISTORY_DIR": os.path.join(work_dir, "sync_history"),
+        "SYNC_CHECKPOINT_FILE": os.path.join(work_dir, "sync_checkpoint.json"),
+        "ROUTE_INDEX_FILE": os.path.join(work_dir, "route_index.json"),
+        "AGGREGATES_FILE": os.path.join(work_dir, "aggregates.json"),
+    })
+    from models.config_manager import ConfigManager
+    from models.polling_scheduler import PollingScheduler
+    from models.sync_queue import PRIORITY_LOW
+
+    # Consommateur de la file de logs, comme la boucle Tkinter du tableau de bord (toutes les 100 ms)
+    log_queue = queue.Queue()
+    log_lines = [0]
+    stop = threading.Event()
+
+    def drain_logs():
+        while not stop.wait(0.1):
+            while not log_queue.empty():
+                log_queue.get_nowait()
+                log_lines[0] += 1
+
+    drainer = threading.Thread(target=drain_logs, daemon=True)
+    drainer.start()
+
+    scheduler = PollingScheduler(ConfigManager(), log_queue=log_queue)
+    scheduler.strava_client.token_expires_at = time.time() + 3600
+    if not strava_spacing:
+        scheduler.strava_client.min_request_interval = 0.0
+
+    start = time.perf_counter()
+    activities = scheduler._download_history()
+    downloaded = time.perf_counter()
+    scheduler._create_notion_client()
+    scheduler._sync_activities_list(activities, "Benchmark", PRIORITY_LOW)
+    synced = time.perf_counter()
+    scheduler.shutdown(timeout=5)
+    stop.set()
+    drainer.join()
+
+    return {
+        "activities": len(activities),
+        "download_s": downloaded - start,
+        "sync_s": synced - downloaded,
+        "peak_rss_mb": peak_rss_mb(),
+        "log_lines": log_lines[0] + log_queue.qsize(),
+    }
+
+
+def start_fake_server(size: int):
+    """Lance le faux serveur dans un processus séparé ; retourne (processus, URL de base)."""
+    process = subprocess.Popen([sys.executable, os.path.join(BENCHMARKS_DIR, "synthetic_strava.py"), "serve",
+                                "--activities", str(size), "--port", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline() # « Faux serveur Strava/Notion : http://127.0.0.1:PORT (...) »
+    if "http://" not in line:
+        process.kill()
+        raise Exception(f"Le faux serveur n'a pas démarré : {line!r}")
+    return process, "http://" + line.split("http://")[1].split()[0]
+
+
+def measure(size: int, strava_spacing: bool) -> dict:
+    server, base_url = start_fake_server(size)
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            command = [sys.executable, os.path.abspath(__file__), "--run-once", base_url, "--work-dir", work_dir]
+            if strava_spacing:
+                command.append("--strava-spacing")
+            child = subprocess.run(command, capture_output=True, text=True)
+            result_lines = [line for line in child.stdout.splitlines() if line.startswith("{")]
+            if child.returncode != 0 or not result_lines:
+                raise Exception(f"Échec de l'exécution ({size} activités) :\n{child.stderr[-2000:]}")
+            result = json.loads(result_lines[-1])
+        with urllib.request.urlopen(f"{base_url}/stats") as response:
+            stats = json.loads(response.read())
+    finally:
+        server.terminate()
+        server.wait()
+    requests = stats["requests"]
+    result.update(size=size,
+                  strava_requests=sum(n for endpoint, n in requests.items() if endpoint.startswith("strava")),
+                  notion_requests=sum(n for endpoint, n in requests.items() if endpoint.startswith("notion")),
+                  pages_created=stats["pages"])
+    return result
+
+
+def text_chart(results, key: str, unit: str, width: int = 40):
+    """Barres horizontales proportionnelles à la valeur maximale."""
+    values = [result[key] or 0 for result in results]
+    largest = max(values) or 1
+    for result, value in zip(results, values):
+        print(f"{result['size']:>8} | {'█' * max(1, round(value / largest * width)):<{width}} {value:.1f} {unit}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Montée en charge du pipeline sur des historiques synthétiques.")
+    parser.add_argument("--sizes", default="1000,5000,10000",
+                        help="Tailles d'historique, séparées par des virgules (ex: 10000,50000,100000).")
+    parser.add_argument("--csv", help="Écrit aussi les résultats dans ce fichier CSV.")
+    parser.add_argument("--strava-spacing", action="store_true",
+                        help="Conserve l'espacement de 0,1 s entre requêtes Strava.")
+    parser.add_argument("--run-once", metavar="URL", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_once:
+        print(json.dumps(run_once(args.run_once, args.work_dir, args.strava_spacing)))
+        sys.exit(0)
+
+    results = []
+    print(f"{'Activités':>10}{'Strava':>10}{'Notion':>10}{'Total':>10}{'RSS max':>11}"
+          f"{'Req. Strava':>13}{'Req. Notion':>13}{'Logs':>8}{'Pages':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        result = measure(size, args.strava_spacing)
+        results.append(result)
+        rss = f"{result['peak_rss_mb']:.0f} Mo" if result["peak_rss_mb"] else "n/d"
+        print(f"{size:>10}{result['download_s']:>8.1f} s{result['sync_s']:>8.1f} s"
+              f"{result['download_s'] + result['sync_s']:>8.1f} s{rss:>11}{result['strava_requests']:>13}"
+              f"{result['notion_requests']:>13}{result['log_lines']:>8}{result['pages_created']:>9}", flush=True)
+
+    for result in results:
+        result["total_s"] = result["download_s"] + result["sync_s"]
+    print("\nDurée totale")
+    text_chart(results, "total_s", "s")
+    print("\nMémoire maximale")
+    text_chart(results, "peak_rss_mb", "Mo")
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"\nRésultats écrits dans {args.csv}")
@@ -0,0 +1,61 @@
+# benchmarks/bench_sinks.py
+"""
+Benchmark de l'export local (models/sinks.py) : export initial d'un historique synthétique
+(50 000 activités par défaut), puis mise à jour incrémentale d'un polling (10 activités dont 2 nouvelles).
+
+Usage : python benchmarks/bench_sinks.py [--activities 50000] [--sinks csv,sqlite,parquet]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.activity import Activity
+from models.sinks import create_sinks
+
+SPORTS = ["Run", "Ride", "Swim", "Walk", "Hike", "WeightTraining", "VirtualRide"]
+
+
+def synthetic_history(count: int, first_id: int = 10_000_000):
+    rng = random.Random(42)
+    return [Activity(id=first_id + i, name=f"Sortie {i}", type=rng.choice(SPORTS),
+                     start_date="2024-03-01T08:00:00Z", start_date_local="2024-03-01T09:00:00Z",
+                     distance_km=rng.uniform(1, 80), duration_min=rng.uniform(10, 240),
+                     elevation_gain=rng.uniform(0, 1500), average_heartrate=rng.uniform(110, 170),
+                     description="Sortie synthétique" if i % 3 else "")
+            for i in range(count)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de l'export local des activités.")
+    parser.add_argument("--activities", type=int, default=50000)
+    parser.add_argument("--sinks", default="csv,sqlite,parquet")
+    args = parser.parse_args()
+
+    history = synthetic_history(args.activities)
+    poll = history[:8] + synthetic_history(2, first_id=99_000_000)
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        print(f"{args.activities} activités -> {export_dir}\n")
+        print(f"{'Destination':<12}{'Export initial':>16}{'Polling (10)':>15}{'Réouverture':>14}")
+        for sink in create_sinks(args.sinks, export_dir):
+            start = time.perf_counter()
+            sink.write_batch(history)
+            initial = time.perf_counter() - start
+
+            start = time.perf_counter()
+            sink.write_batch(poll)
+            incremental = time.perf_counter() - start
+            sink.close()
+
+            # Réouverture : relecture des ID déjà exportés (redémarrage de l'application)
+            start = time.perf_counter()
+            reopened = create_sinks(sink.name, export_dir)[0]
+            reopen = time.perf_counter() - start
+            reopened.close()
+
+            print(f"{sink.name:<12}{initial * 1000:>13.0f} ms{incremental * 1000:>12.1f} ms{reopen * 1000:>11.0f} ms")
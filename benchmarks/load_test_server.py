@@ -0,0 +1,99 @@
+# benchmarks/load_test_server.py
+"""
+Test de charge du serveur HTTP de l'application (endpoint /health par défaut).
+
+Démarre une instance locale (SERVER_MODE production ou dev) sur un port libre, ou cible une
+instance existante avec --url, puis envoie N requêtes avec C clients concurrents.
+Affiche le débit (requêtes/s) et les latences p50/p95/p99/max.
+
+Usage :
+    python benchmarks/load_test_server.py [--mode production|dev] [--requests 5000] [--concurrency 32]
+    python benchmarks/load_test_server.py --url http://127.0.0.1:5000/health
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_instance(mode: str, threads: int) -> str:
+    """Lance run_flask_server dans un thread et attend que /health réponde."""
+    port = free_port()
+    os.environ.update(FLASK_PORT=str(port), SERVER_MODE=mode, SERVER_THREADS=str(threads))
+    import app
+    from models.config_manager import ConfigManager
+    threading.Thread(target=app.run_flask_server, args=(ConfigManager(), None), daemon=True).start()
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return f"http://127.0.0.1:{port}/health"
+        except OSError:
+            time.sleep(0.05)
+    raise Exception(f"Le serveur local ne répond pas sur le port {port}.")
+
+
+def run_client(url, request_count: int, latencies: list, errors: list):
+    """Un client : connexion HTTP/1.1 persistante, requêtes séquentielles."""
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    for _ in range(request_count):
+        start = time.perf_counter()
+        try:
+            connection.request("GET", parsed.path or "/")
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except Exception as e:
+            errors.append(type(e).__name__)
+            connection.close()
+            connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge du serveur HTTP.")
+    parser.add_argument("--url", help="Instance existante à cibler (sinon une instance locale est démarrée).")
+    parser.add_argument("--mode", default="production", choices=["production", "dev"])
+    parser.add_argument("--threads", type=int, default=8, help="Threads du serveur local (mode production).")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    url = args.url or start_local_instance(args.mode, args.threads)
+    per_client = max(1, args.requests // args.concurrency)
+    latencies, errors = [], []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for _ in range(args.concurrency):
+            executor.submit(run_client, url, per_client, latencies, errors)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Cible : {url} ({'instance existante' if args.url else args.mode})")
+    print(f"{len(latencies)} requêtes, {args.concurrency} clients, {elapsed:.2f} s")
+    print(f"Débit : {len(latencies) / elapsed:.0f} requêtes/s, erreurs : {len(errors)}")
+    print("Latences : " + ", ".join(f"{label} {percentile(latencies, fraction) * 1000:.1f} ms"
+                                     for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))) +
+          f", max {latencies[-1] * 1000:.1f} ms")
@@ -0,0 +1,95 @@
+# benchmarks/startup_time.py
+"""
+Mesure du temps de démarrage de l'application.
+
+1. Budget d'import : exécute `python -X importtime -c "import gui"` et vérifie que le temps
+   cumulé reste sous le budget de importtime_budget.json et qu'aucun module lourd
+   (Flask, requests, NumPy, clients...) n'est importé au démarrage.
+2. Temps jusqu'à la première fenêtre : construit StravaNotionGUI et attend le premier
+   rendu (update_idletasks), sur plusieurs exécutions (nécessite un affichage).
+
+Usage : python benchmarks/startup_time.py [--runs 5]
+Code de sortie 1 si le budget d'import est dépassé.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_budget.json")
+
+FIRST_WINDOW_SNIPPET = """
+import time
+start = time.perf_counter()
+import gui
+window = gui.StravaNotionGUI()
+window.update_idletasks()
+print(f"{(time.perf_counter() - start) * 1000:.1f}")
+window.destroy()
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Retourne {module: temps cumulé en ms} à partir de la sortie de -X importtime."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # Format : "import time:  <self us> | <cumulé us> | <module indenté>"
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules[name.strip()] = int(cumulative_us) / 1000.0
+    return modules
+
+
+def check_import_budget(budget: dict) -> bool:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {budget['module']}"],
+                            cwd=ROOT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"ERREUR: import de {budget['module']} impossible :\n{result.stderr[-2000:]}")
+        return False
+
+    modules = parse_importtime(result.stderr)
+    total_ms = modules.get(budget["module"], 0.0)
+    print(f"Import de '{budget['module']}' : {total_ms:.1f} ms cumulés (budget {budget['max_cumulative_import_ms']} ms)")
+
+    print("Modules les plus coûteux :")
+    for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    ok = total_ms <= budget["max_cumulative_import_ms"]
+    forbidden = [name for name in budget["forbidden_at_startup"] if name in modules]
+    if forbidden:
+        print(f"ÉCHEC: modules lourds importés au démarrage : {', '.join(forbidden)}")
+        ok = False
+    if total_ms > budget["max_cumulative_import_ms"]:
+        print("ÉCHEC: budget d'import dépassé.")
+    return ok
+
+
+def measure_first_window(runs: int):
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", FIRST_WINDOW_SNIPPET],
+                                cwd=ROOT_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            print("Temps jusqu'à la première fenêtre : non mesurable (pas d'affichage disponible ?)")
+            return
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    print(f"Temps jusqu'à la première fenêtre ({runs} exécutions) : "
+          f"médiane {statistics.median(timings):.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage de l'application.")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de mesures de la première fenêtre.")
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+        budget = json.load(f)
+
+    budget_ok = check_import_budget(budget)
+    measure_first_window(args.runs)
+    sys.exit(0 if budget_ok else 1)
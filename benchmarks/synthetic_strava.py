@@ -0,0 +1,312 @@
+# benchmarks/synthetic_strava.py
+"""
+Historiques Strava synthétiques (reproductibles : graine fixe) pour les tests de charge.
+
+Les activités ressemblent aux résumés de /athlete/activities : types de sport pondérés, distances et
+durées cohérentes avec le sport, dates sur plusieurs années avec l'heure locale de Paris (changements
+d'heure compris), FC, descriptions, tracés encodés (quelques centaines de parcours habituels avec bruit
+GPS), et les champs inutilisés par l'application (athlète, kudos...) pour une taille de réponse réaliste.
+
+Usage :
+    python benchmarks/synthetic_strava.py generate --activities 10000 --out synthetic_history/
+    python benchmarks/synthetic_strava.py serve --activities 10000 --port 8765
+
+Le mode serve démarre un faux serveur local :
+- Strava : GET /api/v3/athlete/activities (per_page, page, after, before ; tri croissant avec after,
+  comme l'API réelle) ;
+- Notion : schéma de base, query paginée, création de pages (stockées en mémoire) ;
+- GET /stats : nombre de requêtes reçues par endpoint.
+Pour y brancher l'application : STRAVA_API_URL=http://127.0.0.1:8765/api/v3 et
+NOTION_API_URL=http://127.0.0.1:8765/v1.
+"""
+import os
+import re
+import sys
+import json
+import math
+import uuid
+import random
+import argparse
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.polyline import encode
+
+SEED = 42
+LOCAL_TIMEZONE = ZoneInfo("Europe/Paris")
+HISTORY_END = datetime(2026, 1, 1, tzinfo=timezone.utc)
+MAX_HISTORY_DAYS = 15 * 365
+
+# Sport : (poids, distance médiane en km, vitesse en km/h, a un tracé)
+SPORTS = {
+    "Run": (45, 9.0, 10.5, True),
+    "Ride": (25, 45.0, 26.0, True),
+    "Walk": (8, 5.0, 5.0, True),
+    "Hike": (5, 12.0, 4.0, True),
+    "Swim": (5, 2.0, 3.0, False),
+    "VirtualRide": (6, 35.0, 30.0, False),
+    "WeightTraining": (6, 0.0, 0.0, False),
+}
+NAMES = ["Sortie matinale", "Sortie du midi", "Sortie du soir", "Footing", "Fractionné", "Sortie longue",
+         "Récupération", "Course du dimanche", "Vélotaf", "Balade"]
+DESCRIPTIONS = ["", "", "", "Bonnes sensations.", "Jambes lourdes, vent de face.",
+                "Séance de seuil : 3 x 10 min.", "Avec le club.", "Parcours habituel, météo parfaite."]
+
+
+def _synthetic_routes(rng: random.Random, count: int):
+    """Parcours habituels autour de Lyon (points de départ regroupés, comme un vrai athlète)."""
+    routes = []
+    for _ in range(count):
+        lat, lon = 45.76 + rng.gauss(0, 0.05), 4.83 + rng.gauss(0, 0.07)
+        heading = rng.uniform(0, 2 * math.pi)
+        points = []
+        for _ in range(rng.randint(80, 300)):
+            heading += rng.uniform(-0.35, 0.35)
+            lat += 0.0005 * math.cos(heading)
+            lon += 0.0007 * math.sin(heading)
+            points.append((lat, lon))
+        # Quelques variantes bruitées encodées une fois (le bruit GPS change d'une sortie à l'autre)
+        routes.append([encode([(la + rng.gauss(0, 0.00008), lo + rng.gauss(0, 0.00008)) for la, lo in points])
+                       for _ in range(4)])
+    return routes
+
+
+def generate_activities(count: int, seed: int = SEED, route_count: int = 300) -> list:
+    """Historique de `count` activités (dicts au format Strava), de la plus récente à la plus ancienne."""
+    rng = random.Random(seed)
+    routes = _synthetic_routes(rng, route_count)
+    sports = list(SPORTS)
+    weights = [SPORTS[sport][0] for sport in sports]
+    # Environ une activité par jour en remontant dans le temps, sur 15 ans au plus (plusieurs par jour au-delà)
+    span_seconds = min(max(1, count) * 0.9, MAX_HISTORY_DAYS) * 86400
+    activities = []
+    for i in range(count):
+        sport = rng.choices(sports, weights)[0]
+        _, median_km, speed, has_route = SPORTS[sport]
+        start = HISTORY_END - timedelta(seconds=span_seconds * (i + rng.random()) / max(1, count))
+        start = start.replace(hour=rng.choice((7, 8, 12, 18, 19)), minute=rng.randrange(60), second=0)
+        local = start.astimezone(LOCAL_TIMEZONE).replace(tzinfo=None)
+        distance_km = median_km * rng.lognormvariate(0, 0.35) if median_km else 0.0
+        moving_time = int(distance_km / speed * 3600) if speed else rng.randint(1800, 5400)
+        heartrate = round(rng.uniform(115, 170), 1) if rng.random() < 0.85 else None
+        route = rng.choice(routes)[rng.randrange(4)] if has_route else None
+        activity = {
+            "resource_state": 2,
+            "athlete": {"id": 1234567, "resource_state": 1},
+            "name": rng.choice(NAMES),
+            "distance": round(distance_km * 1000, 1),
+            "moving_time": moving_time,
+            "elapsed_time": int(moving_time * rng.uniform(1.0, 1.3)),
+            "total_elevation_gain": round(distance_km * rng.uniform(2, 15), 1),
+            "type": sport,
+            "sport_type": sport,
+            "id": 10_000_000_000 + count - i,
+            "start_date": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "start_date_local": local.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "timezone": "(GMT+01:00) Europe/Paris",
+            "utc_offset": (local - start.replace(tzinfo=None)).total_seconds(),
+            "achievement_count": rng.randrange(5),
+            "kudos_count": rng.randrange(30),
+            "comment_count": rng.randrange(3),
+            "athlete_count": 1,
+            "photo_count": 0,
+            "map": {"id": f"a{10_000_000_000 + count - i}", "summary_polyline": route or "", "resource_state": 2},
+            "trainer": not has_route,
+            "commute": sport == "Ride" and rng.random() < 0.2,
+            "manual": False,
+            "private": False,
+            "visibility": "everyone",
+            "gear_id": "g123456" if sport in ("Run", "Ride") else None,
+            "average_speed": round(distance_km * 1000 / moving_time, 3) if moving_time else 0.0,
+            "max_speed": round(distance_km * 1000 / moving_time * 1.6, 3) if moving_time else 0.0,
+            "has_heartrate": heartrate is not None,
+            "average_heartrate": heartrate,
+            "max_heartrate": round(heartrate + rng.uniform(10, 25), 1) if heartrate else None,
+            "suffer_score": round(moving_time / 60 * rng.uniform(0.5, 1.5)) if heartrate else None,
+            "description": rng.choice(DESCRIPTIONS),
+            "calories": round(moving_time / 60 * rng.uniform(8, 13), 1),
+            "perceived_exertion": rng.choice((None, None, 3, 5, 7)),
+        }
+        activities.append(activity)
+    return activities
+
+
+def write_pages(activities: list, directory: str, per_page: int = 200) -> int:
+    """Écrit l'historique en fichiers page-0001.json... (pages de /athlete/activities). Retourne le nombre de pages."""
+    os.makedirs(directory, exist_ok=True)
+    pages = 0
+    for start in range(0, len(activities), per_page):
+        pages += 1
+        with open(os.path.join(directory, f"page-{pages:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump(activities[start:start + per_page], f, ensure_ascii=False)
+    return pages
+
+
+# ----------------------------------------------------------------------
+# FAUX SERVEUR STRAVA + NOTION
+# ----------------------------------------------------------------------
+
+def _notion_schema(options):
+    """Schéma de base Notion correspondant au mapping par défaut (MAP_*)."""
+    return {"object": "database", "properties": {
+        "Nom": {"id": "title", "type": "title", "title": {}},
+        "ID Strava": {"id": "a%3Bid", "type": "number", "number": {}},
+        "Date": {"id": "b%3Bdt", "type": "date", "date": {}},
+        "Distance (km)": {"id": "c%3Bds", "type": "number", "number": {}},
+        "Durée (min)": {"id": "d%3Bdu", "type": "number", "number": {}},
+        "Sport": {"id": "e%3Bsp", "type": "select", "select": {"options": options}},
+        "D+": {"id": "f%3Bel", "type": "number", "number": {}},
+        "Calories": {"id": "g%3Bca", "type": "number", "number": {}},
+        "FC Moy": {"id": "h%3Bhr", "type": "number", "number": {}},
+        "EP": {"id": "i%3Bep", "type": "number", "number": {}},
+        "Notes": {"id": "j%3Bno", "type": "rich_text", "rich_text": {}},
+    }}
+
+
+class FakeApiState:
+    """Données servies par le faux serveur et compteurs de requêtes."""
+
+    def __init__(self, activities: list):
+        # Activités triées par date croissante, chacune déjà sérialisée (pages assemblées sans réencodage)
+        ordered = sorted(activities, key=lambda a: a["start_date"])
+        self.epochs = [int(datetime.fromisoformat(a["start_date"].replace("Z", "+00:00")).timestamp())
+                       for a in ordered]
+        self.encoded = [json.dumps(a, ensure_ascii=False).encode("utf-8") for a in ordered]
+        self.select_options = []
+        self.pages = []            # ID Strava des pages créées dans la fausse base Notion
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    def count(self, endpoint: str):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+
+def _make_handler(state: FakeApiState):
+
+    class FakeApiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass # Silencieux : des dizaines de milliers de requêtes
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+            if parsed.path == "/api/v3/athlete/activities":
+                state.count("strava_activities")
+                self._send(200, self._activities_page(query))
+            elif re.fullmatch(r"/v1/databases/[\w-]+", parsed.path):
+                state.count("notion_schema")
+                self._send(200, json.dumps(_notion_schema(state.select_options)).encode("utf-8"))
+            elif parsed.path == "/stats":
+                with state.lock:
+                    stats = {"requests": dict(state.requests), "pages": len(state.pages)}
+                self._send(200, json.dumps(stats).encode("utf-8"))
+            else:
+                self._send(404, b'{"message": "Not Found"}')
+
+        def _activities_page(self, query) -> bytes:
+            per_page = min(200, int(query.get("per_page", 30)))
+            page = max(1, int(query.get("page", 1)))
+            low = bisect_right(state.epochs, int(query["after"])) if "after" in query else 0
+            high = bisect_left(state.epochs, int(query["before"])) if "before" in query else len(state.epochs)
+            selected = range(low, high) if "after" in query else range(high - 1, low - 1, -1)
+            selected = selected[(page - 1) * per_page:page * per_page]
+            return b"[" + b",".join(state.encoded[i] for i in selected) + b"]"
+
+        def do_PATCH(self):
+            if re.fullmatch(r"/v1/databases/[\w-]+", urlparse(self.path).path):
+                state.count("notion_schema_update")
+                prop = next(iter(self._read_json().get("properties", {}).values()), {})
+                known = {option["id"]: option for option in state.select_options}
+                state.select_options = [known.get(option.get("id")) or
+                                        {"id": uuid.uuid4().hex[:4], "name": option["name"]}
+                                        for option in prop.get("select", {}).get("options", [])]
+                self._send(200, json.dumps(_notion_schema(state.select_options)).encode("utf-8"))
+            else:
+                state.count("notion_page_update")
+                self._read_json()
+                self._send(200, b'{"object": "page"}')
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            body = self._read_json()
+            if path == "/v1/pages":
+                state.count("notion_page_create")
+                strava_id = body.get("properties", {}).get("ID Strava", {}).get("number")
+                with state.lock:
+                    state.pages.append(strava_id)
+                self._send(200, json.dumps({"object": "page", "id": str(uuid.uuid4())}).encode("utf-8"))
+            elif path.endswith("/query"):
+                state.count("notion_query")
+                self._send(200, self._query_page(body))
+            else:
+                self._send(404, b'{"message": "Not Found"}')
+
+        def _query_page(self, body) -> bytes:
+            strava_filter = body.get("filter", {}).get("number", {}).get("equals")
+            with state.lock:
+                if strava_filter is None:
+                    ids = list(state.pages)
+                else:
+                    ids = [strava_filter] if strava_filter in state.pages else []
+            start = int(body.get("start_cursor") or 0)
+            page_size = int(body.get("page_size") or 100)
+            results = [{"object": "page", "properties": {"ID Strava": {"number": strava_id}}}
+                       for strava_id in ids[start:start + page_size]]
+            has_more = start + page_size < len(ids)
+            return json.dumps({"results": results, "has_more": has_more,
+                               "next_cursor": str(start + page_size) if has_more else None}).encode("utf-8")
+
+    return FakeApiHandler
+
+
+def create_fake_server(activities: list, port: int = 0, host: str = "127.0.0.1"):
+    """Faux serveur Strava + Notion (ThreadingHTTPServer) ; appeler serve_forever() pour le démarrer."""
+    server = ThreadingHTTPServer((host, port), _make_handler(FakeApiState(activities)))
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Historiques Strava synthétiques.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate_parser = subparsers.add_parser("generate", help="Écrit l'historique en fichiers JSON (pages de 200).")
+    generate_parser.add_argument("--out", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Démarre le faux serveur Strava + Notion.")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    for sub in (generate_parser, serve_parser):
+        sub.add_argument("--activities", type=int, default=10000)
+        sub.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    history = generate_activities(args.activities, seed=args.seed)
+    if args.command == "generate":
+        pages = write_pages(history, args.out)
+        print(f"{len(history)} activités écrites dans {args.out} ({pages} pages).")
+    else:
+        server = create_fake_server(history, port=args.port)
+        print(f"Faux serveur Strava/Notion : http://127.0.0.1:{server.server_address[1]} "
+              f"({len(history)} activités)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
@@ -2,23 +2,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
-import webbrowser
+import multiprocessing
 import os
 import sys
 import time 
 from datetime import datetime
-import queue 
 
 # --- Importations des modules locaux ---
+# Seul le ConfigManager est importé au démarrage : Flask (app.py), la pile HTTP (requests)
+# et les clients Strava/Notion sont chargés à la première utilisation pour ouvrir la fenêtre plus vite.
 try:
     from models.config_manager import ConfigManager
-    from models.strava_client import StravaClient
-    from models.polling_scheduler import PollingScheduler 
-    # Importation de la fonction corrigée pour le démarrage du serveur Flask
-    from app import run_flask_server 
+    from models.log_channel import LogChannel
 except ImportError as e:
     messagebox.showerror("Erreur d'Importation", 
-                          f"Erreur de dépendance: {e}. Vérifiez les modules (config_manager, strava_client, polling_scheduler et la présence de run_flask_server dans app.py).")
+                          f"Erreur de dépendance: {e}. Vérifiez le module config_manager et le paquet python-dotenv.")
     sys.exit(1)
 
 
@@ -33,9 +31,13 @@ class StravaNotionGUI(tk.Tk):
         self.config_manager = ConfigManager()
         self.flask_port = self.config_manager.get("FLASK_PORT") or "5000"
         
-        self.strava_client = StravaClient(self.config_manager) 
+        # Clients construits à la première utilisation (voir les propriétés strava_client et polling_scheduler)
+        self._strava_client = None
+        self._polling_scheduler = None
         
-        self.log_queue = queue.Queue() 
+        # Canal de logs borné (tampon circulaire) partagé avec le Polling Scheduler
+        self.log_queue = LogChannel(maxlen=self.config_manager.get_int("LOG_BUFFER_SIZE", 2000))
+        self.log_view_max_lines = self.config_manager.get_int("LOG_VIEW_MAX_LINES", 5000)
         self.total_synced_count = tk.IntVar(value=0) 
         self.last_sync_success = tk.StringVar(value="Non vérifié")
         
@@ -44,15 +46,6 @@ class StravaNotionGUI(tk.Tk):
         # NOUVEAU: Variable pour le minuteur de Polling
         self.time_until_next_check = tk.StringVar(value="--:--") 
 
-        try:
-              # Polling Scheduler utilise maintenant un log_queue
-              self.polling_scheduler = PollingScheduler(self.config_manager, interval_minutes=15, log_queue=self.log_queue) 
-        except Exception as e:
-              messagebox.showwarning("Avertissement Initialisation", 
-                                     f"Échec de l'initialisation du Polling Scheduler. Cause : {e}. "
-                                     "Vous ne pourrez pas démarrer le service avant d'avoir corrigé la config.")
-              self.polling_scheduler = None 
-
         self.service_running = False
         
         self._create_widgets()
@@ -63,6 +56,36 @@ class StravaNotionGUI(tk.Tk):
         # CHANGEMENT: Mise à jour du tableau de bord toutes les secondes (pour le minuteur)
         self.after(1000, self._update_dashboard_metrics) 
 
+    # ----------------------------------------------------------------------
+    # CONSTRUCTION DIFFÉRÉE DES CLIENTS
+    # ----------------------------------------------------------------------
+
+    @property
+    def strava_client(self):
+        """Client Strava, importé et construit au premier accès (charge la pile HTTP)."""
+        if self._strava_client is None:
+            from models.strava_client import StravaClient
+            self._strava_client = StravaClient(self.config_manager)
+        return self._strava_client
+
+    @property
+    def polling_scheduler(self):
+        """
+        Polling Scheduler, importé et construit au premier accès.
+        Retourne None (avec un avertissement) si l'initialisation échoue : elle sera retentée au prochain accès.
+        """
+        if self._polling_scheduler is None:
+            try:
+                from models.polling_scheduler import PollingScheduler
+                # Polling Scheduler utilise un log_queue
+                self._polling_scheduler = PollingScheduler(self.config_manager, interval_minutes=15, log_queue=self.log_queue) 
+            except Exception as e:
+                messagebox.showwarning("Avertissement Initialisation", 
+                                       f"Échec de l'initialisation du Polling Scheduler. Cause : {e}. "
+                                       "Vous ne pourrez pas démarrer le service avant d'avoir corrigé la config.")
+                return None
+        return self._polling_scheduler
+
     # ----------------------------------------------------------------------
     # MÉTHODES POUR FLASK EN THREAD
     # ----------------------------------------------------------------------
@@ -77,6 +100,9 @@ class StravaNotionGUI(tk.Tk):
 
             self.log_queue.put(f"--- Serveur Flask : Démarrage en arrière-plan sur le port {self.flask_port}... ---")
             
+            # Import tardif : Flask n'est chargé que lorsque l'OAuth est lancé
+            from app import run_flask_server
+            
             # Le thread est lancé en utilisant la fonction importée run_flask_server 
             self.flask_server_thread = threading.Thread(
                 target=run_flask_server, 
@@ -260,6 +286,7 @@ class StravaNotionGUI(tk.Tk):
 
     def _open_url(self, url):
         """Ouvre l'URL spécifiée dans le navigateur par défaut."""
+        import webbrowser
         webbrowser.open_new_tab(url)
 
     def _create_widgets(self):
@@ -439,6 +466,17 @@ class StravaNotionGUI(tk.Tk):
             "MAP_HEART_RATE": ("Fréq. Cardiaque Moy. (Type Numéro) :", "FC Moy"),
             "MAP_PERCEIVED_EXERTION": ("Effort Perçu (Type Numéro ou Sélection) :", "RPE"),
             "MAP_DESCRIPTION": ("Notes/Description (Type Texte) :", "Notes"),
+            # Métriques des streams (ENABLE_STREAMS=true) : laisser vide pour ne pas les envoyer
+            "MAP_NORMALIZED_POWER": ("Puissance Normalisée (Type Numéro, optionnel) :", ""),
+            "MAP_BEST_1K": ("Meilleur 1 km en min (Type Numéro, optionnel) :", ""),
+            "MAP_BEST_5K": ("Meilleur 5 km en min (Type Numéro, optionnel) :", ""),
+            "MAP_HR_ZONES": ("Temps par Zone FC (Type Texte, optionnel) :", ""),
+            "MAP_SPLITS": ("Splits au km (Type Texte, optionnel) :", ""),
+            # Tracé : laisser vide pour ne pas les envoyer
+            "MAP_START_LOCATION": ("Point de départ (Type Texte, optionnel) :", ""),
+            "MAP_ROUTE_FINGERPRINT": ("Empreinte du parcours (Type Texte, optionnel) :", ""),
+            "MAP_SAME_ROUTE": ("Même parcours que (Type Texte, optionnel) :", ""),
+            "MAP_SAME_ROUTE_COUNT": ("Nb. sorties sur ce parcours (Type Numéro, optionnel) :", ""),
         }
 
         row_num = 0
@@ -489,12 +527,50 @@ class StravaNotionGUI(tk.Tk):
         self.next_check_time = tk.StringVar(value="Inconnu")
         ttk.Label(metrics_frame, textvariable=self.next_check_time, foreground='darkred').grid(row=6, column=1, sticky='w', pady=5)
         
+        ttk.Label(metrics_frame, text="Cache HTTP Strava :", font=("Arial", 10, "bold")).grid(row=7, column=0, sticky='w', pady=5)
+        self.http_cache_stats_db = tk.StringVar(value="N/A")
+        ttk.Label(metrics_frame, textvariable=self.http_cache_stats_db).grid(row=7, column=1, sticky='w', pady=5)
+        
+        ttk.Label(metrics_frame, text="Écritures Notion :", font=("Arial", 10, "bold")).grid(row=8, column=0, sticky='w', pady=5)
+        self.notion_concurrency_db = tk.StringVar(value="N/A")
+        ttk.Label(metrics_frame, textvariable=self.notion_concurrency_db).grid(row=8, column=1, sticky='w', pady=5)
+        
+        history_frame = ttk.LabelFrame(master_frame, text="🔎 Historique d'une Activité", padding=10)
+        history_frame.pack(fill='x', padx=10, pady=(0, 10))
+        ttk.Label(history_frame, text="ID Strava ou date (AAAA-MM-JJ) :").pack(side='left')
+        self.history_query = tk.StringVar()
+        ttk.Entry(history_frame, textvariable=self.history_query, width=25).pack(side='left', padx=5)
+        ttk.Button(history_frame, text="Rechercher", command=self._show_activity_history).pack(side='left')
+        
         logs_frame = ttk.LabelFrame(master_frame, text="📄 Console des Logs (Mises à jour en temps réel)", padding=10)
         logs_frame.pack(fill='both', expand=True, padx=10, pady=10)
         self.log_text_area = scrolledtext.ScrolledText(logs_frame, wrap=tk.WORD, height=20, state='disabled')
         self.log_text_area.pack(fill='both', expand=True)
 
 
+    def _show_activity_history(self):
+        """Affiche l'historique de synchronisation d'une activité (ou d'une date) depuis le journal sur disque."""
+        query = self.history_query.get().strip()
+        if not query:
+            return
+        if not self.polling_scheduler:
+            return
+        
+        try:
+            from models.sync_history import format_event
+            history = self.polling_scheduler.sync_history
+            events = history.history_for(int(query)) if query.isdigit() else history.events_between(query, query)
+        except Exception as e:
+            messagebox.showerror("Historique", f"Lecture de l'historique impossible. Cause : {e}")
+            return
+        
+        if not events:
+            messagebox.showinfo("Historique", f"Aucun événement trouvé pour '{query}'.")
+            return
+        # On limite l'affichage aux 20 derniers événements
+        lines = [format_event(event) for event in events[-20:]]
+        messagebox.showinfo("Historique", f"{len(events)} événement(s) pour '{query}' :\n\n" + "\n".join(lines))
+
     def _load_config_to_gui(self):
         """Charge la configuration et le mapping du fichier .env dans l'interface."""
         # Utilise la configuration en mémoire (mise à jour par _save_config)
@@ -504,7 +580,9 @@ class StravaNotionGUI(tk.Tk):
               if key in self.config_inputs:
                 self.config_inputs[key].set(self.config_manager._config.get(key) or "") 
         map_keys = ["MAP_TITLE", "MAP_STRAVA_ID", "MAP_DATE", "MAP_DISTANCE", "MAP_DURATION", "MAP_TYPE", "MAP_ELEVATION", 
-                    "MAP_CALORIES", "MAP_HEART_RATE", "MAP_PERCEIVED_EXERTION", "MAP_DESCRIPTION"]
+                    "MAP_CALORIES", "MAP_HEART_RATE", "MAP_PERCEIVED_EXERTION", "MAP_DESCRIPTION",
+                    "MAP_NORMALIZED_POWER", "MAP_BEST_1K", "MAP_BEST_5K", "MAP_HR_ZONES", "MAP_SPLITS",
+                    "MAP_START_LOCATION", "MAP_ROUTE_FINGERPRINT", "MAP_SAME_ROUTE", "MAP_SAME_ROUTE_COUNT"]
         if hasattr(self, 'map_inputs'):
             for key in map_keys:
                 current_value = self.config_manager._config.get(key)
@@ -538,37 +616,43 @@ class StravaNotionGUI(tk.Tk):
             raise Exception(f"Impossible d'écrire dans le fichier .env : {e}")
             
     def _process_log_queue(self):
-        """Traite les logs en attente et les affiche dans la zone de texte."""
-        while not self.log_queue.empty():
-            try:
-                log_entry = self.log_queue.get_nowait()
+        """
+        Traite les logs en attente et les affiche dans la zone de texte.
+        Tous les logs du tick sont insérés en une seule mise à jour du widget, 
+        et les plus anciennes lignes sont supprimées au-delà de LOG_VIEW_MAX_LINES.
+        """
+        try:
+            entries, dropped = self.log_queue.drain()
+            if entries or dropped:
+                for log_entry in entries:
+                    if "SUCCÈS:" in log_entry:
+                        self.last_sync_success.set("✅ " + log_entry)
+                    elif "ERREUR" in log_entry:
+                        self.last_sync_success.set("❌ " + log_entry)
+                
+                text = ""
+                if dropped:
+                    text += f"... {dropped} ligne(s) de log ignorée(s) (tampon plein) ...\n"
+                text += "".join(entry + '\n' for entry in entries)
+                
                 self.log_text_area.config(state='normal')
-                self.log_text_area.insert(tk.END, log_entry + '\n')
+                self.log_text_area.insert(tk.END, text)
+                # Limite de lignes : on supprime les plus anciennes
+                # (le texte se termine par un saut de ligne : la dernière ligne est vide)
+                line_count = int(self.log_text_area.index('end-1c').split('.')[0]) - 1
+                if line_count > self.log_view_max_lines:
+                    self.log_text_area.delete('1.0', f"{line_count - self.log_view_max_lines + 1}.0")
                 self.log_text_area.config(state='disabled')
                 self.log_text_area.see(tk.END)
-                if "SUCCÈS:" in log_entry:
-                    self.last_sync_success.set("✅ " + log_entry)
-                    if "activités ont été ajoutées à Notion" in log_entry:
-                        try:
-                            count_str = log_entry.split('SUCCÈS: ')[1].split(' activités')[0]
-                            count = int(count_str.split(' ')[0]) 
-                            self.total_synced_count.set(self.total_synced_count.get() + count)
-                        except:
-                            pass
-                elif "ERREUR" in log_entry:
-                    self.last_sync_success.set("❌ " + log_entry)
-            except queue.Empty:
-                break
-            except Exception as e:
-                print(f"Erreur lors du traitement du log: {e}") 
-                break
+        except Exception as e:
+            print(f"Erreur lors du traitement du log: {e}") 
         self.after(100, self._process_log_queue)
 
     # MÉTHODE MODIFIÉE: Intégration du calcul et de l'affichage du minuteur
     def _update_dashboard_metrics(self):
         """Met à jour toutes les métriques du Tableau de Bord, incluant le minuteur."""
         
-        if self.service_running and self.polling_scheduler.last_check_time:
+        if self.service_running and self._polling_scheduler and self._polling_scheduler.last_check_time:
             # Calcul du temps restant
             now = time.time()
             next_check_timestamp = self.polling_scheduler.last_check_time + self.polling_scheduler.interval
@@ -595,6 +679,14 @@ class StravaNotionGUI(tk.Tk):
             # NOUVEAU: Affichage par défaut pour le minuteur
             self.time_until_next_check.set("--:--") 
 
+        if self._polling_scheduler:
+            # Compteur tenu par le scheduler : exact quel que soit LOG_LEVEL
+            self.total_synced_count.set(self._polling_scheduler.synced_total)
+            self.http_cache_stats_db.set(self._polling_scheduler.strava_client.http_cache.stats_text())
+            notion_client = self._polling_scheduler.notion_client
+            if notion_client and notion_client.concurrency:
+                self.notion_concurrency_db.set(notion_client.concurrency.stats_text())
+        
         self.last_sync_success_db.set(self.last_sync_success.get())
         self.total_synced_count_db.set(str(self.total_synced_count.get()))
         
@@ -604,25 +696,36 @@ class StravaNotionGUI(tk.Tk):
 
     def _on_closing(self):
         """Gestionnaire d'événements à la fermeture de la fenêtre."""
-        # Arrêter explicitement le serveur Flask si actif
-        if self.flask_server_thread and self.flask_server_thread.is_alive():
-              self.log_queue.put("--- Arrêt du serveur Flask en cours... ---")
-              # Le daemon=True devrait s'en charger, mais une notification est utile.
-              pass 
-              
         if self.service_running:
-            if messagebox.askyesno("Quitter l'Application", 
-                                     "Le service de synchronisation est en cours. Voulez-vous l'arrêter et quitter ?"):
-                if self.polling_scheduler:
-                    self.polling_scheduler.stop()
-                self.destroy()
-            else:
+            if not messagebox.askyesno("Quitter l'Application", 
+                                       "Le service de synchronisation est en cours. Voulez-vous l'arrêter et quitter ?"):
                 return 
-        else:
-            self.destroy() 
+        
+        self._shutdown()
+        self.destroy() 
+
+    def _shutdown(self):
+        """
+        Arrêt ordonné avant fermeture : fin (ou checkpoint) des écritures Notion en cours,
+        puis arrêt du serveur Flask, dans la limite de SHUTDOWN_TIMEOUT secondes.
+        """
+        from models.lifecycle_manager import LifecycleManager
+        
+        lifecycle = LifecycleManager(deadline_seconds=self.config_manager.get_int("SHUTDOWN_TIMEOUT", 10))
+        if self._polling_scheduler:
+            lifecycle.register("Synchronisation", self._polling_scheduler.shutdown)
+        if self.flask_server_thread and self.flask_server_thread.is_alive():
+            from app import stop_flask_server
+            lifecycle.register("Serveur Flask", stop_flask_server)
+        
+        # La fenêtre disparaît tout de suite, l'arrêt peut prendre quelques secondes
+        self.withdraw()
+        lifecycle.shutdown()
 
 
 if __name__ == '__main__':
+    # Exécutable PyInstaller : les processus du pool CPU (spawn) ne doivent pas relancer l'application
+    multiprocessing.freeze_support()
     if not os.path.exists('.env'):
         try:
             with open('.env', 'w') as f:
@@ -0,0 +1,118 @@
+# models/activity.py
+from dataclasses import dataclass
+
+from models.json_codec import decode_activity_structs, decode_activity_summaries
+from models.date_utils import parse_epoch, parse_epochs, epoch_to_day
+
+
+@dataclass(slots=True)
+class Activity:
+    """
+    Activité Strava telle qu'utilisée dans tout le pipeline (dédoublonnage, propriétés Notion,
+    agrégats, journal). Créée une seule fois à la réception de la réponse Strava, avec les
+    conversions d'unités déjà faites ; sans __dict__, elle occupe une fraction d'un dict JSON.
+    """
+    id: int
+    name: str = "Activité sans nom"
+    type: str = "Inconnu"
+    sport_type: str = None
+    start_date: str = ""          # UTC, ISO 8601
+    start_date_local: str = ""    # heure locale, ISO 8601
+    distance_km: float = 0.0
+    duration_min: float = 0.0     # temps en mouvement
+    elevation_gain: float = None
+    calories: float = None
+    average_heartrate: float = None
+    perceived_exertion: float = None
+    description: str = ""
+    suffer_score: float = None
+    summary_polyline: str = ""    # tracé simplifié encodé (voir models/polyline.py)
+    start_epoch: int = 0          # start_date en timestamp Unix
+    local_epoch: int = 0          # start_date_local, heure locale comptée comme UTC (voir date_utils)
+
+    def __post_init__(self):
+        # Timestamps non fournis (activité construite à la main, ancien point de reprise) : calculés ici
+        if not self.start_epoch and self.start_date:
+            self.start_epoch = parse_epoch(self.start_date)
+        if not self.local_epoch and self.start_date_local:
+            self.local_epoch = parse_epoch(self.start_date_local)
+
+    @classmethod
+    def from_strava(cls, data: dict, start_epoch: int = 0, local_epoch: int = 0) -> "Activity":
+        """
+        Construit une activité à partir d'un résumé (ou d'un détail) renvoyé par l'API Strava.
+        Les timestamps peuvent être fournis déjà calculés (conversion vectorisée d'une page entière).
+        """
+        return cls(
+            id=data['id'],
+            name=data.get('name') or "Activité sans nom",
+            type=data.get('type') or "Inconnu",
+            sport_type=data.get('sport_type'),
+            start_date=data.get('start_date') or "",
+            start_date_local=data.get('start_date_local') or "",
+            distance_km=(data.get('distance') or 0) / 1000.0,
+            duration_min=(data.get('moving_time') or 0) / 60.0,
+            elevation_gain=data.get('total_elevation_gain'),
+            calories=data.get('calories'),
+            average_heartrate=data.get('average_heartrate'),
+            perceived_exertion=data.get('perceived_exertion'),
+            description=data.get('description') or "",
+            suffer_score=data.get('suffer_score'),
+            summary_polyline=(data.get('map') or {}).get('summary_polyline') or "",
+            start_epoch=start_epoch,
+            local_epoch=local_epoch,
+        )
+
+    @classmethod
+    def from_struct(cls, summary, start_epoch: int = 0, local_epoch: int = 0) -> "Activity":
+        """
+        Comme from_strava, à partir d'un résumé décodé par msgspec (json_codec.ActivitySummaryStruct) :
+        les attributs sont lus directement, sans dict intermédiaire.
+        """
+        return cls(
+            id=summary.id,
+            name=summary.name or "Activité sans nom",
+            type=summary.type or "Inconnu",
+            sport_type=summary.sport_type,
+            start_date=summary.start_date or "",
+            start_date_local=summary.start_date_local or "",
+            distance_km=(summary.distance or 0) / 1000.0,
+            duration_min=(summary.moving_time or 0) / 60.0,
+            elevation_gain=summary.total_elevation_gain,
+            calories=summary.calories,
+            average_heartrate=summary.average_heartrate,
+            perceived_exertion=summary.perceived_exertion,
+            description=summary.description or "",
+            suffer_score=summary.suffer_score,
+            summary_polyline=(summary.map.summary_polyline if summary.map else None) or "",
+            start_epoch=start_epoch,
+            local_epoch=local_epoch,
+        )
+
+    @property
+    def local_date(self) -> str:
+        """Jour local de l'activité (AAAA-MM-JJ), ou chaîne vide si inconnu."""
+        return self.start_date_local[:10]
+
+    @property
+    def local_day(self):
+        """Jour local de l'activité (datetime.date), pour les regroupements jour/semaine/mois."""
+        return epoch_to_day(self.local_epoch)
+
+
+def decode_activities(content: bytes) -> list:
+    """
+    Décode une page /athlete/activities directement en liste d'Activity.
+    Les dates de toute la page sont converties en timestamps en une seule opération.
+    """
+    structs = decode_activity_structs(content)
+    if structs is not None:
+        start_epochs = parse_epochs(summary.start_date for summary in structs)
+        local_epochs = parse_epochs(summary.start_date_local for summary in structs)
+        return [Activity.from_struct(summary, start_epoch, local_epoch)
+                for summary, start_epoch, local_epoch in zip(structs, start_epochs, local_epochs)]
+    summaries = decode_activity_summaries(content)
+    start_epochs = parse_epochs(summary.get('start_date') for summary in summaries)
+    local_epochs = parse_epochs(summary.get('start_date_local') for summary in summaries)
+    return [Activity.from_strava(summary, start_epoch, local_epoch)
+            for summary, start_epoch, local_epoch in zip(summaries, start_epochs, local_epochs)]
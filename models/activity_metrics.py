@@ -0,0 +1,82 @@
+# models/activity_metrics.py
+import numpy as np
+
+# Bornes des zones cardiaques en fraction de la FC max (Z1 < 60% < Z2 < 70% < Z3 < 80% < Z4 < 90% < Z5)
+HR_ZONE_BOUNDS = (0.6, 0.7, 0.8, 0.9)
+# Distances (en mètres) pour les meilleurs efforts
+BEST_EFFORT_DISTANCES = {"best_1k": 1000.0, "best_5k": 5000.0}
+# Fenêtre glissante (en secondes) de la puissance normalisée
+NP_WINDOW_SECONDS = 30
+# Au-delà de cet écart entre deux points, on considère que l'activité était en pause
+MAX_SAMPLE_GAP_SECONDS = 30
+
+
+def hr_zone_minutes(time, heartrate, hr_max):
+    """Temps passé (en minutes) dans chacune des 5 zones cardiaques."""
+    if time is None or heartrate is None or len(heartrate) < 2:
+        return None
+    # Durée de chaque échantillon = écart avec le précédent (les pauses sont plafonnées)
+    dt = np.minimum(np.diff(time.astype(np.float64)), MAX_SAMPLE_GAP_SECONDS)
+    bounds = np.asarray(HR_ZONE_BOUNDS) * hr_max
+    zones = np.searchsorted(bounds, heartrate[1:], side='right')
+    minutes = np.bincount(zones, weights=dt, minlength=len(bounds) + 1) / 60.0
+    return [round(float(m), 1) for m in minutes]
+
+
+def best_effort_seconds(time, distance, effort_distance):
+    """Temps le plus court (en secondes) pour couvrir effort_distance mètres, ou None."""
+    if time is None or distance is None or len(distance) < 2 or distance[-1] - distance[0] < effort_distance:
+        return None
+    distance = distance.astype(np.float64)
+    # Pour chaque point de départ i, premier point j tel que distance[j] >= distance[i] + effort
+    ends = np.searchsorted(distance, distance + effort_distance, side='left')
+    valid = ends < len(distance)
+    if not valid.any():
+        return None
+    durations = time[ends[valid]] - time[valid]
+    return int(durations.min())
+
+
+def normalized_power(time, watts):
+    """Puissance normalisée : moyenne glissante 30 s à la puissance 4, moyennée, puis racine 4e."""
+    if time is None or watts is None or len(watts) < NP_WINDOW_SECONDS:
+        return None
+    # Rééchantillonnage à 1 Hz (les streams Strava peuvent être irréguliers)
+    seconds = np.arange(time[0], time[-1] + 1)
+    power = np.interp(seconds, time, watts)
+    if len(power) < NP_WINDOW_SECONDS:
+        return None
+    cumulative = np.cumsum(np.insert(power, 0, 0.0))
+    rolling = (cumulative[NP_WINDOW_SECONDS:] - cumulative[:-NP_WINDOW_SECONDS]) / NP_WINDOW_SECONDS
+    return round(float(np.mean(rolling ** 4) ** 0.25), 1)
+
+
+def km_splits_seconds(time, distance):
+    """Temps (en secondes) de chaque kilomètre complet."""
+    if time is None or distance is None or len(distance) < 2:
+        return []
+    full_km = int(distance[-1] // 1000)
+    if full_km == 0:
+        return []
+    marks = np.arange(0, full_km + 1) * 1000.0
+    # Instant (interpolé) de passage à chaque kilomètre
+    crossing_times = np.interp(marks, distance, time)
+    return [int(round(s)) for s in np.diff(crossing_times)]
+
+
+def compute_metrics(streams: dict, hr_max: int) -> dict:
+    """
+    Calcule toutes les métriques dérivées d'une activité à partir de ses streams.
+    Le résultat ne contient que des types JSON (sauvegardé tel quel par StreamStore).
+    """
+    time = streams.get("time")
+    distance = streams.get("distance")
+
+    metrics = {
+        "hr_zones_min": hr_zone_minutes(time, streams.get("heartrate"), hr_max),
+        "normalized_power": normalized_power(time, streams.get("watts")),
+        "splits_s": km_splits_seconds(time, distance),
+    }
+    for name, effort_distance in BEST_EFFORT_DISTANCES.items():
+        metrics[f"{name}_s"] = best_effort_seconds(time, distance, effort_distance)
+    return metrics
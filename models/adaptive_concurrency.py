@@ -0,0 +1,113 @@
+# models/adaptive_concurrency.py
+import time
+import threading
+from collections import deque
+
+# Réduction de la limite sur un 429 (diminution multiplicative)
+BACKOFF_FACTOR = 0.5
+# Réduction plus douce quand la latence se dégrade sans 429
+LATENCY_BACKOFF_FACTOR = 0.9
+# Latence récente jugée « stable » tant qu'elle reste sous ce multiple de la latence de référence
+LATENCY_TOLERANCE = 1.5
+LATENCY_DEGRADED = 2.0
+# Délai minimal (en secondes) entre deux augmentations de la limite
+INCREASE_INTERVAL_SECONDS = 1.0
+# Fenêtre (en secondes) du calcul du débit affiché
+THROUGHPUT_WINDOW_SECONDS = 10
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite adaptative du nombre de requêtes simultanées (AIMD) :
+    - augmentation additive (+1 par seconde au plus) tant que la limite est atteinte, que la latence
+      reste stable et qu'aucun 429 n'est reçu ;
+    - diminution multiplicative sur un 429, avec pause de toutes les requêtes pendant le Retry-After ;
+    - diminution légère si la latence récente dépasse nettement la latence de référence.
+    Utilisation : acquire() avant la requête, release(latence, code HTTP, Retry-After) après.
+    """
+
+    def __init__(self, initial_limit: int = 3, min_limit: int = 1, max_limit: int = 8):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self.throttled_count = 0
+        self._condition = threading.Condition()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._last_change = 0.0
+        self._saturated = False          # la limite a été atteinte depuis le dernier changement
+        self._recent_latency = None     # moyenne mobile rapide
+        self._baseline_latency = None   # moyenne mobile lente (référence)
+        self._completions = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self):
+        """Attend une place libre (et la fin d'une éventuelle pause Retry-After)."""
+        with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self.in_flight >= int(self._limit):
+                    self._condition.wait()
+                else:
+                    self.in_flight += 1
+                    if self.in_flight >= int(self._limit):
+                        self._saturated = True
+                    return
+
+    def release(self, latency: float, status_code: int = None, retry_after: float = None):
+        """Libère la place et ajuste la limite selon le résultat de la requête."""
+        now = time.monotonic()
+        with self._condition:
+            self.in_flight -= 1
+            if status_code == 429:
+                self.throttled_count += 1
+                # Les 429 reçus pendant une pause déjà en cours répondent à des requêtes antérieures
+                if now >= self._paused_until:
+                    self._decrease(now, BACKOFF_FACTOR)
+                self._paused_until = max(self._paused_until, now + (retry_after or 1.0))
+            elif status_code is not None and status_code < 500:
+                self._completions.append(now)
+                self._observe_latency(now, latency)
+            self._condition.notify_all()
+
+    def _decrease(self, now: float, factor: float):
+        # Une seule diminution par fenêtre : les réponses des requêtes déjà envoyées ne comptent pas
+        if now - self._last_decrease < (self._recent_latency or 1.0):
+            return
+        self._last_decrease = self._last_change = now
+        self._saturated = False
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    def _observe_latency(self, now: float, latency: float):
+        if self._baseline_latency is None:
+            self._recent_latency = self._baseline_latency = latency
+        else:
+            self._recent_latency += 0.2 * (latency - self._recent_latency)
+            self._baseline_latency += 0.02 * (latency - self._baseline_latency)
+        if self._recent_latency > self._baseline_latency * LATENCY_DEGRADED:
+            self._decrease(now, LATENCY_BACKOFF_FACTOR)
+        elif (self._recent_latency <= self._baseline_latency * LATENCY_TOLERANCE and self._saturated
+              and now - self._last_change >= INCREASE_INTERVAL_SECONDS):
+            # Limite atteinte sans dégradation : une requête simultanée de plus
+            self._last_change = now
+            self._saturated = False
+            self._limit = min(float(self.max_limit), self._limit + 1.0)
+
+    def throughput(self) -> float:
+        """Requêtes abouties par seconde sur les dernières secondes."""
+        with self._condition:
+            horizon = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+            while self._completions and self._completions[0] < horizon:
+                self._completions.popleft()
+            return len(self._completions) / THROUGHPUT_WINDOW_SECONDS
+
+    def stats_text(self) -> str:
+        """Résumé lisible pour le tableau de bord."""
+        return (f"{self.limit} requêtes simultanées (max {self.max_limit}), {self.throughput():.1f} req/s, "
+                f"{self.throttled_count} × 429")
@@ -0,0 +1,185 @@
+# models/aggregate_store.py
+import os
+import json
+import math
+from datetime import date, timedelta
+
+from models.date_utils import epoch_to_day
+
+# Constantes de temps des charges chroniques (CTL, ~forme) et aiguës (ATL, ~fatigue), en jours
+CTL_DAYS = 42
+ATL_DAYS = 7
+
+
+def week_key(day: date) -> str:
+    """Clé de semaine ISO (ex: 2024-W05)."""
+    iso_year, iso_week, _ = day.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def month_key(day: date) -> str:
+    """Clé de mois (ex: 2024-03)."""
+    return f"{day.year}-{day.month:02d}"
+
+
+def period_end(period_key: str) -> date:
+    """Dernier jour d'une période (semaine ISO ou mois)."""
+    if "-W" in period_key:
+        iso_year, iso_week = period_key.split("-W")
+        return date.fromisocalendar(int(iso_year), int(iso_week), 7)
+    year, month = (int(part) for part in period_key.split("-"))
+    first_of_next = date(year + (month == 12), month % 12 + 1, 1)
+    return first_of_next - timedelta(days=1)
+
+
+def activity_load(activity) -> float:
+    """Charge d'entraînement d'une activité : suffer_score Strava si disponible, sinon 1 point par minute."""
+    if activity.suffer_score is not None:
+        return float(activity.suffer_score)
+    return activity.duration_min
+
+
+class AggregateStore:
+    """
+    Agrégats hebdomadaires/mensuels (distance, durée, D+, charge) et charge glissante (CTL/ATL),
+    maintenus de façon incrémentale et persistés dans un fichier JSON.
+    Chaque activité n'est comptée qu'une fois : l'historique complet n'est jamais relu.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._state = {
+            "activities": {},   # id -> [jour ISO, distance km, durée min, D+ m, charge]
+            "periods": {},      # clé de période -> totaux
+            "daily_load": {},   # jour ISO -> charge du jour
+            "fitness": {},      # jour ISO -> [CTL, ATL] à la fin du jour
+            "page_ids": {},     # clé de période -> ID de la page Notion de synthèse
+            "dirty": [],        # périodes modifiées pas encore écrites dans Notion
+        }
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                self._state.update(json.load(f))
+        except FileNotFoundError:
+            pass
+
+    def save(self):
+        """Écrit l'état de façon atomique (fichier temporaire puis renommage)."""
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.file_path)
+
+    def _apply(self, day: date, values, sign: int):
+        """Ajoute (sign=1) ou retire (sign=-1) la contribution d'une activité à ses périodes."""
+        distance_km, duration_min, elevation_m, load = values
+        for key in (week_key(day), month_key(day)):
+            totals = self._state["periods"].setdefault(
+                key, {"distance_km": 0.0, "duration_min": 0.0, "elevation_m": 0.0, "count": 0, "load": 0.0})
+            totals["distance_km"] += sign * distance_km
+            totals["duration_min"] += sign * duration_min
+            totals["elevation_m"] += sign * elevation_m
+            totals["count"] += sign
+            totals["load"] += sign * load
+        day_iso = day.isoformat()
+        self._state["daily_load"][day_iso] = self._state["daily_load"].get(day_iso, 0.0) + sign * load
+
+    def add_activities(self, activities) -> set:
+        """
+        Intègre un lot d'activités (idempotent : une activité déjà comptée est remplacée).
+        Retourne l'ensemble des clés de périodes modifiées par ce lot.
+        """
+        affected = set()
+        earliest_day = None
+
+        for activity in activities:
+            activity_id = str(activity.id)
+            if activity.local_epoch:
+                day = activity.local_day
+            elif activity.start_epoch:
+                day = epoch_to_day(activity.start_epoch) # Heure locale inconnue : jour UTC
+            else:
+                continue # Activité sans date : elle tomberait au 01/01/1970
+            values = [
+                activity.distance_km,
+                activity.duration_min,
+                activity.elevation_gain or 0.0,
+                activity_load(activity),
+            ]
+
+            previous = self._state["activities"].get(activity_id)
+            if previous == [day.isoformat()] + values:
+                continue # Déjà comptée à l'identique : rien à recalculer
+            if previous:
+                previous_day = date.fromisoformat(previous[0])
+                self._apply(previous_day, previous[1:], -1)
+                affected.update((week_key(previous_day), month_key(previous_day)))
+                earliest_day = min(earliest_day or previous_day, previous_day)
+
+            self._apply(day, values, 1)
+            self._state["activities"][activity_id] = [day.isoformat()] + values
+            affected.update((week_key(day), month_key(day)))
+            earliest_day = min(earliest_day or day, day)
+
+        if earliest_day is not None:
+            # La charge glissante des périodes suivantes dépend des jours modifiés
+            affected.update(self._update_fitness_from(earliest_day))
+        self._state["dirty"] = sorted(affected.union(self._state["dirty"]))
+        return affected
+
+    def _update_fitness_from(self, start_day: date) -> set:
+        """
+        Recalcule CTL/ATL (moyennes exponentielles de la charge quotidienne) à partir de start_day
+        seulement, en repartant de la valeur stockée la veille. Retourne les périodes concernées.
+        """
+        fitness = self._state["fitness"]
+        daily_load = self._state["daily_load"]
+        ctl, atl = fitness.get((start_day - timedelta(days=1)).isoformat(), [0.0, 0.0])
+        ctl_decay = math.exp(-1.0 / CTL_DAYS)
+        atl_decay = math.exp(-1.0 / ATL_DAYS)
+
+        last_day = max(date.today(), max(date.fromisoformat(d) for d in daily_load))
+        affected = set()
+        day = start_day
+        while day <= last_day:
+            load = daily_load.get(day.isoformat(), 0.0)
+            ctl = ctl * ctl_decay + load * (1 - ctl_decay)
+            atl = atl * atl_decay + load * (1 - atl_decay)
+            fitness[day.isoformat()] = [round(ctl, 2), round(atl, 2)]
+            # On ne réécrit que les périodes qui contiennent au moins une activité
+            for key in (week_key(day), month_key(day)):
+                if key in self._state["periods"]:
+                    affected.add(key)
+            day += timedelta(days=1)
+        return affected
+
+    def get_period(self, period_key: str) -> dict:
+        """Totaux d'une période, avec la charge glissante (CTL/ATL) à la fin de la période."""
+        totals = dict(self._state["periods"].get(period_key, {}))
+        end = min(period_end(period_key), date.today())
+        fitness = self._state["fitness"]
+        if fitness and end.isoformat() not in fitness:
+            # Charge calculée jusqu'au jour du dernier lot : prolongée jusqu'à la fin de la période
+            # (jours sans activité), pour une période écrite ou réessayée un autre jour
+            last_computed = date.fromisoformat(max(fitness))
+            if last_computed < end:
+                self._update_fitness_from(last_computed + timedelta(days=1))
+        ctl, atl = fitness.get(end.isoformat(), [0.0, 0.0])
+        totals.update({"ctl": ctl, "atl": atl,
+                       "kind": "Semaine" if "-W" in period_key else "Mois"})
+        return totals
+
+    def pending_periods(self) -> list:
+        """Périodes modifiées qui restent à écrire dans Notion (y compris après un échec précédent)."""
+        return list(self._state["dirty"])
+
+    def get_page_id(self, period_key: str):
+        return self._state["page_ids"].get(period_key)
+
+    def mark_written(self, period_key: str, page_id: str):
+        """Enregistre l'ID de la page de synthèse et retire la période des périodes à écrire."""
+        self._state["page_ids"][period_key] = page_id
+        if period_key in self._state["dirty"]:
+            self._state["dirty"].remove(period_key)
@@ -34,6 +34,85 @@ class ConfigManager:
             "MAP_HEART_RATE" : os.getenv("MAP_HEART_RATE") or "FC Moy",
             "MAP_PERCEIVED_EXERTION" : os.getenv("MAP_PERCEIVED_EXERTION") or "EP",
             "MAP_DESCRIPTION" : os.getenv("MAP_DESCRIPTION") or "Notes",
+            
+            # --- MÉTRIQUES DÉRIVÉES DES STREAMS (colonne vide = non envoyée) ---
+            "MAP_NORMALIZED_POWER" : os.getenv("MAP_NORMALIZED_POWER") or "",
+            "MAP_BEST_1K" : os.getenv("MAP_BEST_1K") or "",
+            "MAP_BEST_5K" : os.getenv("MAP_BEST_5K") or "",
+            "MAP_HR_ZONES" : os.getenv("MAP_HR_ZONES") or "",
+            "MAP_SPLITS" : os.getenv("MAP_SPLITS") or "",
+            
+            # --- TRACÉ ET PARCOURS IDENTIQUES (colonne vide = non envoyée) ---
+            "MAP_START_LOCATION" : os.getenv("MAP_START_LOCATION") or "",
+            "MAP_ROUTE_FINGERPRINT" : os.getenv("MAP_ROUTE_FINGERPRINT") or "",
+            "MAP_SAME_ROUTE" : os.getenv("MAP_SAME_ROUTE") or "",
+            "MAP_SAME_ROUTE_COUNT" : os.getenv("MAP_SAME_ROUTE_COUNT") or "",
+            "ROUTE_INDEX_FILE": os.getenv("ROUTE_INDEX_FILE") or "route_index.json",
+            "ROUTE_MATCH_RADIUS_M": os.getenv("ROUTE_MATCH_RADIUS_M") or "200",
+            
+            # --- OPTIONS AVANCÉES ---
+            "ENABLE_STREAMS": os.getenv("ENABLE_STREAMS") or "false",
+            "STREAMS_CACHE_DIR": os.getenv("STREAMS_CACHE_DIR") or "streams_cache",
+            "HR_MAX": os.getenv("HR_MAX") or "190",
+            
+            # --- BASE DE SYNTHÈSE (agrégats semaine/mois, vide = désactivée) ---
+            "NOTION_SUMMARY_DATABASE_URL": os.getenv("NOTION_SUMMARY_DATABASE_URL") or "",
+            "AGGREGATES_FILE": os.getenv("AGGREGATES_FILE") or "aggregates.json",
+            "SUMMARY_MAP_TITLE": os.getenv("SUMMARY_MAP_TITLE") or "Période",
+            "SUMMARY_MAP_KIND": os.getenv("SUMMARY_MAP_KIND") or "Type",
+            "SUMMARY_MAP_DISTANCE": os.getenv("SUMMARY_MAP_DISTANCE") or "Distance (km)",
+            "SUMMARY_MAP_DURATION": os.getenv("SUMMARY_MAP_DURATION") or "Durée (min)",
+            "SUMMARY_MAP_ELEVATION": os.getenv("SUMMARY_MAP_ELEVATION") or "D+",
+            "SUMMARY_MAP_COUNT": os.getenv("SUMMARY_MAP_COUNT") or "Activités",
+            "SUMMARY_MAP_LOAD": os.getenv("SUMMARY_MAP_LOAD") or "Charge",
+            "SUMMARY_MAP_CTL": os.getenv("SUMMARY_MAP_CTL") or "CTL",
+            "SUMMARY_MAP_ATL": os.getenv("SUMMARY_MAP_ATL") or "ATL",
+            
+            # --- PROFILAGE (off, on, cprofile ou pyinstrument) ---
+            "PROFILING": os.getenv("PROFILING") or "off",
+            "PROFILING_DIR": os.getenv("PROFILING_DIR") or "profiling",
+            
+            # --- LOGS DU TABLEAU DE BORD ---
+            "LOG_LEVEL": os.getenv("LOG_LEVEL") or "INFO",
+            "LOG_BUFFER_SIZE": os.getenv("LOG_BUFFER_SIZE") or "2000",
+            "LOG_VIEW_MAX_LINES": os.getenv("LOG_VIEW_MAX_LINES") or "5000",
+            
+            # --- HISTORIQUE DES SYNCHRONISATIONS (journal JSON-lines sur disque) ---
+            "SYNC_HISTORY_DIR": os.getenv("SYNC_HISTORY_DIR") or "sync_history",
+            "SYNC_HISTORY_MAX_BYTES": os.getenv("SYNC_HISTORY_MAX_BYTES") or "5242880",
+            "SYNC_HISTORY_BACKUPS": os.getenv("SYNC_HISTORY_BACKUPS") or "10",
+            
+            # --- TÉLÉCHARGEMENT DE L'HISTORIQUE STRAVA (1 = séquentiel) ---
+            "STRAVA_DOWNLOAD_WORKERS": os.getenv("STRAVA_DOWNLOAD_WORKERS") or "4",
+            # Durée (s) pendant laquelle une réponse GET Strava identique est resservie sans requête
+            "STRAVA_CACHE_TTL": os.getenv("STRAVA_CACHE_TTL") or "60",
+            
+            # --- FILE DE SYNCHRONISATION NOTION (workers partagés, polling prioritaire) ---
+            "NOTION_SYNC_WORKERS": os.getenv("NOTION_SYNC_WORKERS") or "3",
+            "NOTION_MAX_REQUESTS_PER_SECOND": os.getenv("NOTION_MAX_REQUESTS_PER_SECOND") or "3",
+            "NOTION_ADAPTIVE_CONCURRENCY": os.getenv("NOTION_ADAPTIVE_CONCURRENCY") or "true",
+            "NOTION_MAX_CONCURRENCY": os.getenv("NOTION_MAX_CONCURRENCY") or "8",
+            
+            # --- ARRÊT ORDONNÉ (délai en secondes, point de reprise) ---
+            "SHUTDOWN_TIMEOUT": os.getenv("SHUTDOWN_TIMEOUT") or "10",
+            "SYNC_CHECKPOINT_FILE": os.getenv("SYNC_CHECKPOINT_FILE") or "sync_checkpoint.json",
+            
+            # --- SERVEUR HTTP (production = waitress si installé ; dev = Werkzeug) ---
+            "SERVER_MODE": os.getenv("SERVER_MODE") or "production",
+            "SERVER_THREADS": os.getenv("SERVER_THREADS") or "8",
+            "SERVER_REQUEST_TIMEOUT": os.getenv("SERVER_REQUEST_TIMEOUT") or "30",
+            
+            # --- EXPORT LOCAL (liste parmi csv, sqlite, parquet ; vide = désactivé) ---
+            "EXPORT_SINKS": os.getenv("EXPORT_SINKS") or "",
+            "EXPORT_DIR": os.getenv("EXPORT_DIR") or "exports",
+            
+            # --- CALCULS CPU (processus dédiés ; 1 = dans le thread de synchronisation) ---
+            "CPU_WORKERS": os.getenv("CPU_WORKERS") or "2",
+            "CPU_CHUNK_SIZE": os.getenv("CPU_CHUNK_SIZE") or "500",
+            
+            # --- URL DES API (à ne modifier que pour les tests de charge sur un faux serveur local) ---
+            "STRAVA_API_URL": os.getenv("STRAVA_API_URL") or "https://www.strava.com/api/v3",
+            "NOTION_API_URL": os.getenv("NOTION_API_URL") or "https://api.notion.com/v1",
         }
 
     def _extract_notion_id(self, url_or_id: str) -> str:
@@ -66,6 +145,19 @@ class ConfigManager:
             
         return value
 
+    def get_bool(self, key: str) -> bool:
+        """Interprète une valeur de configuration comme un booléen ('true', '1', 'oui'...)."""
+        value = self._config.get(key)
+        return str(value).strip().lower() in ("1", "true", "yes", "oui", "on")
+
+    def get_int(self, key: str, default: int) -> int:
+        """Interprète une valeur de configuration comme un entier, avec valeur par défaut."""
+        value = self._config.get(key)
+        try:
+            return int(str(value).strip())
+        except (TypeError, ValueError):
+            return default
+
     def set(self, key: str, value: str):
         """Met à jour une valeur dans le cache de configuration et l'enregistre dans .env."""
         self._config[key] = str(value)
@@ -103,6 +195,84 @@ class ConfigManager:
         self._config["MAP_HEART_RATE"] = os.getenv("MAP_HEART_RATE") or "FC Moy"
         self._config["MAP_PERCEIVED_EXERTION"] = os.getenv("MAP_PERCEIVED_EXERTION") or "EP"
         self._config["MAP_DESCRIPTION"] = os.getenv("MAP_DESCRIPTION") or "Notes"
+        
+        # Métriques dérivées des streams
+        self._config["MAP_NORMALIZED_POWER"] = os.getenv("MAP_NORMALIZED_POWER") or ""
+        self._config["MAP_BEST_1K"] = os.getenv("MAP_BEST_1K") or ""
+        self._config["MAP_BEST_5K"] = os.getenv("MAP_BEST_5K") or ""
+        self._config["MAP_HR_ZONES"] = os.getenv("MAP_HR_ZONES") or ""
+        self._config["MAP_SPLITS"] = os.getenv("MAP_SPLITS") or ""
+        
+        # Tracé et parcours identiques
+        self._config["MAP_START_LOCATION"] = os.getenv("MAP_START_LOCATION") or ""
+        self._config["MAP_ROUTE_FINGERPRINT"] = os.getenv("MAP_ROUTE_FINGERPRINT") or ""
+        self._config["MAP_SAME_ROUTE"] = os.getenv("MAP_SAME_ROUTE") or ""
+        self._config["MAP_SAME_ROUTE_COUNT"] = os.getenv("MAP_SAME_ROUTE_COUNT") or ""
+        self._config["ROUTE_INDEX_FILE"] = os.getenv("ROUTE_INDEX_FILE") or "route_index.json"
+        self._config["ROUTE_MATCH_RADIUS_M"] = os.getenv("ROUTE_MATCH_RADIUS_M") or "200"
+        
+        # Options avancées
+        self._config["ENABLE_STREAMS"] = os.getenv("ENABLE_STREAMS") or "false"
+        self._config["STREAMS_CACHE_DIR"] = os.getenv("STREAMS_CACHE_DIR") or "streams_cache"
+        self._config["HR_MAX"] = os.getenv("HR_MAX") or "190"
+        
+        # Base de synthèse
+        self._config["NOTION_SUMMARY_DATABASE_URL"] = os.getenv("NOTION_SUMMARY_DATABASE_URL") or ""
+        self._config["AGGREGATES_FILE"] = os.getenv("AGGREGATES_FILE") or "aggregates.json"
+        self._config["SUMMARY_MAP_TITLE"] = os.getenv("SUMMARY_MAP_TITLE") or "Période"
+        self._config["SUMMARY_MAP_KIND"] = os.getenv("SUMMARY_MAP_KIND") or "Type"
+        self._config["SUMMARY_MAP_DISTANCE"] = os.getenv("SUMMARY_MAP_DISTANCE") or "Distance (km)"
+        self._config["SUMMARY_MAP_DURATION"] = os.getenv("SUMMARY_MAP_DURATION") or "Durée (min)"
+        self._config["SUMMARY_MAP_ELEVATION"] = os.getenv("SUMMARY_MAP_ELEVATION") or "D+"
+        self._config["SUMMARY_MAP_COUNT"] = os.getenv("SUMMARY_MAP_COUNT") or "Activités"
+        self._config["SUMMARY_MAP_LOAD"] = os.getenv("SUMMARY_MAP_LOAD") or "Charge"
+        self._config["SUMMARY_MAP_CTL"] = os.getenv("SUMMARY_MAP_CTL") or "CTL"
+        self._config["SUMMARY_MAP_ATL"] = os.getenv("SUMMARY_MAP_ATL") or "ATL"
+        
+        # Profilage
+        self._config["PROFILING"] = os.getenv("PROFILING") or "off"
+        self._config["PROFILING_DIR"] = os.getenv("PROFILING_DIR") or "profiling"
+        
+        # Logs du tableau de bord
+        self._config["LOG_LEVEL"] = os.getenv("LOG_LEVEL") or "INFO"
+        self._config["LOG_BUFFER_SIZE"] = os.getenv("LOG_BUFFER_SIZE") or "2000"
+        self._config["LOG_VIEW_MAX_LINES"] = os.getenv("LOG_VIEW_MAX_LINES") or "5000"
+        
+        # Historique des synchronisations
+        self._config["SYNC_HISTORY_DIR"] = os.getenv("SYNC_HISTORY_DIR") or "sync_history"
+        self._config["SYNC_HISTORY_MAX_BYTES"] = os.getenv("SYNC_HISTORY_MAX_BYTES") or "5242880"
+        self._config["SYNC_HISTORY_BACKUPS"] = os.getenv("SYNC_HISTORY_BACKUPS") or "10"
+        
+        # Téléchargement de l'historique Strava
+        self._config["STRAVA_DOWNLOAD_WORKERS"] = os.getenv("STRAVA_DOWNLOAD_WORKERS") or "4"
+        self._config["STRAVA_CACHE_TTL"] = os.getenv("STRAVA_CACHE_TTL") or "60"
+        
+        # File de synchronisation Notion
+        self._config["NOTION_SYNC_WORKERS"] = os.getenv("NOTION_SYNC_WORKERS") or "3"
+        self._config["NOTION_MAX_REQUESTS_PER_SECOND"] = os.getenv("NOTION_MAX_REQUESTS_PER_SECOND") or "3"
+        self._config["NOTION_ADAPTIVE_CONCURRENCY"] = os.getenv("NOTION_ADAPTIVE_CONCURRENCY") or "true"
+        self._config["NOTION_MAX_CONCURRENCY"] = os.getenv("NOTION_MAX_CONCURRENCY") or "8"
+        
+        # Arrêt ordonné
+        self._config["SHUTDOWN_TIMEOUT"] = os.getenv("SHUTDOWN_TIMEOUT") or "10"
+        self._config["SYNC_CHECKPOINT_FILE"] = os.getenv("SYNC_CHECKPOINT_FILE") or "sync_checkpoint.json"
+        
+        # Serveur HTTP
+        self._config["SERVER_MODE"] = os.getenv("SERVER_MODE") or "production"
+        self._config["SERVER_THREADS"] = os.getenv("SERVER_THREADS") or "8"
+        self._config["SERVER_REQUEST_TIMEOUT"] = os.getenv("SERVER_REQUEST_TIMEOUT") or "30"
+        
+        # Export local
+        self._config["EXPORT_SINKS"] = os.getenv("EXPORT_SINKS") or ""
+        self._config["EXPORT_DIR"] = os.getenv("EXPORT_DIR") or "exports"
+        
+        # Calculs CPU
+        self._config["CPU_WORKERS"] = os.getenv("CPU_WORKERS") or "2"
+        self._config["CPU_CHUNK_SIZE"] = os.getenv("CPU_CHUNK_SIZE") or "500"
+        
+        # URL des API
+        self._config["STRAVA_API_URL"] = os.getenv("STRAVA_API_URL") or "https://www.strava.com/api/v3"
+        self._config["NOTION_API_URL"] = os.getenv("NOTION_API_URL") or "https://api.notion.com/v1"
 
 
     def save_configuration(self, updates: dict):
@@ -0,0 +1,60 @@
+# models/cpu_stage.py
+"""
+Étape de calcul CPU de la synchronisation : les transformations coûteuses (décodage des tracés,
+distances...) sont envoyées par paquets à un pool de processus, hors du GIL. Les threads d'E/S
+(Strava, workers Notion) et la boucle Tkinter ne sont donc jamais bloqués par ces calculs.
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _apply_chunk(function, chunk):
+    """Exécuté dans un processus du pool : applique la fonction à tout un paquet."""
+    return [function(item) for item in chunk]
+
+
+class CpuStage:
+    """
+    Pool de processus créé au premier usage et partagé par toutes les synchronisations.
+    workers <= 1 : les calculs restent dans le thread appelant (pas de surcoût de processus).
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 500):
+        self.workers = workers if workers is not None else max(1, (os.cpu_count() or 2) - 1)
+        self.chunk_size = max(1, chunk_size)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # "spawn" : un fork d'un processus multi-threadé (Tk, workers Notion) n'est pas sûr
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def map(self, function, items) -> list:
+        """
+        Applique une fonction picklable (définie au niveau d'un module) à chaque élément.
+        Les résultats sont renvoyés dans l'ordre des éléments.
+        """
+        items = list(items)
+        # Un seul paquet : le coût d'envoi vers un processus dépasserait le gain
+        if self.workers <= 1 or len(items) <= self.chunk_size:
+            return [function(item) for item in items]
+        executor = self._get_executor()
+        futures = [executor.submit(_apply_chunk, function, items[start:start + self.chunk_size])
+                   for start in range(0, len(items), self.chunk_size)]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def shutdown(self, wait: bool = True):
+        """Arrête le pool de processus (les paquets en cours sont annulés si wait=False)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
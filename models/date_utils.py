@@ -0,0 +1,52 @@
+# models/date_utils.py
+"""
+Dates Strava -> timestamps Unix (secondes), calculés une seule fois à la réception des activités.
+
+Strava fournit deux dates pour chaque activité :
+- start_date : instant de départ en UTC ("2024-03-31T07:30:00Z") -> start_epoch ;
+- start_date_local : heure murale locale au moment du départ, suffixée elle aussi par "Z"
+  ("2024-03-31T09:30:00Z" à Paris après le passage à l'heure d'été) -> local_epoch, qui n'est pas
+  un instant mais l'heure locale comptée comme si elle était UTC.
+Le jour local (regroupements par jour/semaine/mois) se déduit donc de local_epoch sans base de fuseaux
+horaires, et local_epoch - start_epoch donne le décalage réel (DST compris) de chaque activité.
+"""
+from datetime import datetime, date, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def parse_epoch(value: str) -> int:
+    """Date ISO 8601 de Strava (avec 'Z' ou décalage explicite) -> timestamp Unix. 0 si vide."""
+    if not value:
+        return 0
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def parse_epochs(values) -> list:
+    """
+    Version vectorisée de parse_epoch pour une page d'activités (NumPy datetime64 si disponible).
+    Les dates Strava sont toutes en UTC ('Z') : le suffixe est retiré avant la conversion NumPy.
+    """
+    values = list(values)
+    if np is None or not values or not all(v and v.endswith('Z') for v in values):
+        return [parse_epoch(v) for v in values]
+    return np.array([v[:-1] for v in values], dtype='datetime64[s]').astype('int64').tolist()
+
+
+def epoch_to_day(epoch: int) -> date:
+    """Jour calendaire d'un timestamp (local_epoch -> jour local, start_epoch -> jour UTC)."""
+    return date.fromordinal(_EPOCH_ORDINAL + epoch // SECONDS_PER_DAY)
+
+
+def utc_offset_seconds(start_epoch: int, local_epoch: int) -> int:
+    """Décalage horaire réel de l'activité (ex: 7200 à Paris en été, 3600 en hiver)."""
+    return local_epoch - start_epoch
@@ -0,0 +1,104 @@
+# models/http_cache.py
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, body: bytes, etag: str, last_modified: str):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+
+class HttpCache:
+    """
+    Petit cache HTTP en mémoire pour les GET :
+    - une réponse identique demandée moins de ttl_seconds après la précédente est servie sans requête ;
+    - au-delà, la requête est conditionnelle (If-None-Match / If-Modified-Since) et une réponse 304
+      réutilise le corps en cache, sans retransférer le payload.
+    Taille bornée (LRU) et statistiques de hits/misses pour le tableau de bord.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0          # servis depuis le cache sans requête (TTL)
+        self.revalidated = 0   # requête conditionnelle -> 304 Not Modified
+        self.misses = 0        # payload complet téléchargé
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(url: str, params: dict = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get_fresh(self, key: str):
+        """Entrée encore valide (dans le TTL), ou None. Compte un hit le cas échéant."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry.fetched_at > self.ttl_seconds:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_saved += len(entry.body)
+            return entry
+
+    def conditional_headers(self, key: str) -> dict:
+        """En-têtes de validation à ajouter à la requête si une version (même périmée) est en cache."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def not_modified(self, key: str):
+        """Réponse 304 : l'entrée en cache est toujours valide. Retourne son corps (ou None si évincée)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.fetched_at = time.monotonic()
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            self.bytes_saved += len(entry.body)
+            return entry.body
+
+    def store(self, key: str, body: bytes, etag: str = None, last_modified: str = None):
+        """Enregistre une réponse complète (200)."""
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = CacheEntry(body, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.revalidated) / total if total else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "entries": len(self._entries),
+            }
+
+    def stats_text(self) -> str:
+        """Résumé lisible pour le tableau de bord."""
+        stats = self.stats()
+        return (f"{stats['hits']} hits, {stats['revalidated']} 304, {stats['misses']} misses "
+                f"({stats['hit_ratio']:.0%}) - {stats['bytes_saved'] / 1024:.0f} Ko économisés")
@@ -0,0 +1,107 @@
+# models/json_codec.py
+"""
+Décodage/encodage JSON rapide : orjson ou msgspec s'ils sont installés, sinon le module json standard.
+Les résumés d'activités Strava sont réduits aux seuls champs utiles (mapping Notion, dédoublonnage,
+agrégats, tracé résumé) : polylines détaillées, compteurs sociaux... ne sont jamais conservés en mémoire.
+"""
+import json
+from typing import TypedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Champs d'un résumé d'activité effectivement utilisés par l'application
+ACTIVITY_SUMMARY_FIELDS = (
+    "id", "name", "type", "sport_type", "start_date", "start_date_local",
+    "distance", "moving_time", "total_elevation_gain", "calories",
+    "average_heartrate", "perceived_exertion", "description", "suffer_score", "map",
+)
+
+
+class ActivitySummary(TypedDict, total=False):
+    """Résumé d'activité réduit (sous-ensemble des champs de /athlete/activities)."""
+    id: int
+    name: str
+    type: str
+    sport_type: str
+    start_date: str
+    start_date_local: str
+    distance: float
+    moving_time: int
+    total_elevation_gain: float
+    calories: float
+    average_heartrate: float
+    perceived_exertion: float
+    description: str
+    suffer_score: float
+    map: dict               # seul map.summary_polyline est utilisé
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    loads = orjson.loads
+    dumps = orjson.dumps
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    loads = msgspec.json.decode
+    dumps = msgspec.json.encode
+else:
+    BACKEND = "json"
+    loads = json.loads
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+if msgspec is not None:
+    # Avec msgspec, les champs inutiles sont ignorés pendant le décodage (jamais matérialisés) ;
+    # les champs absents valent None, comme data.get() sur le JSON d'origine
+    class _MapStruct(msgspec.Struct):
+        summary_polyline: str | None = None
+
+    class ActivitySummaryStruct(msgspec.Struct):
+        """Résumé d'activité réduit, décodé par msgspec (mêmes champs qu'ActivitySummary)."""
+        id: int
+        name: str | None = None
+        type: str | None = None
+        sport_type: str | None = None
+        start_date: str | None = None
+        start_date_local: str | None = None
+        distance: float | None = None
+        moving_time: int | None = None
+        total_elevation_gain: float | None = None
+        calories: float | None = None
+        average_heartrate: float | None = None
+        perceived_exertion: float | None = None
+        description: str | None = None
+        suffer_score: float | None = None
+        map: _MapStruct | None = None
+
+    _summaries_decoder = msgspec.json.Decoder(list[ActivitySummaryStruct])
+
+
+def decode_activity_structs(content: bytes) -> list | None:
+    """
+    Décode une page /athlete/activities en liste d'ActivitySummaryStruct (lue par Activity.from_struct).
+    Retourne None si msgspec n'est pas installé ou si Strava renvoie un type inattendu :
+    utiliser alors decode_activity_summaries.
+    """
+    if msgspec is None:
+        return None
+    try:
+        return _summaries_decoder.decode(content)
+    except msgspec.ValidationError:
+        return None
+
+
+def decode_activity_summaries(content: bytes) -> list[ActivitySummary]:
+    """Décode une page /athlete/activities en liste de résumés réduits (ActivitySummary)."""
+    return [{key: activity[key] for key in ACTIVITY_SUMMARY_FIELDS if key in activity}
+            for activity in loads(content)]
@@ -0,0 +1,58 @@
+# models/lifecycle_manager.py
+import sys
+import time
+import signal
+import threading
+
+
+class LifecycleManager:
+    """
+    Arrêt ordonné de l'application (fermeture de la fenêtre, Ctrl+C, SIGTERM).
+    Les composants enregistrés sont arrêtés dans l'ordre d'enregistrement, chacun avec
+    le temps restant sur un délai global : arrêt des déclenchements, fin ou mise en
+    checkpoint des écritures Notion en cours, puis arrêt du serveur HTTP.
+    """
+
+    def __init__(self, deadline_seconds: float = 10.0):
+        self.deadline_seconds = deadline_seconds
+        self._components = []
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def register(self, name: str, stop):
+        """
+        Enregistre un composant. stop(timeout) doit rendre la main avant timeout secondes
+        et retourner False si l'arrêt n'a pas pu être complet.
+        """
+        self._components.append((name, stop))
+
+    def shutdown(self) -> bool:
+        """Arrête tous les composants (une seule fois). Retourne True si tout s'est arrêté proprement."""
+        with self._lock:
+            if self._stopped:
+                return True
+            self._stopped = True
+
+        deadline = time.monotonic() + self.deadline_seconds
+        clean = True
+        for name, stop in self._components:
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                if stop(remaining) is False:
+                    clean = False
+                    print(f"AVERTISSEMENT: Arrêt incomplet de '{name}' dans le délai imparti.")
+            except Exception as e:
+                clean = False
+                print(f"ERREUR lors de l'arrêt de '{name}': {e}")
+        return clean
+
+    def install_signal_handlers(self):
+        """Ctrl+C et SIGTERM déclenchent l'arrêt ordonné (mode sans interface, thread principal uniquement)."""
+        def handle_signal(signum, frame):
+            print(f"INFO: Signal {signal.Signals(signum).name} reçu, arrêt en cours...")
+            clean = self.shutdown()
+            sys.exit(0 if clean else 1)
+
+        signal.signal(signal.SIGINT, handle_signal)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, handle_signal)
@@ -0,0 +1,63 @@
+# models/log_channel.py
+import threading
+from collections import deque
+
+# Niveaux de log, déduits du préfixe des messages ("INFO:", "ERREUR...", "SUCCÈS:"...)
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+
+_PREFIX_LEVELS = (
+    ("ERREUR", "ERROR"),
+    ("AVERTISSEMENT", "WARNING"),
+    ("SUCCÈS", "SUCCESS"),
+    ("DEBUG", "DEBUG"),
+)
+
+
+def level_of(message: str) -> int:
+    """Niveau d'un message selon son préfixe (INFO par défaut)."""
+    for prefix, level in _PREFIX_LEVELS:
+        if message.startswith(prefix):
+            return LOG_LEVELS[level]
+    return LOG_LEVELS["INFO"]
+
+
+def parse_level(name: str) -> int:
+    """Convertit un nom de niveau (LOG_LEVEL du .env) en valeur numérique (INFO si inconnu)."""
+    return LOG_LEVELS.get((name or "").strip().upper(), LOG_LEVELS["INFO"])
+
+
+class LogChannel:
+    """
+    Canal de logs borné entre les threads de synchronisation et l'interface.
+    Tampon circulaire : au-delà de maxlen entrées non lues, les plus anciennes sont abandonnées
+    (et comptées), ce qui garde la mémoire constante pendant les longues synchronisations.
+    Compatible avec l'usage de queue.Queue fait par le PollingScheduler (put / put_nowait / empty).
+    """
+
+    def __init__(self, maxlen: int = 2000):
+        self._buffer = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+    def put(self, entry: str, block=True, timeout=None):
+        """Ajoute une entrée (jamais bloquant : le tampon est circulaire)."""
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._dropped += 1
+            self._buffer.append(entry)
+
+    put_nowait = put
+
+    def empty(self) -> bool:
+        return not self._buffer
+
+    def drain(self):
+        """
+        Retire toutes les entrées en attente en une seule opération.
+        Retourne (entrées, nombre d'entrées abandonnées depuis le dernier drain).
+        """
+        with self._lock:
+            entries = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+        return entries, dropped
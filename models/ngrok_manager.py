@@ -4,6 +4,7 @@ import requests
 import time
 import os
 import signal
+import threading
 
 class NgrokManager:
     """Gère le lancement et l'arrêt du tunnel ngrok pour exposer l'application Flask."""
@@ -13,6 +14,10 @@ class NgrokManager:
         self.ngrok_process = None
         self.api_url = "http://127.0.0.1:4040/api/tunnels"
         self.tunnel_url = None
+        # Surveillance du tunnel en arrière-plan (start_monitor)
+        self._monitor_thread = None
+        self._monitor_stop = None
+        self._restart_lock = threading.Lock()
 
     def _get_ngrok_executable(self):
         """Détermine le nom de l'exécutable ngrok en fonction du système."""
@@ -33,17 +38,44 @@ class NgrokManager:
         except (subprocess.CalledProcessError, FileNotFoundError):
             return False
 
-    def start_tunnel(self):
-        """Démarre le tunnel ngrok en arrière-plan et récupère l'URL publique."""
+    def _find_tunnel(self, timeout: float = 1.0):
+        """
+        URL HTTPS publique d'un tunnel déjà ouvert vers notre port (API locale de ngrok), ou None.
+        Lève requests.RequestException si l'API ngrok ne répond pas (agent pas encore prêt).
+        """
+        response = requests.get(self.api_url, timeout=timeout)
+        response.raise_for_status()
+        for tunnel in response.json().get('tunnels', []):
+            addr = str(tunnel.get('config', {}).get('addr', ''))
+            # Rechercher l'URL HTTPS (nécessaire pour le webhook Strava) pointant sur notre port
+            if tunnel.get('proto') == 'https' and addr.rsplit(':', 1)[-1].rstrip('/') == self.port:
+                return tunnel['public_url']
+        return None
+
+    def start_tunnel(self, deadline_seconds: float = 15.0):
+        """
+        Démarre le tunnel ngrok en arrière-plan et récupère l'URL publique.
+        Un tunnel déjà ouvert vers le même port (autre instance de ngrok) est réutilisé tel quel.
+        Sinon l'API locale est interrogée avec un délai croissant (50 ms -> 500 ms) jusqu'à ce que le
+        tunnel soit prêt : l'URL est obtenue dès que ngrok le permet, sans attente fixe.
+        """
         
         # S'assurer que le tunnel précédent est arrêté
         if self.ngrok_process:
-            self.stop_tunnel()
+            self._stop_process()
+
+        try:
+            existing_url = self._find_tunnel(timeout=0.5)
+            if existing_url:
+                print(f"INFO: Tunnel ngrok existant réutilisé : {existing_url}")
+                self.tunnel_url = existing_url
+                return self.tunnel_url
+        except requests.exceptions.RequestException:
+            pass # Pas d'agent ngrok en cours : on le lance
 
         ngrok_exe = self._get_ngrok_executable()
         
         # Commande pour démarrer ngrok et l'attacher au port Flask
-        # Nous utilisons 'run' au lieu de 'http' pour les versions récentes de ngrok
         command = [ngrok_exe, 'http', self.port]
         
         # Démarrer ngrok sans bloquer l'application principale
@@ -52,31 +84,89 @@ class NgrokManager:
                                               stderr=subprocess.DEVNULL)
         
         # Attendre que le tunnel soit établi et que l'API de ngrok soit disponible
-        time.sleep(3) 
+        deadline = time.monotonic() + deadline_seconds
+        delay = 0.05
+        last_error = None
+        while time.monotonic() < deadline:
+            if self.ngrok_process.poll() is not None:
+                code = self.ngrok_process.returncode
+                self.ngrok_process = None
+                raise Exception(f"ngrok s'est arrêté au démarrage (code {code}). Vérifiez le token d'authentification ngrok.")
+            try:
+                self.tunnel_url = self._find_tunnel()
+                if self.tunnel_url:
+                    return self.tunnel_url
+            except requests.exceptions.RequestException as e:
+                last_error = e # API pas encore disponible
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, 0.5)
+
+        self._stop_process()
+        if last_error is not None:
+            raise Exception(f"Impossible de se connecter à l'API ngrok (port 4040) après {deadline_seconds:.0f} s. Erreur: {last_error}")
+        raise Exception(f"Aucun tunnel HTTPS trouvé via l'API ngrok après {deadline_seconds:.0f} s.")
+
+    def start_monitor(self, interval_seconds: float = 10.0, on_url_change=None):
+        """
+        Surveille le tunnel en arrière-plan : si le processus ngrok meurt ou que le tunnel disparaît,
+        il est relancé (avec un délai croissant entre les échecs). on_url_change(url) est appelé
+        lorsque l'URL publique change (ex: pour réenregistrer le webhook).
+        """
+        self.stop_monitor()
+        self._monitor_stop = threading.Event()
+        self._monitor_thread = threading.Thread(target=self._monitor_loop,
+                                                args=(self._monitor_stop, interval_seconds, on_url_change),
+                                                daemon=True)
+        self._monitor_thread.start()
+
+    def stop_monitor(self):
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            self._monitor_stop.set()
+            if self._monitor_thread is not threading.current_thread():
+                self._monitor_thread.join(timeout=5)
+        self._monitor_thread = None
 
+    def _current_tunnel_url(self):
+        """URL publique actuelle du tunnel, ou None si le processus ou le tunnel a disparu."""
+        if self.ngrok_process and self.ngrok_process.poll() is not None:
+            return None
         try:
-            # Interroger l'API ngrok locale pour obtenir l'URL publique
-            response = requests.get(self.api_url, timeout=5)
-            response.raise_for_status()
-            
-            tunnels = response.json()['tunnels']
-            
-            # Rechercher l'URL HTTPS (nécessaire pour le webhook Strava)
-            for tunnel in tunnels:
-                if tunnel['proto'] == 'https':
-                    self.tunnel_url = tunnel['public_url']
-                    return self.tunnel_url
-            
-            raise Exception("Aucun tunnel HTTPS trouvé via l'API ngrok.")
+            return self._find_tunnel()
+        except requests.exceptions.RequestException:
+            return None
 
-        except requests.exceptions.RequestException as e:
-            self.stop_tunnel()
-            raise Exception(f"Impossible de se connecter à l'API ngrok (port 4040). Erreur: {e}")
-        except Exception as e:
-            self.stop_tunnel()
-            raise Exception(f"Erreur lors de la récupération de l'URL ngrok: {e}")
+    def _monitor_loop(self, stop_event, interval_seconds, on_url_change):
+        retry_delay = interval_seconds
+        while not stop_event.wait(retry_delay):
+            previous_url = self.tunnel_url
+            current_url = self._current_tunnel_url()
+            if current_url:
+                retry_delay = interval_seconds
+                if current_url != previous_url:
+                    self.tunnel_url = current_url
+                    if on_url_change:
+                        on_url_change(current_url)
+                continue
+            
+            print("AVERTISSEMENT: Tunnel ngrok perdu. Redémarrage...")
+            try:
+                with self._restart_lock:
+                    self._stop_process()
+                    new_url = self.start_tunnel()
+                print(f"INFO: Tunnel ngrok rétabli : {new_url}")
+                retry_delay = interval_seconds
+                if on_url_change and new_url != previous_url:
+                    on_url_change(new_url)
+            except Exception as e:
+                retry_delay = min(retry_delay * 2, 300)
+                print(f"ERREUR lors du redémarrage du tunnel ngrok : {e} Nouvel essai dans {retry_delay:.0f} s.")
 
     def stop_tunnel(self):
+        """Arrête la surveillance et le processus ngrok (un tunnel réutilisé n'est pas arrêté)."""
+        self.stop_monitor()
+        self._stop_process()
+
+    def _stop_process(self):
         """Arrête le processus ngrok."""
         if self.ngrok_process:
             try:
@@ -92,4 +182,4 @@ class NgrokManager:
                      self.ngrok_process.kill()
             finally:
                 self.ngrok_process = None
-                self.tunnel_url = None
\ No newline at end of file
+        self.tunnel_url = None
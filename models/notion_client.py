@@ -1,12 +1,67 @@
 # models/notion_client.py
 import requests
 import re
+import time
+import threading
+from contextlib import nullcontext
+from array import array
+from bisect import bisect_left
+from urllib.parse import unquote
 from models.config_manager import ConfigManager
+from models.json_codec import loads, dumps
+from models.activity import Activity
+from models.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+NOTION_API_URL = "https://api.notion.com/v1"
+# Taille de page maximale autorisée par l'endpoint databases/{id}/query
+NOTION_PAGE_SIZE = 100
+# Limites Notion d'une propriété texte : 2000 caractères par segment, 100 segments
+NOTION_TEXT_LIMIT = 2000
+NOTION_MAX_TEXT_SEGMENTS = 100
+# Nouvelles tentatives d'une requête refusée par un 429 (mode de concurrence adaptative)
+NOTION_MAX_THROTTLE_RETRIES = 5
+# Nombre de liens vers les activités au parcours identique (les plus récentes)
+MAX_SAME_ROUTE_LINKS = 5
+
+
+def contains_strava_id(strava_ids: array, strava_id: int) -> bool:
+    """Recherche dichotomique d'un ID dans le tableau trié retourné par get_synced_strava_ids."""
+    index = bisect_left(strava_ids, strava_id)
+    return index < len(strava_ids) and strava_ids[index] == strava_id
+
+
+def retry_after_seconds(response, default: float = 1.0) -> float:
+    """
+    Délai Retry-After d'une réponse 429, en secondes. Valeur par défaut si l'en-tête est absent
+    ou non numérique (une date HTTP, par exemple).
+    """
+    try:
+        return max(0.0, float(response.headers.get('Retry-After') or default))
+    except (TypeError, ValueError):
+        return default
+
+
+def text_segments(text: str) -> list:
+    """
+    Valeur rich_text/title Notion : le texte découpé en segments de 2000 caractères au plus
+    (un texte plus long ferait échouer toute la création de page). Liste vide si le texte est vide.
+    """
+    if not text:
+        return []
+    return [{"text": {"content": text[i:i + NOTION_TEXT_LIMIT]}}
+            for i in range(0, min(len(text), NOTION_TEXT_LIMIT * NOTION_MAX_TEXT_SEGMENTS), NOTION_TEXT_LIMIT)]
+
 
 class NotionClient:
+    # Préfixes des clés de configuration lues par le client (voir config_signature)
+    CONFIG_PREFIXES = ("NOTION_", "MAP_")
+
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
+        self.config_signature = self.get_config_signature(config_manager)
         self.token = self.config_manager.get("NOTION_TOKEN")
+        # URL de base de l'API (surchargée par les benchmarks pour viser un faux serveur local)
+        self.api_url = (self.config_manager.get("NOTION_API_URL") or NOTION_API_URL).rstrip("/")
         
         # L'extraction doit garantir un format UUID 8-4-4-4-12 valide
         db_url_or_id = self.config_manager.get("NOTION_DATABASE_URL")
@@ -18,6 +73,33 @@ class NotionClient:
             "Content-Type": "application/json"
         }
         
+        # Schéma de la base (propriétés et leurs IDs), chargé à la première utilisation
+        self._database_schema = None
+        # Les options de sélection manquantes sont ajoutées au schéma en un seul PATCH (prepare_select_options)
+        self._schema_lock = threading.Lock()
+        # Mapping des colonnes (MAP_*), lu une fois par client (le client est recréé à chaque changement de config)
+        self._mapping = None
+        # Début pré-sérialisé du corps des créations de page : seules les propriétés sont encodées à chaque appel
+        self._page_payload_prefix = dumps({"parent": {"database_id": self.database_id}})[:-1] + b',"properties":'
+        self.pages_created = 0
+        self.page_payload_bytes = 0
+        self._stats_lock = threading.Lock()
+        
+        # Profileur optionnel (SyncProfiler), attaché par le PollingScheduler le temps d'une exécution
+        self.profiler = None
+        
+        # Espacement des requêtes, partagé par tous les workers de synchronisation (~3 req/s chez Notion)
+        self.min_request_interval = 1.0 / max(1, self.config_manager.get_int("NOTION_MAX_REQUESTS_PER_SECOND", 3))
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+        # Concurrence adaptative (AIMD) : remplace l'espacement fixe, ajustée selon la latence et les 429
+        self.concurrency = None
+        if self.config_manager.get_bool("NOTION_ADAPTIVE_CONCURRENCY"):
+            self.concurrency = AdaptiveConcurrencyLimiter(
+                initial_limit=self.config_manager.get_int("NOTION_SYNC_WORKERS", 3),
+                max_limit=self.config_manager.get_int("NOTION_MAX_CONCURRENCY", 8)
+            )
+        
         # Vérification critique après l'extraction
         if not self._is_valid_uuid(self.database_id):
             raise ValueError(
@@ -25,6 +107,51 @@ class NotionClient:
                 "Veuillez vérifier NOTION_DATABASE_URL dans le .env."
             )
 
+    @classmethod
+    def get_config_signature(cls, config_manager: ConfigManager) -> tuple:
+        """Valeurs de configuration dont dépend le client : s'il est inchangé, le client peut être réutilisé."""
+        return tuple(sorted((key, value) for key, value in config_manager._config.items()
+                            if key.startswith(cls.CONFIG_PREFIXES)))
+
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Envoie une requête HTTP vers Notion (chronométrée par endpoint si un profileur est attaché).
+        En concurrence adaptative, une requête refusée par un 429 est renvoyée après le Retry-After.
+        """
+        for attempt in range(NOTION_MAX_THROTTLE_RETRIES + 1):
+            if self.concurrency is None:
+                self._wait_for_rate_budget()
+            else:
+                self.concurrency.acquire()
+            start = time.perf_counter()
+            response = None
+            try:
+                response = requests.request(method, url, **kwargs)
+            finally:
+                latency = time.perf_counter() - start
+                status_code = response.status_code if response is not None else None
+                if self.concurrency is not None:
+                    # Toujours libérer la place, sinon elle serait perdue pour toutes les requêtes suivantes
+                    self.concurrency.release(latency, status_code,
+                                             retry_after_seconds(response) if status_code == 429 else None)
+                if self.profiler:
+                    self.profiler.record_request(method, url, latency, status_code)
+            if status_code != 429 or self.concurrency is None:
+                break
+        return response
+
+    def _wait_for_rate_budget(self):
+        """Attend le créneau de la prochaine requête (espacement minimal, tous threads confondus)."""
+        with self._rate_lock:
+            wait = self._next_request_time - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request_time = time.monotonic() + self.min_request_interval
+
+    def _stage(self, name: str):
+        """Contexte de mesure d'une étape (sans effet si aucun profileur n'est attaché)."""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
 
     def _is_valid_uuid(self, uuid_string):
         """Vérifie si la chaîne est un UUID formaté correctement (8-4-4-4-12)."""
@@ -67,11 +194,13 @@ class NotionClient:
 
     def _get_mapping(self):
         """Récupère tous les mappings MAP_* depuis le ConfigManager."""
-        return {
-            key: self.config_manager.get(key)
-            for key in self.config_manager._config 
-            if key.startswith('MAP_')
-        }
+        if self._mapping is None:
+            self._mapping = {
+                key: self.config_manager.get(key)
+                for key in self.config_manager._config 
+                if key.startswith('MAP_')
+            }
+        return self._mapping
 
     def is_activity_synced(self, strava_id: int) -> bool:
         """Vérifie si une activité existe déjà dans la base de données Notion."""
@@ -92,14 +221,15 @@ class NotionClient:
             }
         }
         
-        response = requests.post(
-            f"https://api.notion.com/v1/databases/{self.database_id}/query",
+        response = self._request(
+            "POST",
+            f"{self.api_url}/databases/{self.database_id}/query",
             headers=self.headers,
             json=filter_data
         )
 
         if response.status_code == 200:
-            results = response.json().get('results', [])
+            results = loads(response.content).get('results', [])
             return len(results) > 0
         else:
             # L'erreur 404 (object_not_found) est critique : DB introuvable ou permissions.
@@ -113,70 +243,284 @@ class NotionClient:
             print(f"Erreur API Notion (is_synced) : {response.status_code} - {response.text}")
             return False 
 
-    def _create_notion_properties(self, activity):
+    def _get_database_schema(self):
+        """Récupère (une seule fois) le schéma de la base : nom de propriété -> définition."""
+        if self._database_schema is None:
+            response = self._request(
+                "GET",
+                f"{self.api_url}/databases/{self.database_id}",
+                headers=self.headers
+            )
+            if response.status_code != 200:
+                raise Exception(f"Échec de la lecture du schéma Notion (Code {response.status_code}). Réponse API: {response.text}")
+            self._database_schema = loads(response.content).get('properties', {})
+        return self._database_schema
+
+    def _get_select_options(self, property_name: str):
+        """Noms des options d'une propriété 'select' (schéma en cache), ou None si ce n'est pas un select."""
+        prop = self._get_database_schema().get(property_name)
+        if not prop or prop.get('type') != 'select':
+            return None
+        return {option['name'] for option in prop.get('select', {}).get('options', [])}
+
+    def prepare_select_options(self, activities) -> list:
+        """
+        Avant une écriture en masse : crée en UNE modification du schéma toutes les options de
+        sélection (types de sport) absentes de la base pour ce lot d'activités.
+        Sans cela, Notion crée l'option implicitement à la première page, et des créations
+        concurrentes se disputent cette modification du schéma.
+        Retourne la liste des options ajoutées.
+        """
+        type_column = self._get_mapping().get('MAP_TYPE')
+        if not type_column:
+            return []
+        
+        with self._schema_lock:
+            existing = self._get_select_options(type_column)
+            if existing is None:
+                return [] # Colonne absente ou d'un autre type : rien à préparer
+            missing = sorted({activity.type for activity in activities if activity.type} - existing)
+            if not missing:
+                return []
+            
+            # Les options existantes sont renvoyées telles quelles (par ID) pour ne rien perdre
+            options = [{"id": option['id']} for option in
+                       self._database_schema[type_column].get('select', {}).get('options', [])]
+            options += [{"name": name} for name in missing]
+            response = self._request(
+                "PATCH",
+                f"{self.api_url}/databases/{self.database_id}",
+                headers=self.headers,
+                json={"properties": {type_column: {"select": {"options": options}}}}
+            )
+            if response.status_code != 200:
+                raise Exception(f"Échec de l'ajout des options {missing} (Code {response.status_code}). Réponse API: {response.text}")
+            self._database_schema = loads(response.content).get('properties', {})
+            return missing
+
+    def _get_property_id(self, property_name: str):
+        """Retourne l'ID d'une propriété (utilisé par filter_properties), ou None si absente."""
+        prop = self._get_database_schema().get(property_name)
+        if not prop:
+            return None
+        # Notion renvoie des IDs déjà encodés pour l'URL : on les décode pour éviter un double encodage
+        return unquote(prop['id'])
+
+    def _iter_database_pages(self, property_names=None, progress_callback=None):
+        """
+        Parcourt TOUTE la base de données page par page (100 résultats par requête, sans filtre).
+        Si property_names est fourni, seules ces propriétés sont renvoyées par l'API (filter_properties),
+        ce qui réduit fortement la taille des réponses.
+        """
+        params = []
+        for name in property_names or []:
+            prop_id = self._get_property_id(name)
+            if prop_id is None:
+                raise Exception(f"La colonne '{name}' n'existe pas dans la base Notion. Vérifiez le mapping.")
+            params.append(("filter_properties", prop_id))
+
+        body = {"page_size": NOTION_PAGE_SIZE}
+        scanned = 0
+        
+        while True:
+            response = self._request(
+                "POST",
+                f"{self.api_url}/databases/{self.database_id}/query",
+                headers=self.headers,
+                params=params,
+                json=body
+            )
+            if response.status_code != 200:
+                raise Exception(f"Échec du parcours de la base Notion (Code {response.status_code}). Réponse API: {response.text}")
+            
+            data = loads(response.content)
+            for page in data.get('results', []):
+                scanned += 1
+                yield page
+            
+            if progress_callback:
+                progress_callback(scanned)
+            
+            if not data.get('has_more'):
+                break
+            body["start_cursor"] = data.get('next_cursor')
+
+    def iter_strava_id_pages(self, progress_callback=None):
+        """
+        Parcourt la base en ne lisant que la colonne ID Strava (MAP_STRAVA_ID).
+        Génère (ID Strava, created_time, page_id) pour chaque page ayant un ID Strava.
+        """
+        strava_id_column = self._get_mapping().get('MAP_STRAVA_ID')
+        if not strava_id_column:
+            raise ValueError("MAP_STRAVA_ID non défini. Impossible de parcourir les ID Strava de la base Notion.")
+
+        for page in self._iter_database_pages([strava_id_column], progress_callback):
+            value = page.get('properties', {}).get(strava_id_column, {}).get('number')
+            if value is not None:
+                yield int(value), page.get('created_time') or "", page['id']
+
+    def get_synced_strava_ids(self, progress_callback=None) -> array:
+        """
+        Pré-scan rapide : récupère en une passe tous les ID Strava déjà présents dans Notion.
+        Retourne un array('q') trié (8 octets par ID), à interroger avec contains_strava_id.
+        Environ 100 requêtes pour 10 000 lignes, au lieu d'une requête filtrée par activité.
+        """
+        strava_ids = array('q')
+        for strava_id, _, _ in self.iter_strava_id_pages(progress_callback):
+            strava_ids.append(strava_id)
+
+        # Tri + dédoublonnage pour permettre la recherche dichotomique
+        return array('q', sorted(set(strava_ids)))
+
+    def archive_page(self, page_id: str, max_retries: int = 3):
+        """
+        Archive (met à la corbeille) une page Notion.
+        En cas de 429, attend le délai Retry-After indiqué par Notion avant de réessayer
+        (en concurrence adaptative, _request s'en charge déjà : une seule tentative ici).
+        """
+        if self.concurrency is not None:
+            max_retries = 0
+        for attempt in range(max_retries + 1):
+            response = self._request(
+                "PATCH",
+                f"{self.api_url}/pages/{page_id}",
+                headers=self.headers,
+                json={"archived": True}
+            )
+            if response.status_code == 200:
+                return
+            if response.status_code != 429 or attempt == max_retries:
+                break
+            time.sleep(retry_after_seconds(response))
+        raise Exception(f"Échec de l'archivage de la page {page_id} (Code {response.status_code}). Réponse API: {response.text}")
+
+    def _create_metrics_properties(self, mapping, metrics):
+        """Construit les propriétés Notion des métriques dérivées des streams (colonnes optionnelles)."""
+        
+        def minutes(seconds):
+            return round(seconds / 60.0, 2) if seconds is not None else None
+        
+        def pace(seconds):
+            return f"{int(seconds) // 60}:{int(seconds) % 60:02d}"
+        
+        hr_zones = metrics.get('hr_zones_min') or []
+        splits = metrics.get('splits_s') or []
+        
+        return {
+            mapping.get('MAP_NORMALIZED_POWER'): {
+                "number": metrics.get('normalized_power')
+            },
+            mapping.get('MAP_BEST_1K'): {
+                "number": minutes(metrics.get('best_1k_s'))
+            },
+            mapping.get('MAP_BEST_5K'): {
+                "number": minutes(metrics.get('best_5k_s'))
+            },
+            mapping.get('MAP_HR_ZONES'): {
+                "rich_text": text_segments(" | ".join(
+                    f"Z{i + 1} {m} min" for i, m in enumerate(hr_zones)))
+            },
+            mapping.get('MAP_SPLITS'): {
+                "rich_text": text_segments(" | ".join(
+                    f"{km + 1}: {pace(s)}" for km, s in enumerate(splits)))
+            },
+        }
+
+    def _create_route_properties(self, mapping, route):
+        """Construit les propriétés Notion du tracé (colonnes optionnelles) : départ, empreinte, même parcours."""
+        # Liens vers les activités Strava au parcours identique, séparés par des virgules
+        same_route_ids = route.get('same_route_ids') or []
+        same_route_text = []
+        for i, strava_id in enumerate(same_route_ids[:MAX_SAME_ROUTE_LINKS]):
+            if i:
+                same_route_text.append({"text": {"content": ", "}})
+            same_route_text.append({"text": {"content": str(strava_id),
+                                             "link": {"url": f"https://www.strava.com/activities/{strava_id}"}}})
+        start_lat, start_lon = route['start_latlng']
+        
+        return {
+            mapping.get('MAP_START_LOCATION'): {
+                "rich_text": text_segments(f"{start_lat:.5f}, {start_lon:.5f}")
+            },
+            mapping.get('MAP_ROUTE_FINGERPRINT'): {
+                "rich_text": text_segments(route.get('fingerprint'))
+            },
+            mapping.get('MAP_SAME_ROUTE'): {
+                "rich_text": same_route_text
+            },
+            mapping.get('MAP_SAME_ROUTE_COUNT'): {
+                "number": len(same_route_ids)
+            },
+        }
+
+    def _create_notion_properties(self, activity: Activity, metrics=None, route=None):
         """Construit le dictionnaire de propriétés Notion à partir d'une activité Strava."""
         
         mapping = self._get_mapping()
 
-        # Conversion et calculs de base
-        distance_km = activity.get('distance', 0) / 1000.0
-        duration_min = activity.get('moving_time', 0) / 60.0
-        
         properties = {
             # Titre
             mapping['MAP_TITLE']: {
-                "title": [{"text": {"content": activity.get('name', 'Activité sans nom')}}]
+                "title": text_segments(activity.name)
             },
             # ID Strava (Unique)
             mapping['MAP_STRAVA_ID']: {
-                "number": activity['id']
+                "number": activity.id
             },
             # Date
             mapping['MAP_DATE']: {
-                "date": {"start": activity['start_date_local'].split('T')[0]} 
+                "date": {"start": activity.local_date}
             },
             # Distance
             mapping['MAP_DISTANCE']: {
-                "number": round(distance_km, 2)
+                "number": round(activity.distance_km, 2)
             },
             # Durée
             mapping['MAP_DURATION']: {
-                "number": round(duration_min, 2)
+                "number": round(activity.duration_min, 2)
             },
             # Type de Sport
             mapping['MAP_TYPE']: {
-                "select": {"name": activity.get('type', 'Inconnu')}
+                "select": {"name": activity.type}
             },
             # Gain d'Altitude
             mapping['MAP_ELEVATION']: {
-                "number": activity.get('total_elevation_gain')
+                "number": activity.elevation_gain
             },
 
             # NOUVELLES PROPRIÉTÉS AJOUTÉES :
             
             # Calories (si disponible)
             mapping.get('MAP_CALORIES', 'Calories'): {
-                "number": activity.get('calories')
+                "number": activity.calories
             },
             
             # Fréquence Cardiaque Moyenne (si disponible)
             mapping.get('MAP_HEART_RATE', 'FC Moy'): {
-                "number": activity.get('average_heartrate')
+                "number": activity.average_heartrate
             },
             
             # Effort Perçu (Rate of Perceived Exertion)
             mapping.get('MAP_PERCEIVED_EXERTION', 'RPE'): {
-                "number": activity.get('perceived_exertion') 
+                "number": activity.perceived_exertion
             },
             
             # Notes/Description
             mapping.get('MAP_DESCRIPTION', 'Notes'): {
-                "rich_text": [{"text": {"content": activity.get('description', '')}}]
+                "rich_text": text_segments(activity.description)
             },
             
         }
         
-        # Nettoyage : Exclure les propriétés de type 'number' dont la valeur est None
+        # Métriques dérivées des streams (si calculées)
+        if metrics:
+            properties.update(self._create_metrics_properties(mapping, metrics))
+        
+        # Tracé et parcours identiques (si l'activité a un tracé)
+        if route:
+            properties.update(self._create_route_properties(mapping, route))
+        
+        # Nettoyage : les valeurs vides ne sont pas envoyées (une propriété absente reste vide dans Notion)
         final_properties = {}
         for prop_name, prop_data in properties.items():
             if not prop_name or prop_name.strip() == "":
@@ -186,33 +530,112 @@ class NotionClient:
                 # Si la valeur est None, on exclut la propriété du JSON
                 if prop_data['number'] is not None:
                      final_properties[prop_name] = prop_data
+            elif 'rich_text' in prop_data:
+                if prop_data['rich_text']:
+                    final_properties[prop_name] = prop_data
+            elif 'select' in prop_data:
+                if prop_data['select'].get('name'):
+                    final_properties[prop_name] = prop_data
+            elif 'date' in prop_data:
+                if prop_data['date'].get('start'):
+                    final_properties[prop_name] = prop_data
             else:
-                # Inclure les autres types (Title, Text, Date, Select) même s'ils sont vides
+                # Le titre est toujours envoyé
                 final_properties[prop_name] = prop_data
 
         return final_properties
 
-    def sync_activity(self, activity: dict):
-        """Ajoute une activité à la base de données Notion."""
+    def sync_activity(self, activity: Activity, metrics: dict = None, route: dict = None):
+        """Ajoute une activité à la base de données Notion (avec ses métriques dérivées et son tracé si fournis)."""
         
-        properties = self._create_notion_properties(activity)
+        properties = self._create_notion_properties(activity, metrics, route)
         
         if not properties:
             raise ValueError("Propriétés Notion non générées. Vérifiez le mapping ou si Strava a fourni des données.")
 
-        data = {
-            "parent": {"database_id": self.database_id},
-            "properties": properties
-        }
+        # Corps JSON assemblé à partir du préfixe pré-sérialisé (parent) et des seules propriétés
+        body = self._page_payload_prefix + dumps(properties) + b"}"
         
-        response = requests.post(
-            "https://api.notion.com/v1/pages",
+        response = self._request(
+            "POST",
+            f"{self.api_url}/pages",
             headers=self.headers,
-            json=data
+            data=body
         )
+        with self._stats_lock:
+            self.pages_created += 1
+            self.page_payload_bytes += len(body)
 
         if response.status_code != 200:
             # Soulever une exception détaillée pour que le Poller puisse la loguer
             raise Exception(f"Échec de l'ajout à Notion (Code {response.status_code}). Réponse API: {response.text}")
         
-        return response.json()
\ No newline at end of file
+        return loads(response.content)
+
+    # ----------------------------------------------------------------------
+    # BASE DE SYNTHÈSE (agrégats hebdomadaires / mensuels)
+    # ----------------------------------------------------------------------
+
+    def average_page_payload_bytes(self) -> float:
+        """Taille moyenne (octets) du corps des requêtes de création de page envoyées par ce client."""
+        return self.page_payload_bytes / self.pages_created if self.pages_created else 0.0
+
+    def _create_summary_properties(self, period_key: str, totals: dict):
+        """Construit les propriétés Notion d'une page de synthèse (colonnes SUMMARY_MAP_*)."""
+        cfg = self.config_manager
+        properties = {
+            cfg.get('SUMMARY_MAP_TITLE'): {"title": [{"text": {"content": period_key}}]},
+            cfg.get('SUMMARY_MAP_KIND'): {"select": {"name": totals['kind']}},
+            cfg.get('SUMMARY_MAP_DISTANCE'): {"number": round(totals.get('distance_km', 0.0), 2)},
+            cfg.get('SUMMARY_MAP_DURATION'): {"number": round(totals.get('duration_min', 0.0), 1)},
+            cfg.get('SUMMARY_MAP_ELEVATION'): {"number": round(totals.get('elevation_m', 0.0), 1)},
+            cfg.get('SUMMARY_MAP_COUNT'): {"number": totals.get('count', 0)},
+            cfg.get('SUMMARY_MAP_LOAD'): {"number": round(totals.get('load', 0.0), 1)},
+            cfg.get('SUMMARY_MAP_CTL'): {"number": totals.get('ctl')},
+            cfg.get('SUMMARY_MAP_ATL'): {"number": totals.get('atl')},
+        }
+        return {name: data for name, data in properties.items() if name and name.strip()}
+
+    def _find_summary_page(self, summary_database_id: str, period_key: str):
+        """Cherche une page de synthèse existante par son titre (clé de période)."""
+        response = self._request(
+            "POST",
+            f"{self.api_url}/databases/{summary_database_id}/query",
+            headers=self.headers,
+            json={"filter": {"property": self.config_manager.get('SUMMARY_MAP_TITLE'),
+                             "title": {"equals": period_key}}}
+        )
+        if response.status_code != 200:
+            raise Exception(f"Échec de la recherche de synthèse (Code {response.status_code}). Réponse API: {response.text}")
+        results = loads(response.content).get('results', [])
+        return results[0]['id'] if results else None
+
+    def upsert_summary_page(self, summary_database_url: str, period_key: str, totals: dict, page_id: str = None):
+        """
+        Crée ou met à jour la page de synthèse d'une période dans la base de synthèse.
+        Retourne l'ID de la page (à mettre en cache pour éviter la recherche la fois suivante).
+        """
+        summary_database_id = self._extract_database_id(summary_database_url)
+        properties = self._create_summary_properties(period_key, totals)
+
+        if page_id is None:
+            page_id = self._find_summary_page(summary_database_id, period_key)
+
+        if page_id:
+            response = self._request(
+                "PATCH",
+                f"{self.api_url}/pages/{page_id}",
+                headers=self.headers,
+                json={"properties": properties}
+            )
+        else:
+            response = self._request(
+                "POST",
+                f"{self.api_url}/pages",
+                headers=self.headers,
+                json={"parent": {"database_id": summary_database_id}, "properties": properties}
+            )
+
+        if response.status_code != 200:
+            raise Exception(f"Échec de l'écriture de la synthèse {period_key} (Code {response.status_code}). Réponse API: {response.text}")
+        return loads(response.content)['id']
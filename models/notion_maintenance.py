@@ -0,0 +1,115 @@
+# models/notion_maintenance.py
+"""
+Maintenance de la base Notion : détection et archivage des pages en double (même ID Strava).
+
+La base est parcourue UNE seule fois (uniquement la colonne ID Strava, 100 lignes par requête),
+les pages sont regroupées par ID en mémoire, et pour chaque ID la page la plus ancienne
+(created_time, puis ID de page) est conservée. Les autres sont archivées en parallèle, dans
+la limite de débit de Notion (espacement des requêtes du NotionClient + Retry-After sur 429).
+
+Usage :
+    python -m models.notion_maintenance            # rapport seulement (dry-run)
+    python -m models.notion_maintenance --apply    # archive les doublons
+"""
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+
+def find_duplicates(notion_client, progress_callback=None) -> dict:
+    """
+    Retourne {ID Strava: [(created_time, page_id) de la page conservée, puis des doublons...]}
+    pour les seuls ID présents plusieurs fois dans la base.
+    """
+    first_pages = {}
+    duplicates = {}
+    for strava_id, created_time, page_id in notion_client.iter_strava_id_pages(progress_callback):
+        entry = (created_time, page_id)
+        if strava_id in first_pages:
+            duplicates.setdefault(strava_id, [first_pages[strava_id]]).append(entry)
+        else:
+            first_pages[strava_id] = entry
+
+    # Choix déterministe de la page conservée : la plus ancienne, puis le plus petit ID de page
+    for entries in duplicates.values():
+        entries.sort()
+    return duplicates
+
+
+def archive_duplicates(notion_client, duplicates: dict, max_workers: int = 3, progress_callback=None):
+    """
+    Archive toutes les pages en double (toutes sauf la première de chaque groupe).
+    Retourne (nombre de pages archivées, liste des (page_id, erreur) en échec).
+    """
+    extra_page_ids = [page_id for entries in duplicates.values() for _, page_id in entries[1:]]
+    failures = []
+
+    def archive(page_id):
+        try:
+            notion_client.archive_page(page_id)
+            return None
+        except Exception as e:
+            return page_id, str(e)
+
+    archived = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for done, failure in enumerate(executor.map(archive, extra_page_ids), start=1):
+            if failure:
+                failures.append(failure)
+            else:
+                archived += 1
+            if progress_callback:
+                progress_callback(done, len(extra_page_ids))
+    return archived, failures
+
+
+def report_lines(duplicates: dict, limit: int = 20) -> list:
+    """Rapport lisible des doublons trouvés (les 'limit' premiers groupes détaillés)."""
+    extra_count = sum(len(entries) - 1 for entries in duplicates.values())
+    lines = [f"{len(duplicates)} ID Strava en double, {extra_count} page(s) à archiver."]
+    for strava_id, entries in sorted(duplicates.items())[:limit]:
+        survivor_created, survivor_id = entries[0]
+        lines.append(f"  ID Strava {strava_id} : conservée {survivor_id} ({survivor_created}), "
+                     f"à archiver : {', '.join(page_id for _, page_id in entries[1:])}")
+    if len(duplicates) > limit:
+        lines.append(f"  ... et {len(duplicates) - limit} autre(s) ID.")
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Détection et archivage des doublons dans la base Notion.")
+    parser.add_argument("--apply", action="store_true", help="Archive les doublons (sinon : rapport seulement).")
+    parser.add_argument("--workers", type=int, default=3, help="Archivages en parallèle (défaut : 3).")
+    args = parser.parse_args()
+
+    from models.config_manager import ConfigManager
+    from models.notion_client import NotionClient
+    client = NotionClient(ConfigManager())
+
+    start = time.perf_counter()
+
+    def report_scan(scanned):
+        if scanned % 1000 == 0:
+            print(f"INFO: {scanned} lignes lues...")
+
+    duplicates = find_duplicates(client, progress_callback=report_scan)
+    print(f"INFO: Parcours de la base terminé en {time.perf_counter() - start:.1f} s.")
+    for line in report_lines(duplicates):
+        print(line)
+
+    if not args.apply:
+        if duplicates:
+            print("INFO: Dry-run : aucune page modifiée. Relancez avec --apply pour archiver les doublons.")
+        sys.exit(0)
+
+    def report_archive(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"INFO: {done}/{total} pages traitées...")
+
+    archived, failures = archive_duplicates(client, duplicates, max_workers=args.workers,
+                                            progress_callback=report_archive)
+    for page_id, error in failures:
+        print(f"ERREUR: page {page_id} : {error}")
+    print(f"SUCCÈS: {archived} page(s) archivée(s) en {time.perf_counter() - start:.1f} s, {len(failures)} échec(s).")
+    sys.exit(1 if failures else 0)
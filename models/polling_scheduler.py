@@ -2,13 +2,36 @@
 import time
 import threading
 import traceback
+from contextlib import nullcontext
 from datetime import datetime
 import queue 
 
 # Importations
 from models.config_manager import ConfigManager
 from models.strava_client import StravaClient
-from models.notion_client import NotionClient 
+from models.notion_client import NotionClient, contains_strava_id
+from models.aggregate_store import AggregateStore
+from models.sync_profiler import SyncProfiler
+from models.log_channel import level_of, parse_level
+from models.sync_history import SyncHistory
+from models.sync_queue import SyncQueue, SyncBatch, PRIORITY_HIGH, PRIORITY_LOW
+from models.sync_coordinator import SyncCoordinator
+from models.sync_checkpoint import SyncCheckpoint
+from models.sinks import create_sinks
+from models.cpu_stage import CpuStage
+from models.polyline import route_summary
+from models.route_index import RouteIndex, route_fingerprint
+
+# Au-delà de ce nombre d'activités, on pré-scanne la base Notion en une passe
+# plutôt que de faire une requête filtrée par activité.
+PRESCAN_THRESHOLD = 50
+
+# Colonnes Notion alimentées par l'analyse des tracés (étape ignorée si aucune n'est mappée)
+ROUTE_COLUMNS = ("MAP_START_LOCATION", "MAP_ROUTE_FINGERPRINT", "MAP_SAME_ROUTE", "MAP_SAME_ROUTE_COUNT")
+
+# Types de synchronisation coordonnés : le polling et la « Sync. Rapide » partagent le même type
+SYNC_LATEST = "latest"
+SYNC_HISTORY = "history"
 
 class PollingScheduler:
     
@@ -20,62 +43,208 @@ class PollingScheduler:
         self.is_running = False
         self.last_check_time = None
         self.log_queue = log_queue 
+        # Les messages sous ce niveau ne sont ni affichés ni envoyés au dashboard
+        self.log_level = parse_level(config_manager.get("LOG_LEVEL"))
         
         # Initialisation des clients
         self.strava_client = StravaClient(config_manager)
         self.notion_client = None 
         
+        # Stockage des streams (créé à la première utilisation, NumPy requis)
+        self.stream_store = None
+        # Agrégats semaine/mois (créés à la première utilisation)
+        self.aggregate_store = None
+        # Profileur de l'exécution en cours (PROFILING != off) : une seule exécution profilée à la fois
+        self.profiler = None
+        self._profiler_lock = threading.Lock()
+        # Journal persistant des synchronisations (créé à la première utilisation)
+        self._sync_history = None
+        # Destinations locales (CSV/SQLite/Parquet) selon EXPORT_SINKS, créées à la première utilisation
+        self.sinks = None
+        # Pool de processus des calculs CPU (tracés), créé à la première utilisation
+        self.cpu_stage = None
+        # Index spatial des tracés (parcours identiques), ouvert à la première utilisation
+        self.route_index = None
+        
+        # File de travail priorisée et workers Notion partagés par toutes les synchronisations
+        self.sync_queue = SyncQueue()
+        self._sync_workers = []
+        self._workers_lock = threading.Lock()
+        # Une seule synchronisation active par base et par type, réservation des activités en création
+        self.sync_coordinator = SyncCoordinator()
+        # Arrêt ordonné (LifecycleManager) : plus aucune nouvelle synchronisation une fois positionné
+        self._shutdown_event = threading.Event()
+        self.strava_client.stop_event = self._shutdown_event # pauses du budget Strava interrompues à l'arrêt
+        self._current_items = {} # thread worker -> activité en cours d'écriture
+        # Mise en file et vidage de la file à l'arrêt sont exclusifs : une activité soumise après le vidage
+        # est gardée pour le checkpoint (_late_pending), ou ajoutée au checkpoint s'il est déjà écrit
+        self._enqueue_lock = threading.Lock()
+        self._queue_closed = False
+        self._checkpoint_saved = False
+        self._late_pending = []
+        # Activités ajoutées à Notion depuis le lancement (compteur du tableau de bord, indépendant de LOG_LEVEL)
+        self.synced_total = 0
+        self._synced_total_lock = threading.Lock()
+        
     def _log(self, message):
         """Méthode helper pour envoyer un log à la console et au dashboard."""
+        if level_of(message) < self.log_level:
+            return
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         log_entry = f"[{timestamp}] {message}"
         print(log_entry)
         if self.log_queue:
             self.log_queue.put(log_entry)
 
+    @property
+    def sync_history(self):
+        """Journal des synchronisations (fichiers JSON-lines + index), ouvert au premier accès."""
+        if self._sync_history is None:
+            self._sync_history = SyncHistory(
+                self.config_manager.get("SYNC_HISTORY_DIR"),
+                max_bytes=self.config_manager.get_int("SYNC_HISTORY_MAX_BYTES", 5 * 1024 * 1024),
+                backup_count=self.config_manager.get_int("SYNC_HISTORY_BACKUPS", 10)
+            )
+        return self._sync_history
+
+    def _record_history(self, activity, action, **details):
+        """Enregistre un événement dans le journal sans jamais interrompre la synchronisation."""
+        try:
+            self.sync_history.record(activity.id, action,
+                                     activity_date=activity.local_date or None,
+                                     **details)
+        except Exception as e:
+            print(f"AVERTISSEMENT: Écriture du journal de synchronisation impossible : {e}")
+
     def _create_notion_client(self):
         """
         Crée et retourne une nouvelle instance de NotionClient 
         en utilisant la configuration actuelle.
+        Le client existant est conservé si sa configuration (NOTION_*, MAP_*) n'a pas changé :
+        les workers partagés continuent d'utiliser sa limite de concurrence, son schéma et ses caches.
         """
-        self._log("INFO: Création/Rafraîchissement du NotionClient avec la configuration actuelle.")
         try:
             self.config_manager.load_configuration() 
+            self.log_level = parse_level(self.config_manager.get("LOG_LEVEL"))
+            if (self.notion_client is not None and
+                    self.notion_client.config_signature == NotionClient.get_config_signature(self.config_manager)):
+                return self.notion_client
+            self._log("INFO: Création/Rafraîchissement du NotionClient avec la configuration actuelle.")
             # Si l'ID de la DB est mal formaté, le NotionClient lèvera une exception ici
             self.notion_client = NotionClient(self.config_manager)
+            self.notion_client.profiler = self.profiler
             return self.notion_client
         except Exception as e:
             self._log(f"ERREUR: Échec de la création du NotionClient. Cause possible: ID DB Notion invalide ou Token invalide. Détails: {e}")
             raise 
 
+    # -----------------------------------------------------
+    # PROFILAGE (opt-in via PROFILING dans le .env)
+    # -----------------------------------------------------
+
+    def _begin_profiling(self, run_name: str):
+        """
+        Attache un SyncProfiler aux clients pour la durée d'une exécution, si le profilage est activé.
+        Le profileur étant partagé (clients, workers), une exécution lancée pendant une exécution profilée
+        (polling pendant un historique, par exemple) n'est pas profilée.
+        """
+        mode = (self.config_manager.get("PROFILING") or "off").strip().lower()
+        if mode in ("", "off", "false", "0", "non"):
+            return None
+        
+        backend = mode if mode in ("cprofile", "pyinstrument") else None
+        with self._profiler_lock:
+            if self.profiler is not None:
+                self._log(f"INFO: Profilage déjà en cours ({self.profiler.run_name}) : '{run_name}' ne sera pas profilée.")
+                return None
+            profiler = self.profiler = SyncProfiler(run_name, backend=backend)
+            self.strava_client.profiler = profiler
+            if self.notion_client:
+                self.notion_client.profiler = profiler
+        profiler.start()
+        return profiler
+
+    def _end_profiling(self, profiler):
+        """Détache le profileur, affiche le tableau récapitulatif dans les logs et le sauvegarde en JSON."""
+        if profiler is None:
+            return
+        profiler.stop()
+        with self._profiler_lock:
+            self.profiler = None
+            self.strava_client.profiler = None
+            if self.notion_client:
+                self.notion_client.profiler = None
+        
+        for line in profiler.report_lines():
+            self._log(line)
+        try:
+            report_path = profiler.save(self.config_manager.get("PROFILING_DIR"))
+            self._log(f"INFO: Rapport de profilage sauvegardé : {report_path}")
+        except Exception as e:
+            self._log(f"AVERTISSEMENT: Impossible de sauvegarder le rapport de profilage : {e}")
+
+    def _stage(self, name: str):
+        """Contexte de mesure d'une étape de la synchronisation (sans effet hors profilage)."""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
     def _run(self):
         """Méthode de la boucle de Polling exécutée dans un thread séparé."""
         while not self._stop_event.is_set():
-            try:
-                self._log("--- Démarrage du cycle de polling ---")
+            self._run_coordinated(SYNC_LATEST, self._polling_cycle)
+            self._stop_event.wait(self.interval)
+
+    def _polling_cycle(self):
+        """Un cycle de polling : tokens, client Notion, puis dernières activités."""
+        profiler = self._begin_profiling("Polling Périodique")
+        try:
+            self._log("--- Démarrage du cycle de polling ---")
 
-                # 1. Rafraîchir les tokens Strava
+            # 1. Rafraîchir les tokens Strava
+            with self._stage("strava_token_refresh"):
                 self.strava_client.refresh_access_token()
+            
+            # 2. S'assurer que le client Notion est prêt
+            if not self.notion_client:
+                self._create_notion_client()
                 
-                # 2. S'assurer que le client Notion est prêt
-                if not self.notion_client:
-                    self._create_notion_client()
-                    
-                # 3. Synchroniser les activités
-                self._sync_latest_activities()
-                
-                self.last_check_time = time.time()
-                self._log("--- Cycle de polling terminé avec succès ---")
+            # 3. Synchroniser les activités
+            self._sync_latest_activities()
+            
+            self.last_check_time = time.time()
+            self._log("--- Cycle de polling terminé avec succès ---")
 
-            except Exception as e:
-                self._log(f"ERREUR CRITIQUE lors du cycle de polling : {e}")
-                traceback.print_exc() 
+        except Exception as e:
+            self._log(f"ERREUR CRITIQUE lors du cycle de polling : {e}")
+            traceback.print_exc() 
+        finally:
+            self._end_profiling(profiler)
 
-            self._stop_event.wait(self.interval)
+    def _run_coordinated(self, sync_kind: str, task):
+        """
+        Exécute une synchronisation via le coordinateur : une seule exécution active par base Notion
+        et par type. Un déclenchement du polling pendant un cycle en cours est fusionné en une seule
+        exécution de suivi ; une seconde synchronisation historique est simplement ignorée.
+        """
+        if self._shutdown_event.is_set():
+            self._log("INFO: Arrêt en cours : synchronisation non démarrée.")
+            return
+        key = (self.config_manager.get("NOTION_DATABASE_URL"), sync_kind)
+        follow_up = sync_kind != SYNC_HISTORY
+        if not self.sync_coordinator.run(key, task, follow_up=follow_up):
+            if follow_up:
+                self._log("INFO: Synchronisation déjà en cours : une nouvelle vérification suivra immédiatement.")
+            else:
+                self._log("INFO: Synchronisation historique déjà en cours : demande ignorée.")
 
-    def _sync_activities_list(self, activities_list: list, sync_type: str):
-        """Logique interne pour synchroniser une liste d'activités données."""
-        synced_count = 0
+    def _sync_activities_list(self, activities_list: list, sync_type: str, priority: int = PRIORITY_HIGH,
+                              on_enqueued=None):
+        """
+        Logique interne pour synchroniser une liste d'activités données.
+        Les activités passent par la file partagée avec la priorité indiquée : les activités récentes
+        sont donc créées dans Notion en quelques secondes, même pendant un rattrapage historique.
+        Retourne à la fin du traitement de tout le lot.
+        on_enqueued : appelé une fois le lot en file (voir _enqueue_batch).
+        """
         total_count = len(activities_list)
         
         if not activities_list:
@@ -84,25 +253,323 @@ class PollingScheduler:
             
         self._log(f"INFO: {total_count} activités trouvées ({sync_type}). Vérification de la synchronisation...")
 
-        for i, activity in enumerate(activities_list):
-            if total_count > 10 and i % 50 == 0 and i > 0:
-                 self._log(f"INFO: Progression {sync_type}: {i}/{total_count} activités vérifiées.")
+        synced_ids = None
+        if total_count > PRESCAN_THRESHOLD:
+            with self._stage("notion_prescan"):
+                synced_ids = self._prescan_synced_ids()
+
+        routes = {}
+        if not self._shutdown_event.is_set():
+            self._prepare_select_options(activities_list)
+            with self._stage("cpu_route_summaries"):
+                routes = self._compute_routes(activities_list, synced_ids)
+        batch = SyncBatch(sync_type, total_count, synced_ids, routes)
+        if not self._enqueue_batch(priority, activities_list, batch, on_enqueued):
+            self._log(f"INFO: Arrêt en cours : {total_count} activité(s) ({sync_type}) gardée(s) pour la reprise.")
+            return
+        self._ensure_sync_workers()
+        batch.wait()
+        with self._synced_total_lock:
+            self.synced_total += batch.synced
+        
+        if self._shutdown_event.is_set():
+            self._log(f"INFO: {sync_type} interrompue par l'arrêt ({batch.synced} activités ajoutées, le reste sera repris au prochain démarrage).")
+            return
+        
+        self._log(f"SUCCÈS: {batch.synced} activités ont été ajoutées à Notion ({sync_type}).")
+        if batch.synced:
+            self._log(f"INFO: Taille moyenne d'une création de page Notion : "
+                      f"{self.notion_client.average_page_payload_bytes():.0f} octets.")
+        
+        with self._stage("local_export"):
+            self._export_to_sinks(activities_list)
+        
+        with self._stage("notion_summary_update"):
+            self._update_aggregates(activities_list)
+
+    def _enqueue_batch(self, priority: int, activities_list: list, batch: SyncBatch, on_enqueued=None) -> bool:
+        """
+        Met toutes les activités du lot en file, sauf si l'arrêt a déjà vidé la file : elles sont alors
+        gardées pour le checkpoint. on_enqueued est appelé sous le même verrou, une fois le lot en file.
+        Retourne True si le lot a été mis en file.
+        """
+        with self._enqueue_lock:
+            if not self._queue_closed:
+                for activity in activities_list:
+                    self.sync_queue.put(priority, activity, batch)
+                if on_enqueued:
+                    on_enqueued()
+                return True
+            if not self._checkpoint_saved:
+                self._late_pending.extend(activities_list)
+            elif self.notion_client:
+                try:
+                    self._get_checkpoint().append_pending(self.notion_client.database_id, activities_list)
+                except Exception as e:
+                    self._log(f"ERREUR lors de l'écriture du checkpoint de synchronisation : {e}")
+            return False
+
+    def _prepare_select_options(self, activities_list: list):
+        """Crée en une fois dans le schéma Notion les types de sport encore inconnus du lot."""
+        try:
+            with self._stage("notion_schema_update"):
+                added = self.notion_client.prepare_select_options(activities_list)
+            if added:
+                self._log(f"INFO: Nouvelles options de sport ajoutées à la base Notion : {', '.join(added)}.")
+        except Exception as e:
+            # Notion créera les options manquantes à la volée, comme avant
+            self._log(f"AVERTISSEMENT: Préparation des options de sport impossible : {e}")
+
+    def _compute_routes(self, activities_list: list, synced_ids=None) -> dict:
+        """
+        Étape CPU : décode les tracés du lot encore absents de l'index et calcule leurs distances dans
+        le pool de processus, puis cherche les parcours identiques dans l'index spatial.
+        Retourne {ID Strava: résumé du tracé} pour les activités qui ont un tracé.
+        Sans colonne de tracé dans le mapping, l'étape n'est pas exécutée.
+        """
+        if not any(self.config_manager.get(key) for key in ROUTE_COLUMNS):
+            return {}
+        try:
+            return self._index_routes(activities_list, synced_ids)
+        except Exception as e:
+            # Les activités sont synchronisées quand même, sans les colonnes de tracé
+            self._log(f"AVERTISSEMENT: Analyse des tracés impossible : {e}")
+            return {}
+
+    def _index_routes(self, activities_list: list, synced_ids=None) -> dict:
+        """Indexe les tracés du lot, puis résume ceux des activités à créer (synced_ids : pré-scan Notion)."""
+        with_route = [activity for activity in activities_list if activity.summary_polyline]
+        if not with_route:
+            return {}
+        if self.route_index is None:
+            self.route_index = RouteIndex(self.config_manager.get("ROUTE_INDEX_FILE"),
+                                          match_radius_m=self.config_manager.get_int("ROUTE_MATCH_RADIUS_M", 200))
+        # Tracés déjà décodés lors d'une synchronisation précédente : lus depuis l'index
+        to_decode = [activity for activity in with_route if activity.id not in self.route_index]
+        if to_decode:
+            if self.cpu_stage is None:
+                self.cpu_stage = CpuStage(workers=self.config_manager.get_int("CPU_WORKERS", 2),
+                                          chunk_size=self.config_manager.get_int("CPU_CHUNK_SIZE", 500))
+            polylines = [activity.summary_polyline for activity in to_decode]
+            start = time.perf_counter()
+            try:
+                summaries = self.cpu_stage.map(route_summary, polylines)
+            except Exception as e:
+                # Pool de processus indisponible : il sera recréé au prochain lot, celui-ci est calculé ici
+                self._log(f"AVERTISSEMENT: Pool de calcul indisponible ({e}). Analyse des tracés dans le thread de synchronisation.")
+                self.cpu_stage.shutdown(wait=False)
+                summaries = [route_summary(polyline) for polyline in polylines]
+            for activity, summary in zip(to_decode, summaries):
+                if summary:
+                    self.route_index.add(activity.id, summary, activity.start_epoch)
+            if len(to_decode) > 10:
+                self._log(f"INFO: {len(to_decode)} tracés analysés en {time.perf_counter() - start:.2f} s.")
+
+        routes = {}
+        for activity in with_route:
+            # Déjà dans Notion : indexée pour les recherches, mais rien à écrire
+            if synced_ids is not None and contains_strava_id(synced_ids, activity.id):
+                continue
+            route = self.route_index.get(activity.id)
+            if route is None:
+                continue
+            route["fingerprint"] = route_fingerprint(route)
+            route["same_route_ids"] = self.route_index.find_similar(activity.id, earlier_only=True)
+            routes[activity.id] = route
+        try:
+            self.route_index.save()
+        except Exception as e:
+            self._log(f"AVERTISSEMENT: Sauvegarde de l'index des tracés impossible : {e}")
+        return routes
+
+    def _ensure_sync_workers(self):
+        """Démarre (ou complète) le pool de workers Notion partagé par toutes les synchronisations."""
+        with self._workers_lock:
+            self._sync_workers = [worker for worker in self._sync_workers if worker.is_alive()]
+            wanted = max(1, self.config_manager.get_int("NOTION_SYNC_WORKERS", 3))
+            if self.config_manager.get_bool("NOTION_ADAPTIVE_CONCURRENCY"):
+                # Assez de workers pour la limite maximale : c'est le contrôleur qui règle la concurrence réelle
+                wanted = max(wanted, self.config_manager.get_int("NOTION_MAX_CONCURRENCY", 8))
+            while len(self._sync_workers) < wanted:
+                worker = threading.Thread(target=self._sync_worker, daemon=True,
+                                          name=f"notion-sync-{len(self._sync_workers) + 1}")
+                worker.start()
+                self._sync_workers.append(worker)
+
+    def _sync_worker(self):
+        """
+        Boucle d'un worker : traite les activités de la file, la plus prioritaire d'abord.
+        À l'arrêt, termine l'activité en cours puis s'arrête (les suivantes vont dans le checkpoint).
+        """
+        worker_id = threading.get_ident()
+        while not self._shutdown_event.is_set():
+            try:
+                activity, batch = self.sync_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._current_items[worker_id] = activity
+            synced = False
+            try:
+                synced = self._sync_one_activity(activity, batch)
+            finally:
+                self._current_items.pop(worker_id, None)
+                done = batch.task_done(synced)
+            if batch.total > 10 and done % 50 == 0 and done < batch.total:
+                self._log(f"INFO: Progression {batch.sync_type}: {done}/{batch.total} activités vérifiées.")
+
+    def _sync_one_activity(self, activity, batch: SyncBatch) -> bool:
+        """
+        Vérifie puis crée une activité dans Notion. Retourne True si une page a été créée.
+        L'activité est réservée auprès du coordinateur pendant tout le couple vérification/création :
+        deux workers ne peuvent donc jamais créer la même page.
+        """
+        database_id = self.notion_client.database_id
+        if not self.sync_coordinator.claim_activity(database_id, activity.id):
+            return False
+        created = False
+        try:
+            if batch.synced_ids is not None:
+                already_synced = contains_strava_id(batch.synced_ids, activity.id)
+            else:
+                with self._stage("notion_dedup_query"):
+                    already_synced = self.notion_client.is_activity_synced(activity.id)
+            
+            if already_synced:
+                return False
+            with self._stage("streams_metrics"):
+                metrics = self._get_activity_metrics(activity)
+            with self._stage("notion_page_create"):
+                start = time.perf_counter()
+                self.notion_client.sync_activity(activity, metrics, batch.routes.get(activity.id))
+            created = True
+            self._record_history(activity, "created", sync_type=batch.sync_type,
+                                 latency_ms=(time.perf_counter() - start) * 1000)
+            return True
+        except Exception as sync_e:
+            self._log(f"ERREUR lors de la synchronisation de l'activité {activity.id}: {sync_e}")
+            self._record_history(activity, "failed", sync_type=batch.sync_type, error=str(sync_e))
+            return False
+        finally:
+            self.sync_coordinator.release_activity(database_id, activity.id, created)
 
+    def _export_to_sinks(self, activities_list: list):
+        """Transmet le lot aux destinations locales (EXPORT_SINKS), sans jamais interrompre la synchronisation."""
+        if self.sinks is None:
+            self.sinks = create_sinks(self.config_manager.get("EXPORT_SINKS"), self.config_manager.get("EXPORT_DIR"))
+        for sink in self.sinks:
             try:
-                if not self.notion_client.is_activity_synced(activity['id']):
-                    self.notion_client.sync_activity(activity)
-                    synced_count += 1
-            except Exception as sync_e:
-                self._log(f"ERREUR lors de la synchronisation de l'activité {activity.get('id')}: {sync_e}")
+                written = sink.write_batch(activities_list)
+                if written:
+                    self._log(f"INFO: Export {sink.name} : {written} activité(s) écrite(s).")
+            except Exception as e:
+                self._log(f"ERREUR lors de l'export {sink.name} : {e}")
+
+    def _update_aggregates(self, activities_list: list):
+        """
+        Met à jour les agrégats semaine/mois avec les activités traitées et ne réécrit
+        dans la base de synthèse Notion que les périodes modifiées.
+        """
+        summary_database_url = self.config_manager.get("NOTION_SUMMARY_DATABASE_URL")
+        if not summary_database_url:
+            return
         
-        self._log(f"SUCCÈS: {synced_count} activités ont été ajoutées à Notion ({sync_type}).")
+        try:
+            if self.aggregate_store is None:
+                self.aggregate_store = AggregateStore(self.config_manager.get("AGGREGATES_FILE"))
+            
+            self.aggregate_store.add_activities(activities_list)
+            pending_periods = self.aggregate_store.pending_periods()
+            if not pending_periods:
+                return
+            self._log(f"INFO: Mise à jour de {len(pending_periods)} période(s) de synthèse...")
+            
+            for period_key in pending_periods:
+                page_id = self.notion_client.upsert_summary_page(
+                    summary_database_url, period_key,
+                    self.aggregate_store.get_period(period_key),
+                    page_id=self.aggregate_store.get_page_id(period_key)
+                )
+                self.aggregate_store.mark_written(period_key, page_id)
+        except Exception as e:
+            self._log(f"ERREUR lors de la mise à jour des synthèses : {e}")
+        finally:
+            # On persiste même en cas d'échec partiel : les IDs de pages déjà écrites sont conservés
+            if self.aggregate_store is not None:
+                self.aggregate_store.save()
+
 
+    def _get_activity_metrics(self, activity):
+        """
+        Retourne les métriques dérivées des streams d'une activité (si ENABLE_STREAMS est actif).
+        Les streams et les métriques sont mis en cache sur disque : rien n'est jamais recalculé.
+        """
+        if not self.config_manager.get_bool("ENABLE_STREAMS"):
+            return None
+        
+        activity_id = activity.id
+        try:
+            # Import tardif : NumPy n'est nécessaire que si les streams sont activés
+            from models.stream_store import StreamStore
+            from models.activity_metrics import compute_metrics
+            
+            if self.stream_store is None:
+                self.stream_store = StreamStore(self.config_manager.get("STREAMS_CACHE_DIR"))
+            
+            metrics = self.stream_store.load_metrics(activity_id)
+            if metrics is not None:
+                return metrics
+            
+            streams = self.stream_store.load_streams(activity_id)
+            if streams is None:
+                raw_streams = self.strava_client.get_activity_streams(activity_id)
+                streams = self.stream_store.save_streams(activity_id, raw_streams)
+            
+            metrics = compute_metrics(streams, hr_max=self.config_manager.get_int("HR_MAX", 190))
+            self.stream_store.save_metrics(activity_id, metrics)
+            return metrics
+        
+        except Exception as e:
+            self._log(f"AVERTISSEMENT: Métriques des streams indisponibles pour l'activité {activity_id}: {e}")
+            return None
+
+    def _prescan_synced_ids(self):
+        """
+        Récupère en une passe les ID Strava déjà présents dans Notion.
+        Retourne None en cas d'échec : on retombe alors sur la vérification activité par activité.
+        """
+        self._log("INFO: Pré-scan de la base Notion (ID Strava existants)...")
+
+        def report_progress(scanned):
+            if scanned % 1000 == 0:
+                self._log(f"INFO: Pré-scan Notion : {scanned} lignes lues...")
+
+        try:
+            synced_ids = self.notion_client.get_synced_strava_ids(progress_callback=report_progress)
+            self._log(f"INFO: Pré-scan terminé : {len(synced_ids)} activités déjà présentes dans Notion.")
+            return synced_ids
+        except Exception as e:
+            self._log(f"AVERTISSEMENT: Pré-scan Notion impossible ({e}). Vérification activité par activité.")
+            return None
+
+    def _download_history(self):
+        """
+        Télécharge l'historique Strava complet : en parallèle par fenêtres de dates si
+        STRAVA_DOWNLOAD_WORKERS > 1, avec repli sur la pagination séquentielle en cas d'échec.
+        """
+        workers = self.config_manager.get_int("STRAVA_DOWNLOAD_WORKERS", 4)
+        if workers > 1:
+            try:
+                return self.strava_client.get_all_activities_sharded(max_workers=workers)
+            except Exception as e:
+                self._log(f"AVERTISSEMENT: Téléchargement parallèle impossible ({e}). Repli sur la pagination séquentielle.")
+        return self.strava_client.get_all_activities()
 
     def _sync_latest_activities(self):
         """[Polling périodique] Récupère UNIQUEMENT les dernières activités Strava."""
         try:
-            latest_activities = self.strava_client.get_latest_activities(per_page=10)
-            self._sync_activities_list(latest_activities, "Polling Périodique")
+            with self._stage("strava_latest_activities"):
+                latest_activities = self.strava_client.get_latest_activities(per_page=10)
+            self._sync_activities_list(latest_activities, "Polling Périodique", PRIORITY_HIGH)
         except Exception as e:
             self._log(f"ERREUR de synchronisation (Strava ou Notion) : {e}")
             raise
@@ -116,15 +583,18 @@ class PollingScheduler:
         def historical_sync_task():
             self._log("--- Démarrage de la SYNCHRONISATION HISTORIQUE ---")
             
+            profiler = self._begin_profiling("Synchronisation Historique")
             try:
-                self.strava_client.refresh_access_token()
-                all_activities = self.strava_client.get_all_activities() 
+                with self._stage("strava_token_refresh"):
+                    self.strava_client.refresh_access_token()
+                with self._stage("strava_pagination"):
+                    all_activities = self._download_history()
                 
                 if not isinstance(all_activities, list):
                      self._log("ERREUR: get_all_activities n'a pas retourné une liste. Annulation.")
                      return
                 
-                self._sync_activities_list(all_activities, "Synchronisation Historique")
+                self._sync_activities_list(all_activities, "Synchronisation Historique", PRIORITY_LOW)
                 
                 self.last_check_time = time.time()
                 self._log("--- Synchronisation HISTORIQUE terminée. ---")
@@ -132,8 +602,10 @@ class PollingScheduler:
             except Exception as e:
                 self._log(f"ERREUR lors de la synchronisation HISTORIQUE : {e}")
                 traceback.print_exc()
+            finally:
+                self._end_profiling(profiler)
                 
-        sync_thread = threading.Thread(target=historical_sync_task)
+        sync_thread = threading.Thread(target=self._run_coordinated, args=(SYNC_HISTORY, historical_sync_task))
         sync_thread.daemon = True
         sync_thread.start()
 
@@ -142,23 +614,28 @@ class PollingScheduler:
         """[Sync. Manuelle/Rapide] Déclenche immédiatement une vérification rapide."""
         def immediate_sync_task():
             self._log("--- Démarrage de la synchronisation rapide ---")
+            profiler = self._begin_profiling("Synchronisation Rapide")
             try:
-                self.strava_client.refresh_access_token()
+                with self._stage("strava_token_refresh"):
+                    self.strava_client.refresh_access_token()
                 self._sync_latest_activities()
                 self.last_check_time = time.time()
                 self._log("--- Synchronisation rapide terminée avec succès ---")
             except Exception as e:
                 self._log(f"ERREUR lors de la synchronisation rapide : {e}")
                 traceback.print_exc()
+            finally:
+                self._end_profiling(profiler)
 
-        sync_thread = threading.Thread(target=immediate_sync_task)
+        sync_thread = threading.Thread(target=self._run_coordinated, args=(SYNC_LATEST, immediate_sync_task))
         sync_thread.daemon = True
         sync_thread.start()
 
 
     def start(self):
-        """Démarre le thread de polling."""
+        """Démarre le thread de polling (et reprend les activités laissées en attente au dernier arrêt)."""
         if not self.is_running:
+            self._resume_from_checkpoint()
             self._stop_event.clear()
             self.thread = threading.Thread(target=self._run)
             self.thread.daemon = True
@@ -166,12 +643,96 @@ class PollingScheduler:
             self.is_running = True
             self.last_check_time = time.time() 
 
-    def stop(self):
+    def stop(self, timeout: float = 5):
         """Arrête le thread de polling."""
         if self.is_running:
             self._log("INFO: Signal d'arrêt envoyé au thread de polling.")
             self._stop_event.set()
             if self.thread and self.thread.is_alive():
-                self.thread.join(timeout=5)
+                self.thread.join(timeout=timeout)
             self.is_running = False
-            self._log("INFO: Service de polling arrêté.")
\ No newline at end of file
+            self._log("INFO: Service de polling arrêté.")
+
+    # -----------------------------------------------------
+    # ARRÊT ORDONNÉ ET REPRISE
+    # -----------------------------------------------------
+
+    def _get_checkpoint(self):
+        return SyncCheckpoint(self.config_manager.get("SYNC_CHECKPOINT_FILE"))
+
+    def shutdown(self, timeout: float = 10) -> bool:
+        """
+        Arrêt ordonné (appelé par le LifecycleManager) :
+        1. plus aucune synchronisation ne démarre et le polling s'arrête ;
+        2. les écritures Notion en cours se terminent (dans la limite du délai) ;
+        3. les activités restantes et les ID déjà créés sont écrits dans le checkpoint.
+        Retourne False si des écritures étaient encore en cours à l'expiration du délai.
+        """
+        deadline = time.monotonic() + timeout
+        self._shutdown_event.set()
+        self._stop_event.set()
+        self._log("INFO: Arrêt en cours : fin des écritures Notion en cours...")
+
+        for worker in list(self._sync_workers):
+            worker.join(max(0.0, deadline - time.monotonic()))
+        with self._enqueue_lock:
+            drained = self.sync_queue.drain()
+            self._queue_closed = True
+        unfinished = list(self._current_items.values())
+        pending = unfinished + [activity for activity, _ in drained]
+        for _, batch in drained:
+            batch.task_done(False) # Débloque les synchronisations en attente de leur lot
+
+        self.stop(timeout=max(0.0, deadline - time.monotonic()))
+
+        database_id = self.notion_client.database_id if self.notion_client else None
+        with self._enqueue_lock:
+            # Lots soumis entre le vidage de la file et maintenant
+            pending += self._late_pending
+            self._late_pending = []
+            if database_id:
+                try:
+                    created_ids = self.sync_coordinator.created_ids(database_id)
+                    self._get_checkpoint().save(database_id, pending, created_ids)
+                    if pending:
+                        self._log(f"INFO: {len(pending)} activité(s) en attente sauvegardée(s) pour la reprise.")
+                except Exception as e:
+                    self._log(f"ERREUR lors de l'écriture du checkpoint de synchronisation : {e}")
+            self._checkpoint_saved = True
+        if self._sync_history is not None:
+            self._sync_history.close()
+        for sink in self.sinks or []:
+            sink.close()
+        if self.cpu_stage is not None:
+            self.cpu_stage.shutdown(wait=False)
+        return not unfinished
+
+    def _resume_from_checkpoint(self):
+        """Recharge le checkpoint du dernier arrêt et resynchronise en arrière-plan les activités en attente."""
+        checkpoint = self._get_checkpoint()
+        state = checkpoint.load()
+        if state is None:
+            return
+        database_id, pending, created_ids = state
+        try:
+            if not self.notion_client:
+                self._create_notion_client()
+        except Exception as e:
+            self._log(f"AVERTISSEMENT: Reprise impossible ({e}) : le checkpoint est conservé pour le prochain démarrage.")
+            return
+        if database_id != self.notion_client.database_id:
+            self._log("INFO: Base Notion changée depuis le dernier arrêt : checkpoint ignoré.")
+            checkpoint.clear()
+            return
+        self.sync_coordinator.mark_created(database_id, created_ids)
+        if not pending:
+            checkpoint.clear()
+            return
+        self._log(f"INFO: Reprise de {len(pending)} activité(s) laissée(s) en attente au dernier arrêt.")
+        # Le checkpoint n'est supprimé qu'une fois les activités en file (elles sont alors couvertes
+        # par le checkpoint du prochain arrêt)
+        resume_thread = threading.Thread(target=self._sync_activities_list,
+                                         args=(pending, "Reprise après arrêt", PRIORITY_LOW),
+                                         kwargs={"on_enqueued": checkpoint.clear})
+        resume_thread.daemon = True
+        resume_thread.start()
@@ -0,0 +1,154 @@
+# models/polyline.py
+"""
+Décodage des polylines encodées de Strava (map.summary_polyline, format Google « Encoded Polyline »,
+précision 1e-5) et calculs de distance sur le tracé (formule de haversine).
+Décodage et distances sont vectorisés avec NumPy s'il est installé (repli en Python pur sinon).
+Fonctions pures au niveau du module : elles peuvent être exécutées dans un processus séparé (cpu_stage).
+"""
+from bisect import bisect_left
+from math import radians, sin, cos, asin, sqrt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+POLYLINE_PRECISION = 1e5
+
+
+def decode(polyline: str) -> list:
+    """Polyline encodée -> liste de points (latitude, longitude) en degrés."""
+    points = []
+    values = []
+    result = shift = 0
+    # Chaque octet porte 5 bits ; le bit 0x20 indique que la valeur continue sur l'octet suivant
+    for byte in (polyline or "").encode("ascii"):
+        byte -= 63
+        result |= (byte & 0x1F) << shift
+        if byte < 0x20:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            result = shift = 0
+        else:
+            shift += 5
+    lat = lon = 0
+    for i in range(0, len(values) - 1, 2):
+        lat += values[i]
+        lon += values[i + 1]
+        points.append((lat / POLYLINE_PRECISION, lon / POLYLINE_PRECISION))
+    return points
+
+
+def decode_array(polyline: str):
+    """
+    Version vectorisée de decode : tableau NumPy (n, 2) de latitudes/longitudes en degrés.
+    Les groupes de 5 bits de chaque valeur sont recombinés en une passe (bincount), puis les
+    deltas sont cumulés.
+    """
+    data = np.frombuffer((polyline or "").encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    if data.size == 0:
+        return np.empty((0, 2))
+    ends = data < 0x20
+    value_index = np.concatenate(([0], np.cumsum(ends)[:-1]))      # valeur à laquelle appartient chaque octet
+    value_starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    shifts = 5 * (np.arange(data.size) - value_starts[value_index])
+    values = np.bincount(value_index, weights=(data & 0x1F) << shifts).astype(np.int64)[:int(ends.sum())]
+    values = np.where(values & 1, ~(values >> 1), values >> 1)
+    values = values[:values.size - values.size % 2].reshape(-1, 2)
+    return np.cumsum(values, axis=0) / POLYLINE_PRECISION
+
+
+def encode(points) -> str:
+    """Liste de points (latitude, longitude) -> polyline encodée (inverse de decode)."""
+    chunks = []
+    previous_lat = previous_lon = 0
+    for lat, lon in points:
+        lat, lon = round(lat * POLYLINE_PRECISION), round(lon * POLYLINE_PRECISION)
+        for delta in (lat - previous_lat, lon - previous_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        previous_lat, previous_lon = lat, lon
+    return "".join(chunks)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance orthodromique (en km) entre deux points."""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def cumulative_path_km(points: list) -> list:
+    """
+    Distance cumulée (en km) depuis le départ à chaque point d'un tracé, en Python pur
+    (conversion en radians et cosinus calculés une fois par point).
+    """
+    if not points:
+        return []
+    distances = [0.0]
+    total = 0.0
+    previous_lat, previous_lon = radians(points[0][0]), radians(points[0][1])
+    previous_cos = cos(previous_lat)
+    for lat, lon in points[1:]:
+        lat, lon = radians(lat), radians(lon)
+        lat_cos = cos(lat)
+        a = sin((lat - previous_lat) / 2) ** 2 + previous_cos * lat_cos * sin((lon - previous_lon) / 2) ** 2
+        total += 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+        distances.append(total)
+        previous_lat, previous_lon, previous_cos = lat, lon, lat_cos
+    return distances
+
+
+def cumulative_distances_km(coords):
+    """Distance cumulée (en km) depuis le départ à chaque point d'un tableau (n, 2), vectorisée."""
+    lat, lon = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    a = np.sin(np.diff(lat) / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2
+    return np.concatenate(([0.0], np.cumsum(2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)))))
+
+
+def middle_index(distances, distance_km: float) -> int:
+    """
+    Indice du point de mi-parcours en distance (et non en nombre de points, plus denses dans les virages),
+    à partir des distances cumulées (liste ou tableau NumPy) : le point le plus proche de la mi-distance.
+    """
+    index = min(len(distances) - 1, bisect_left(distances, distance_km / 2))
+    if index and distances[index] + distances[index - 1] > distance_km:
+        index -= 1 # Le point précédent est plus proche de la mi-distance
+    return index
+
+
+def route_summary(polyline: str) -> dict:
+    """
+    Résumé d'un tracé : nombre de points, longueur, points de départ, de mi-parcours et d'arrivée.
+    None si l'activité n'a pas de tracé (activité en salle, tracé masqué...) ou s'il est illisible.
+    """
+    if np is None:
+        try:
+            points = decode(polyline)
+        except ValueError: # Caractères hors ASCII : pas une polyline valide
+            return None
+        if not points:
+            return None
+        distances = cumulative_path_km(points)
+        count, distance_km = len(points), distances[-1]
+        start, middle, end = points[0], points[middle_index(distances, distance_km)], points[-1]
+    else:
+        try:
+            coords = decode_array(polyline)
+        except ValueError:
+            return None
+        if not len(coords):
+            return None
+        distances = cumulative_distances_km(coords)
+        count, distance_km = len(coords), float(distances[-1])
+        start, middle, end = coords[[0, middle_index(distances, distance_km), -1]].tolist()
+    return {
+        "points": count,
+        "route_distance_km": round(distance_km, 3),
+        "start_latlng": tuple(start),
+        "mid_latlng": tuple(middle),
+        "end_latlng": tuple(end),
+    }
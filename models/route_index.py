@@ -0,0 +1,160 @@
+# models/route_index.py
+import os
+import json
+import math
+import threading
+from collections import defaultdict
+
+# Rayon (en mètres) dans lequel deux départs/arrivées sont considérés comme identiques
+DEFAULT_MATCH_RADIUS_M = 200
+# Écart de longueur toléré entre deux tracés « identiques » (fraction de la distance)
+DISTANCE_TOLERANCE = 0.1
+METERS_PER_DEGREE = 111320.0
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(lat: float, lon: float, precision: int = 7) -> str:
+    """Geohash d'un point (précision 7 : cellule d'environ 150 m)."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (lon, lon_range) if even else (lat, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = bit_count = 0
+    return "".join(chars)
+
+
+def route_fingerprint(route: dict) -> str:
+    """Empreinte lisible d'un parcours : cellules geohash du départ et de l'arrivée + longueur arrondie."""
+    return (f"{geohash(*route['start_latlng'], precision=6)}-{geohash(*route['end_latlng'], precision=6)}-"
+            f"{round(route['route_distance_km'])}km")
+
+
+class RouteIndex:
+    """
+    Index spatial local des tracés : pour chaque activité, départ, mi-parcours, arrivée, longueur et date,
+    persistés dans un fichier JSON (un tracé n'est donc décodé qu'une fois par activité).
+    Les départs sont rangés dans une grille de cellules en degrés (taille = rayon de correspondance) :
+    la recherche des parcours identiques ne parcourt que les quelques cellules voisines du départ.
+    """
+
+    def __init__(self, file_path: str, match_radius_m: float = DEFAULT_MATCH_RADIUS_M):
+        self.file_path = file_path
+        self.match_radius_m = match_radius_m
+        self._cell_degrees = match_radius_m / METERS_PER_DEGREE
+        self._routes = {}                 # id -> [lat/lon départ, mi-parcours, arrivée, km, start_epoch]
+        self._grid = defaultdict(list)    # cellule du départ -> ID des activités
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                routes = json.load(f).get("routes", {})
+            for activity_id, entry in routes.items():
+                self._insert(int(activity_id), entry)
+        except FileNotFoundError:
+            return
+        except (ValueError, TypeError, AttributeError, IndexError) as e:
+            # Fichier tronqué ou d'un autre format : index reconstruit au fil des synchronisations
+            print(f"AVERTISSEMENT: Index des tracés illisible, ignoré : {e}")
+            self._routes.clear()
+            self._grid.clear()
+
+    def save(self):
+        """Écrit l'index de façon atomique (fichier temporaire puis renommage), s'il a changé."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = self.file_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"routes": self._routes}, f)
+            os.replace(tmp_path, self.file_path)
+            self._dirty = False
+
+    def _cell(self, lat: float, lon: float):
+        return int(lat // self._cell_degrees), int(lon // self._cell_degrees)
+
+    def _insert(self, activity_id: int, entry: list):
+        previous = self._routes.get(activity_id)
+        if previous is not None:
+            self._grid[self._cell(previous[0], previous[1])].remove(activity_id)
+        self._routes[activity_id] = entry
+        self._grid[self._cell(entry[0], entry[1])].append(activity_id)
+
+    def __len__(self):
+        return len(self._routes)
+
+    def __contains__(self, activity_id) -> bool:
+        return activity_id in self._routes
+
+    def add(self, activity_id: int, route: dict, start_epoch: int = 0):
+        """Ajoute (ou remplace) le résumé de tracé d'une activité (voir polyline.route_summary)."""
+        entry = [*route["start_latlng"], *route["mid_latlng"], *route["end_latlng"],
+                 route["route_distance_km"], start_epoch]
+        with self._lock:
+            self._insert(activity_id, entry)
+            self._dirty = True
+
+    def get(self, activity_id: int) -> dict:
+        """Résumé de tracé déjà indexé pour une activité, ou None."""
+        entry = self._routes.get(activity_id)
+        if entry is None:
+            return None
+        return {
+            "start_latlng": (entry[0], entry[1]),
+            "mid_latlng": (entry[2], entry[3]),
+            "end_latlng": (entry[4], entry[5]),
+            "route_distance_km": entry[6],
+        }
+
+    def find_similar(self, activity_id: int, earlier_only: bool = False) -> list:
+        """
+        Activités au parcours identique : départ, mi-parcours et arrivée à moins de match_radius_m,
+        longueur à DISTANCE_TOLERANCE près. Retourne leurs ID, les plus récentes d'abord
+        (earlier_only : seulement celles antérieures à l'activité).
+        """
+        with self._lock:
+            entry = self._routes.get(activity_id)
+            if entry is None:
+                return []
+            return self._find_similar(activity_id, entry, earlier_only)
+
+    def _find_similar(self, activity_id: int, entry: list, earlier_only: bool) -> list:
+        start_lat, start_lon, mid_lat, mid_lon, end_lat, end_lon, distance_km, start_epoch = entry
+        # Comparaisons en degrés (projection équirectangulaire, valable à l'échelle de quelques
+        # centaines de mètres) : la longitude est ramenée à l'échelle de la latitude
+        lon_scale = max(math.cos(math.radians(start_lat)), 0.01)
+        max_squared = self._cell_degrees ** 2
+        # Cellules voisines couvrant le rayon : 1 de part et d'autre en latitude, plus en longitude
+        # (un degré de longitude rétrécit avec la latitude)
+        row, col = self._cell(start_lat, start_lon)
+        lon_span = math.ceil(1 / lon_scale)
+        matches = []
+        for r in range(row - 1, row + 2):
+            for c in range(col - lon_span, col + lon_span + 1):
+                for candidate_id in self._grid.get((r, c), ()):
+                    if candidate_id == activity_id:
+                        continue
+                    c_start_lat, c_start_lon, c_mid_lat, c_mid_lon, c_end_lat, c_end_lon, c_distance, c_epoch = \
+                        self._routes[candidate_id]
+                    if earlier_only and c_epoch >= start_epoch:
+                        continue
+                    if (abs(c_distance - distance_km) <= DISTANCE_TOLERANCE * max(distance_km, c_distance)
+                            and (c_start_lat - start_lat) ** 2 + ((c_start_lon - start_lon) * lon_scale) ** 2 <= max_squared
+                            and (c_end_lat - end_lat) ** 2 + ((c_end_lon - end_lon) * lon_scale) ** 2 <= max_squared
+                            and (c_mid_lat - mid_lat) ** 2 + ((c_mid_lon - mid_lon) * lon_scale) ** 2 <= max_squared):
+                        matches.append((c_epoch, candidate_id))
+        matches.sort(reverse=True)
+        return [candidate_id for _, candidate_id in matches]
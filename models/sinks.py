@@ -0,0 +1,187 @@
+# models/sinks.py
+"""
+Destinations locales des activités synchronisées, en plus de Notion : CSV, SQLite, Parquet.
+Chaque synchronisation (polling, historique) leur transmet ses activités par lots ; la copie
+locale est mise à jour de façon incrémentale (une activité déjà exportée n'est pas réécrite,
+sauf en SQLite où elle est remplacée par sa dernière version).
+"""
+import os
+import csv
+import glob
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import fields
+from operator import attrgetter
+
+from models.activity import Activity
+
+# Colonnes exportées : tous les champs du modèle Activity, dans l'ordre de déclaration
+COLUMNS = tuple(field.name for field in fields(Activity))
+_row_of = attrgetter(*COLUMNS)
+# Type Parquet de chaque colonne, d'après l'annotation du champ Activity
+_PARQUET_TYPES = {int: "int64", float: "float64", str: "string"}
+_COLUMN_TYPES = {field.name: _PARQUET_TYPES[field.type] for field in fields(Activity)}
+
+
+class ActivitySink(ABC):
+    """Interface d'une destination : write_batch(activités) -> nombre d'activités écrites."""
+
+    name = "sink"
+
+    @abstractmethod
+    def write_batch(self, activities) -> int:
+        """Écrit les activités pas encore exportées et retourne leur nombre."""
+
+    def close(self):
+        pass
+
+
+class CsvSink(ActivitySink):
+    """Fichier CSV en ajout seul ; les ID déjà présents sont relus une fois à l'ouverture."""
+
+    name = "csv"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._exported_ids = set()
+        self._row_of = _row_of
+        if os.path.exists(file_path):
+            with open(file_path, "r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                self._exported_ids = {int(row[0]) for row in reader if row}
+            if header and tuple(header) != COLUMNS:
+                # Fichier créé par une version précédente : on conserve ses colonnes existantes,
+                # vides si elles n'existent plus dans Activity (sinon les suivantes seraient décalées)
+                columns = tuple(header)
+                self._row_of = lambda a: tuple(getattr(a, column) if column in _COLUMN_TYPES else None
+                                               for column in columns)
+
+    def write_batch(self, activities) -> int:
+        with self._lock:
+            new_rows = [self._row_of(a) for a in activities if a.id not in self._exported_ids]
+            if not new_rows:
+                return 0
+            write_header = not os.path.exists(self.file_path)
+            with open(self.file_path, "a", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(COLUMNS)
+                writer.writerows(new_rows)
+            self._exported_ids.update(row[0] for row in new_rows)
+            return len(new_rows)
+
+
+class SQLiteSink(ActivitySink):
+    """Table SQLite 'activities' (clé primaire = ID Strava), un lot = une transaction."""
+
+    name = "sqlite"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(file_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS activities ({COLUMNS[0]} INTEGER PRIMARY KEY, "
+                         f"{', '.join(COLUMNS[1:])})")
+        # Table créée par une version précédente : ajout des colonnes apparues depuis dans Activity
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(activities)")}
+        for column in COLUMNS:
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE activities ADD COLUMN {column}")
+        self._db.commit()
+        self._insert = (f"INSERT OR REPLACE INTO activities ({', '.join(COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(COLUMNS))})")
+
+    def write_batch(self, activities) -> int:
+        rows = [_row_of(a) for a in activities]
+        if not rows:
+            return 0
+        with self._lock:
+            with self._db:
+                self._db.executemany(self._insert, rows)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ParquetSink(ActivitySink):
+    """
+    Jeu de données Parquet (dossier de fichiers part-*.parquet) : chaque lot de nouvelles activités
+    est écrit dans un nouveau fichier, sans réécrire les précédents. Nécessite pyarrow.
+    """
+
+    name = "parquet"
+
+    def __init__(self, directory: str):
+        # Import tardif : pyarrow n'est nécessaire que si l'export Parquet est activé
+        import pyarrow
+        import pyarrow.parquet
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._schema = pyarrow.schema([(column, _COLUMN_TYPES[column]) for column in COLUMNS])
+        self._exported_ids = set()
+        for path in glob.glob(os.path.join(directory, "part-*.parquet")):
+            if not self._pq.read_schema(path).equals(self._schema):
+                self._upgrade_part(path)
+            self._exported_ids.update(self._pq.read_table(path, columns=[COLUMNS[0]]).column(0).to_pylist())
+
+    def _upgrade_part(self, path: str):
+        """
+        Réécrit une fois un fichier d'une version précédente au schéma courant (colonnes ajoutées à vide,
+        colonnes disparues retirées) : tous les fichiers du jeu de données gardent le même schéma.
+        """
+        table = self._pq.read_table(path)
+        columns = [table.column(field.name).cast(field.type) if field.name in table.column_names
+                   else self._pa.nulls(table.num_rows, field.type) for field in self._schema]
+        tmp_path = path + ".tmp"
+        self._pq.write_table(self._pa.Table.from_arrays(columns, schema=self._schema), tmp_path)
+        os.replace(tmp_path, path)
+
+    def write_batch(self, activities) -> int:
+        with self._lock:
+            new_activities = [a for a in activities if a.id not in self._exported_ids]
+            if not new_activities:
+                return 0
+            table = self._pa.table({column: [getattr(a, column) for a in new_activities] for column in COLUMNS},
+                                   schema=self._schema)
+            path = os.path.join(self.directory, f"part-{time.time_ns()}.parquet")
+            self._pq.write_table(table, path)
+            self._exported_ids.update(a.id for a in new_activities)
+            return len(new_activities)
+
+
+_SINK_FILES = {
+    "csv": (CsvSink, "activities.csv"),
+    "sqlite": (SQLiteSink, "activities.sqlite"),
+    "parquet": (ParquetSink, "activities_parquet"),
+}
+
+
+def create_sinks(sink_names: str, export_dir: str) -> list:
+    """
+    Crée les destinations listées dans EXPORT_SINKS (ex: "csv,sqlite") dans le dossier EXPORT_DIR.
+    Une destination inconnue ou indisponible (dépendance manquante) est signalée et ignorée.
+    """
+    sinks = []
+    names = [name.strip().lower() for name in (sink_names or "").split(",") if name.strip()]
+    if names:
+        os.makedirs(export_dir, exist_ok=True)
+    for name in names:
+        if name not in _SINK_FILES:
+            print(f"AVERTISSEMENT: Destination d'export inconnue '{name}' (valeurs possibles : csv, sqlite, parquet).")
+            continue
+        sink_class, file_name = _SINK_FILES[name]
+        try:
+            sinks.append(sink_class(os.path.join(export_dir, file_name)))
+        except ImportError:
+            print(f"AVERTISSEMENT: Export '{name}' indisponible : pyarrow n'est pas installé (pip install pyarrow).")
+    return sinks
@@ -1,11 +1,24 @@
 # models/strava_client.py
 import requests
 from .config_manager import ConfigManager
+from .json_codec import loads
+from .activity import decode_activities
+from .http_cache import HttpCache
 import time 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from operator import attrgetter
 
 STRAVA_AUTH_URL = "https://www.strava.com/oauth/authorize"
 STRAVA_TOKEN_URL = "https://www.strava.com/oauth/token"
 STRAVA_API_URL = "https://www.strava.com/api/v3"
+# Streams utiles aux métriques dérivées (FC, puissance, allure, GPS)
+STRAVA_STREAM_KEYS = ("time", "distance", "heartrate", "watts", "velocity_smooth", "altitude", "latlng")
+# Marge gardée sous la limite de requêtes par 15 minutes (les autres appels de l'app en ont besoin)
+RATE_LIMIT_MARGIN = 5
+# Un token expirant dans moins de 5 minutes est rafraîchi
+TOKEN_REFRESH_MARGIN = 300
 # La variable STRAVA_PUSH_API_URL n'est pas utilisée en mode Polling
 # STRAVA_PUSH_API_URL = "https://api.strava.com/api/v3/push_subscriptions" 
 
@@ -18,6 +31,116 @@ class StravaClient:
         self.client_secret = config.get("STRAVA_CLIENT_SECRET")
         self.refresh_token = config.get("STRAVA_REFRESH_TOKEN")
         self.access_token = self.config.get("STRAVA_ACCESS_TOKEN")
+        # URL de base de l'API (surchargée par les benchmarks pour viser un faux serveur local)
+        self.api_url = (config.get("STRAVA_API_URL") or STRAVA_API_URL).rstrip("/")
+        
+        # Profileur optionnel (SyncProfiler), attaché par le PollingScheduler le temps d'une exécution
+        self.profiler = None
+        
+        # Budget de requêtes partagé entre threads (téléchargement parallèle de l'historique)
+        self.min_request_interval = 0.1 # secondes entre deux requêtes
+        self.rate_limit_usage = None    # (utilisé sur 15 min, utilisé sur la journée)
+        self.rate_limit_limit = None    # (limite sur 15 min, limite sur la journée)
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+        self._budget_resume_time = 0.0  # fin de la pause en cours (budget des 15 minutes épuisé)
+        # Interrompt les attentes du budget (positionné par le PollingScheduler à l'arrêt)
+        self.stop_event = threading.Event()
+        
+        # Rafraîchissement du token partagé entre threads (polling, synchronisations manuelles)
+        self._token_lock = threading.Lock()
+        self.token_expires_at = 0
+        
+        # Cache HTTP (TTL + requêtes conditionnelles ETag) pour les GET répétés du polling
+        self.http_cache = HttpCache(ttl_seconds=config.get_int("STRAVA_CACHE_TTL", 60))
+
+    def _request(self, method: str, url: str, rate_limited: bool = True, **kwargs):
+        """
+        Envoie une requête HTTP vers Strava (chronométrée par endpoint si un profileur est attaché).
+        Toute requête vers l'API passe par le budget partagé (_wait_for_rate_budget) ; seuls les échanges
+        OAuth (rate_limited=False) n'y sont pas soumis.
+        """
+        if rate_limited:
+            self._wait_for_rate_budget()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = requests.request(method, url, **kwargs)
+            self._update_rate_limits(response)
+            return response
+        finally:
+            if self.profiler:
+                status_code = response.status_code if response is not None else None
+                self.profiler.record_request(method, url, time.perf_counter() - start, status_code)
+
+    def _update_rate_limits(self, response):
+        """Mémorise l'état du budget de requêtes renvoyé par Strava (en-têtes X-RateLimit / X-ReadRateLimit)."""
+        usage = response.headers.get('X-ReadRateLimit-Usage') or response.headers.get('X-RateLimit-Usage')
+        limit = response.headers.get('X-ReadRateLimit-Limit') or response.headers.get('X-RateLimit-Limit')
+        try:
+            if usage and limit:
+                self.rate_limit_usage = tuple(int(v) for v in usage.split(','))
+                self.rate_limit_limit = tuple(int(v) for v in limit.split(','))
+        except ValueError:
+            pass
+
+    def _wait_for_rate_budget(self):
+        """
+        Attend avant d'envoyer une requête : espacement minimal entre requêtes (tous threads confondus),
+        et pause jusqu'à la fenêtre suivante si le budget des 15 minutes est presque épuisé.
+        Le créneau est réservé sous le verrou, l'attente se fait hors du verrou et s'interrompt à l'arrêt.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            if self.rate_limit_usage and self.rate_limit_limit:
+                if self.rate_limit_usage[1] >= self.rate_limit_limit[1] - RATE_LIMIT_MARGIN:
+                    raise Exception("Limite journalière de l'API Strava atteinte. Réessayez demain.")
+                if (self.rate_limit_usage[0] >= self.rate_limit_limit[0] - RATE_LIMIT_MARGIN
+                        and self._budget_resume_time <= now):
+                    # Strava réinitialise le compteur à chaque quart d'heure (0, 15, 30, 45)
+                    pause = 900 - (time.time() % 900) + 1
+                    print(f"INFO: Budget Strava (15 min) presque épuisé. Pause de {int(pause)} s...")
+                    self._budget_resume_time = now + pause
+                    self.rate_limit_usage = (0, self.rate_limit_usage[1])
+            
+            slot = max(now, self._next_request_time, self._budget_resume_time)
+            self._next_request_time = slot + self.min_request_interval
+        
+        wait = slot - time.monotonic()
+        if wait > 0 and self.stop_event.wait(wait):
+            raise Exception("Arrêt en cours : requête Strava annulée.")
+
+    def _stage(self, name: str):
+        """Contexte de mesure d'une étape (sans effet si aucun profileur n'est attaché)."""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    def _get_json(self, url: str, params: dict = None, decode=loads):
+        """
+        GET JSON via le cache HTTP : servi directement si la même requête a été faite il y a moins
+        de STRAVA_CACHE_TTL secondes, sinon requête conditionnelle (304 = corps en cache réutilisé).
+        Le corps est décodé par 'decode' (ex: decode_activities pour une liste d'activités).
+        """
+        key = self.http_cache.make_key(url, params)
+        entry = self.http_cache.get_fresh(key)
+        if entry is not None:
+            return decode(entry.body)
+        
+        headers = dict(self._get_headers())
+        headers.update(self.http_cache.conditional_headers(key))
+        response = self._request("GET", url, headers=headers, params=params)
+        
+        if response.status_code == 304:
+            body = self.http_cache.not_modified(key)
+            if body is not None:
+                return decode(body)
+            # Entrée évincée entre-temps : on refait une requête complète
+            response = self._request("GET", url, headers=self._get_headers(), params=params)
+        
+        response.raise_for_status()
+        self.http_cache.store(key, response.content,
+                              etag=response.headers.get('ETag'),
+                              last_modified=response.headers.get('Last-Modified'))
+        return decode(response.content)
 
     def _get_headers(self):
         """Retourne les headers d'autorisation."""
@@ -46,9 +169,9 @@ class StravaClient:
             'code': code,
             'grant_type': 'authorization_code'
         }
-        response = requests.post(STRAVA_TOKEN_URL, data=payload)
+        response = self._request("POST", STRAVA_TOKEN_URL, rate_limited=False, data=payload)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
         
         new_refresh_token = data.get('refresh_token')
         self.config.set('STRAVA_REFRESH_TOKEN', new_refresh_token)
@@ -57,6 +180,7 @@ class StravaClient:
         new_access_token = data.get('access_token')
         self.config.set('STRAVA_ACCESS_TOKEN', new_access_token)
         self.access_token = new_access_token
+        self.token_expires_at = data.get('expires_at') or 0
         
         self.config.save_configuration({'STRAVA_REFRESH_TOKEN': new_refresh_token, 
                                         'STRAVA_ACCESS_TOKEN': new_access_token})
@@ -64,7 +188,16 @@ class StravaClient:
         return new_refresh_token
 
     def refresh_access_token(self):
-        """Rafraîchit le token d'accès en utilisant le refresh token."""
+        """
+        Rafraîchit le token d'accès en utilisant le refresh token.
+        Sans effet si le token courant est encore valide plus de 5 minutes (déjà rafraîchi par un autre thread).
+        """
+        with self._token_lock:
+            if self.access_token and self.token_expires_at - TOKEN_REFRESH_MARGIN > time.time():
+                return self.access_token
+            return self._refresh_access_token()
+
+    def _refresh_access_token(self):
         if not self.refresh_token:
             print("AVERTISSEMENT: Refresh Token Strava manquant. Impossible de rafraîchir l'Access Token.")
             return None 
@@ -77,11 +210,12 @@ class StravaClient:
         }
         
         try:
-            response = requests.post(STRAVA_TOKEN_URL, data=payload)
+            response = self._request("POST", STRAVA_TOKEN_URL, rate_limited=False, data=payload)
             response.raise_for_status()
-            data = response.json()
+            data = loads(response.content)
             
             self.access_token = data.get('access_token')
+            self.token_expires_at = data.get('expires_at') or 0
             if 'refresh_token' in data: 
                 # Strava peut renvoyer un nouveau refresh token, on l'enregistre
                 self.config.set('STRAVA_REFRESH_TOKEN', data.get('refresh_token'))
@@ -105,11 +239,27 @@ class StravaClient:
 
     def get_activity_details(self, activity_id):
         """Récupère les détails d'une activité spécifique."""
+        url = f"{self.api_url}/activities/{activity_id}"
+        return self._get_json(url)
+
+    def get_activity_streams(self, activity_id, keys=STRAVA_STREAM_KEYS):
+        """
+        Récupère les streams (séries temporelles) d'une activité : GPS, FC, puissance...
+        Retourne un dict {type de stream: liste de valeurs}. Les streams absents 
+        (ex: pas de capteur de puissance) ne figurent simplement pas dans le dict.
+        """
         headers = self._get_headers()
-        url = f"{STRAVA_API_URL}/activities/{activity_id}"
-        response = requests.get(url, headers=headers)
+        url = f"{self.api_url}/activities/{activity_id}/streams"
+        params = {'keys': ",".join(keys), 'key_by_type': 'true'}
+        response = self._request("GET", url, headers=headers, params=params)
+        
+        if response.status_code == 404:
+            # Activité manuelle (sans fichier GPS) : pas de streams
+            return {}
         response.raise_for_status()
-        return response.json()
+        
+        return {stream_type: stream.get('data', []) 
+                for stream_type, stream in loads(response.content).items()}
 
     # ----------------------------------------------------------------------
     # CORRECTION: Nouvelle méthode pour le Polling (récupère plus d'une activité)
@@ -119,14 +269,13 @@ class StravaClient:
         Récupère les N dernières activités de l'athlète (par défaut les 10 dernières).
         Utilisé pour le Polling périodique et la 'Sync. Rapide'.
         """
-        headers = self._get_headers()
         # Requête pour 1 page, N éléments, trié par défaut par date décroissante
-        url = f"{STRAVA_API_URL}/athlete/activities?per_page={per_page}&page=1" 
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        # (via le cache HTTP : un cycle sans nouvelle activité ne retélécharge pas la page)
+        url = f"{self.api_url}/athlete/activities"
         
-        # Retourne la liste des activités (ou une liste vide)
-        return response.json()
+        # Retourne la liste des activités (objets Activity, ou une liste vide)
+        return self._get_json(url, params={'per_page': per_page, 'page': 1},
+                              decode=decode_activities)
 
 
     # ----------------------------------------------------------------------
@@ -145,12 +294,12 @@ class StravaClient:
         print("INFO: Démarrage de la récupération de l'historique Strava (Pagination activée)...")
         
         while True:
-            url = f"{STRAVA_API_URL}/athlete/activities?per_page={per_page}&page={page}"
+            url = f"{self.api_url}/athlete/activities?per_page={per_page}&page={page}"
             
             try:
-                response = requests.get(url, headers=headers)
+                response = self._request("GET", url, headers=headers)
                 response.raise_for_status()
-                activities_page = response.json()
+                activities_page = decode_activities(response.content)
 
                 if not activities_page:
                     print(f"INFO: Page {page} vide. Fin de l'historique.")
@@ -165,7 +314,8 @@ class StravaClient:
                 
                 page += 1
                 # Ajout d'un petit délai pour respecter les limites de débit de l'API Strava (Rate Limiting)
-                time.sleep(0.5) 
+                with self._stage("strava_rate_limit_sleep"):
+                    time.sleep(0.5) 
 
             except requests.exceptions.HTTPError as e:
                 print(f"ERREUR HTTP lors de la pagination Strava à la page {page}: {e}")
@@ -179,6 +329,72 @@ class StravaClient:
         return all_activities
 
 
+    # ----------------------------------------------------------------------
+    # TÉLÉCHARGEMENT PARALLÈLE DE L'HISTORIQUE (découpage par fenêtres de dates)
+    # ----------------------------------------------------------------------
+    def get_first_activity_time(self):
+        """
+        Timestamp de la toute première activité de l'athlète, ou None s'il n'en a aucune.
+        Avec le paramètre 'after', Strava trie les activités par date croissante.
+        """
+        response = self._request("GET", f"{self.api_url}/athlete/activities",
+                                 headers=self._get_headers(),
+                                 params={'after': 0, 'per_page': 1, 'page': 1})
+        response.raise_for_status()
+        activities = decode_activities(response.content)
+        return activities[0].start_epoch if activities else None
+
+    def _get_activities_window(self, after, before, per_page=200):
+        """
+        Récupère toutes les activités d'une fenêtre [after, before] (pagination interne à la fenêtre).
+        Les fenêtres étant bornées dans le passé, leurs pages ne se décalent pas pendant le téléchargement.
+        Strava exclut les deux bornes : 'before' est repoussé d'une seconde pour qu'une activité commençant
+        pile sur la limite entre deux fenêtres ne soit perdue par aucune (doublons fusionnés par ID).
+        """
+        headers = self._get_headers()
+        activities = []
+        page = 1
+        while True:
+            response = self._request("GET", f"{self.api_url}/athlete/activities", headers=headers,
+                                     params={'after': int(after), 'before': int(before) + 1,
+                                             'per_page': per_page, 'page': page})
+            response.raise_for_status()
+            activities_page = decode_activities(response.content)
+            activities.extend(activities_page)
+            if len(activities_page) < per_page:
+                return activities
+            page += 1
+
+    def get_all_activities_sharded(self, max_workers=4):
+        """
+        Récupère l'historique COMPLET en découpant la période (de la première activité à maintenant)
+        en fenêtres 'after'/'before' téléchargées en parallèle, dans le respect du budget Strava.
+        Les résultats sont fusionnés sans doublon et triés du plus récent au plus ancien,
+        comme get_all_activities. Lève une exception si une fenêtre échoue (pas de résultat partiel).
+        """
+        first_time = self.get_first_activity_time()
+        if first_time is None:
+            print("INFO: Aucune activité Strava trouvée.")
+            return []
+        
+        # Plus de fenêtres que de threads : l'activité n'est pas répartie uniformément dans le temps
+        shard_count = max_workers * 4
+        start, end = first_time - 1, time.time() + 1
+        step = (end - start) / shard_count
+        windows = [(start + i * step, start + (i + 1) * step if i < shard_count - 1 else end)
+                   for i in range(shard_count)]
+        
+        print(f"INFO: Téléchargement de l'historique Strava en {shard_count} fenêtres ({max_workers} en parallèle)...")
+        activities_by_id = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for window_activities in executor.map(lambda w: self._get_activities_window(*w), windows):
+                for activity in window_activities:
+                    activities_by_id[activity.id] = activity
+        
+        all_activities = sorted(activities_by_id.values(), key=attrgetter('start_epoch'), reverse=True)
+        print(f"SUCCÈS: Historique Strava complet récupéré. Total: {len(all_activities)} activités.")
+        return all_activities
+
     # Les méthodes Webhook sont neutralisées en mode Polling.
     def subscribe_webhook(self, callback_url, verify_token):
         print("NOTE: La méthode Webhook n'est pas utilisée en mode Polling.")
@@ -0,0 +1,74 @@
+# models/stream_store.py
+import os
+import json
+import numpy as np
+
+# Types compacts par stream : on évite les float64/int64 par défaut de NumPy
+STREAM_DTYPES = {
+    "time": np.int32,
+    "distance": np.float32,
+    "heartrate": np.int16,
+    "watts": np.float32,
+    "velocity_smooth": np.float32,
+    "altitude": np.float32,
+    "latlng": np.float32,
+}
+
+
+class StreamStore:
+    """
+    Stockage local et compact des streams Strava : un fichier .npz compressé par activité,
+    plus un fichier JSON contenant les métriques déjà calculées (jamais recalculées).
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _streams_path(self, activity_id):
+        return os.path.join(self.cache_dir, f"{activity_id}.npz")
+
+    def _metrics_path(self, activity_id):
+        return os.path.join(self.cache_dir, f"{activity_id}.metrics.json")
+
+    def has_streams(self, activity_id) -> bool:
+        return os.path.exists(self._streams_path(activity_id))
+
+    def save_streams(self, activity_id, streams: dict):
+        """Convertit les listes JSON en tableaux NumPy typés et les écrit compressés sur disque."""
+        arrays = {}
+        for stream_type, values in streams.items():
+            dtype = STREAM_DTYPES.get(stream_type)
+            if dtype is None or not values:
+                continue
+            # latlng est une liste de paires [lat, lng] -> tableau (n, 2)
+            arrays[stream_type] = np.asarray(values, dtype=dtype)
+
+        # Écriture via un fichier temporaire pour ne jamais laisser un .npz tronqué
+        tmp_path = self._streams_path(activity_id) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, self._streams_path(activity_id))
+        return arrays
+
+    def load_streams(self, activity_id) -> dict:
+        """Charge les streams d'une activité (dict de tableaux NumPy), ou None si absents."""
+        if not self.has_streams(activity_id):
+            return None
+        with np.load(self._streams_path(activity_id)) as data:
+            return {key: data[key] for key in data.files}
+
+    def load_metrics(self, activity_id) -> dict:
+        """Retourne les métriques en cache pour une activité, ou None si jamais calculées."""
+        try:
+            with open(self._metrics_path(activity_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_metrics(self, activity_id, metrics: dict):
+        """Sauvegarde les métriques calculées pour ne plus jamais les recalculer."""
+        tmp_path = self._metrics_path(activity_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metrics, f)
+        os.replace(tmp_path, self._metrics_path(activity_id))
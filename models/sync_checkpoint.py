@@ -0,0 +1,74 @@
+# models/sync_checkpoint.py
+import os
+import json
+from dataclasses import asdict
+
+from models.activity import Activity
+
+# Nombre maximal d'ID déjà créés conservés (les plus récents : les ID Strava sont croissants)
+MAX_CREATED_IDS = 10000
+
+
+class SyncCheckpoint:
+    """
+    Point de reprise écrit à l'arrêt de l'application :
+    - les activités en file (ou dont l'écriture n'a pas pu se terminer dans le délai), reprises au
+      démarrage suivant ;
+    - les ID Strava déjà créés dans Notion par les dernières exécutions, pour ne pas les revérifier.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def save(self, database_id: str, pending_activities, created_ids):
+        """Écrit le checkpoint de façon atomique (fichier temporaire puis renommage)."""
+        self._write({
+            "database_id": database_id,
+            "pending": [asdict(activity) for activity in pending_activities],
+            "created_ids": sorted(created_ids, reverse=True)[:MAX_CREATED_IDS],
+        })
+
+    def append_pending(self, database_id: str, activities):
+        """Ajoute des activités en attente à un checkpoint déjà écrit (soumises après l'arrêt)."""
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+        if not isinstance(state, dict) or state.get("database_id") != database_id:
+            state = {"database_id": database_id, "pending": [], "created_ids": []}
+        known_ids = {fields.get("id") for fields in state.get("pending", [])}
+        state.setdefault("pending", []).extend(asdict(activity) for activity in activities
+                                               if activity.id not in known_ids)
+        self._write(state)
+
+    def _write(self, state: dict):
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.file_path)
+
+    def load(self):
+        """Retourne (database_id, activités en attente, ID créés), ou None s'il n'y a pas de checkpoint."""
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"AVERTISSEMENT: Checkpoint de synchronisation illisible, ignoré : {e}")
+            return None
+        try:
+            pending = [Activity(**fields) for fields in state.get("pending", [])]
+        except (TypeError, KeyError, AttributeError) as e:
+            # Checkpoint écrit par une autre version du modèle Activity : abandonné
+            print(f"AVERTISSEMENT: Checkpoint de synchronisation incompatible, ignoré : {e}")
+            self.clear()
+            return None
+        return state.get("database_id"), pending, state.get("created_ids", [])
+
+    def clear(self):
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
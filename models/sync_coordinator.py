@@ -0,0 +1,81 @@
+# models/sync_coordinator.py
+import threading
+
+
+class SyncCoordinator:
+    """
+    Coordination des synchronisations qui se chevauchent (boucle de polling, « Sync. Rapide »,
+    « Sync. Historique ») :
+    - une seule exécution active par clé (base Notion cible, type de synchronisation) ;
+    - les déclenchements reçus pendant une exécution sont fusionnés en UNE exécution de suivi,
+      lancée dès la fin de l'exécution en cours ;
+    - un ID Strava ne peut être en cours de création que dans un seul worker à la fois, et une
+      activité déjà créée par ce processus n'est jamais recréée (pas de doublon Notion, même si
+      l'index de recherche de Notion n'est pas encore à jour).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = set()   # clés en cours d'exécution
+        self._pending = set()   # clés redéclenchées pendant leur exécution
+        self._in_flight = set() # (base, ID Strava) en cours de création
+        self._created = set()   # (base, ID Strava) créées par ce processus
+
+    def run(self, key, task, follow_up: bool = True) -> bool:
+        """
+        Exécute task() dans le thread appelant si aucune exécution n'est active pour cette clé,
+        puis autant d'exécutions de suivi que nécessaire (au plus une par série de déclenchements).
+        Retourne False si le déclenchement a été fusionné dans l'exécution en cours
+        (ou simplement ignoré si follow_up est False).
+        """
+        with self._lock:
+            if key in self._running:
+                if follow_up:
+                    self._pending.add(key)
+                return False
+            self._running.add(key)
+
+        try:
+            while True:
+                task()
+                with self._lock:
+                    if key not in self._pending:
+                        self._running.discard(key)
+                        return True
+                    self._pending.discard(key)
+        except BaseException:
+            with self._lock:
+                self._running.discard(key)
+                self._pending.discard(key)
+            raise
+
+    def is_running(self, key) -> bool:
+        with self._lock:
+            return key in self._running
+
+    def claim_activity(self, database_id, activity_id) -> bool:
+        """Réserve la création d'une activité. False si elle est déjà en cours ou déjà créée."""
+        claim = (database_id, activity_id)
+        with self._lock:
+            if claim in self._in_flight or claim in self._created:
+                return False
+            self._in_flight.add(claim)
+            return True
+
+    def release_activity(self, database_id, activity_id, created: bool):
+        """Libère la réservation ; si la page a été créée, l'activité ne sera plus jamais réservée."""
+        claim = (database_id, activity_id)
+        with self._lock:
+            self._in_flight.discard(claim)
+            if created:
+                self._created.add(claim)
+
+    def created_ids(self, database_id) -> list:
+        """ID Strava créés dans cette base par ce processus (ou rechargés depuis un checkpoint)."""
+        with self._lock:
+            return [activity_id for db, activity_id in self._created if db == database_id]
+
+    def mark_created(self, database_id, activity_ids):
+        """Enregistre des ID déjà présents dans la base (reprise depuis un checkpoint)."""
+        with self._lock:
+            self._created.update((database_id, activity_id) for activity_id in activity_ids)
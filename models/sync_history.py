@@ -0,0 +1,149 @@
+# models/sync_history.py
+import os
+import sys
+import glob
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+
+SEGMENT_PATTERN = "sync_history.{:06d}.jsonl"
+INDEX_FILE = "sync_history_index.sqlite"
+
+
+class SyncHistory:
+    """
+    Journal des événements de synchronisation : fichiers JSON-lines en ajout seul, avec rotation
+    par taille (segments numérotés), et un petit index SQLite (ID d'activité, date -> segment, offset)
+    pour retrouver instantanément l'historique d'une activité, même après des mois de polling.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 10):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._index = sqlite3.connect(os.path.join(self.directory, INDEX_FILE), check_same_thread=False)
+        self._index.execute("""CREATE TABLE IF NOT EXISTS events (
+                                   activity_id INTEGER, epoch REAL, day TEXT,
+                                   segment INTEGER, offset INTEGER)""")
+        self._index.execute("CREATE INDEX IF NOT EXISTS idx_activity ON events (activity_id)")
+        self._index.execute("CREATE INDEX IF NOT EXISTS idx_day ON events (day)")
+        self._index.commit()
+
+        segments = self._list_segments()
+        self._segment = segments[-1] if segments else 1
+
+    def _list_segments(self):
+        numbers = []
+        for path in glob.glob(os.path.join(self.directory, "sync_history.*.jsonl")):
+            try:
+                numbers.append(int(os.path.basename(path).split(".")[1]))
+            except ValueError:
+                continue
+        return sorted(numbers)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, SEGMENT_PATTERN.format(segment))
+
+    def _rotate_if_needed(self):
+        """Passe au segment suivant si le courant est plein, et supprime les plus anciens."""
+        path = self._segment_path(self._segment)
+        if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            self._segment += 1
+            segments = self._list_segments()
+            for old_segment in segments[:max(0, len(segments) - self.backup_count)]:
+                os.remove(self._segment_path(old_segment))
+                self._index.execute("DELETE FROM events WHERE segment = ?", (old_segment,))
+            self._index.commit()
+
+    def record(self, activity_id, action: str, latency_ms: float = None, error: str = None,
+               sync_type: str = None, activity_date: str = None):
+        """Ajoute un événement (ex: action 'created' ou 'failed') au journal et à l'index."""
+        now = time.time()
+        event = {
+            "ts": datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+            "activity_id": activity_id,
+            "action": action,
+            "latency_ms": round(latency_ms, 1) if latency_ms is not None else None,
+            "error": error,
+            "sync_type": sync_type,
+            "activity_date": activity_date,
+        }
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with self._lock:
+            self._rotate_if_needed()
+            with open(self._segment_path(self._segment), "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            self._index.execute("INSERT INTO events VALUES (?, ?, ?, ?, ?)",
+                                (activity_id, now, event["ts"][:10], self._segment, offset))
+            self._index.commit()
+
+    def _read_events(self, rows):
+        events = []
+        for segment, offset in rows:
+            try:
+                with open(self._segment_path(segment), "rb") as f:
+                    f.seek(offset)
+                    events.append(json.loads(f.readline()))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue # Segment supprimé par la rotation entre-temps
+        return events
+
+    def history_for(self, activity_id) -> list:
+        """Tous les événements connus pour une activité, du plus ancien au plus récent."""
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT segment, offset FROM events WHERE activity_id = ? ORDER BY epoch",
+                (int(activity_id),)).fetchall()
+            return self._read_events(rows)
+
+    def events_between(self, day_from: str, day_to: str) -> list:
+        """Événements enregistrés entre deux dates incluses (format AAAA-MM-JJ)."""
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT segment, offset FROM events WHERE day BETWEEN ? AND ? ORDER BY epoch",
+                (day_from, day_to)).fetchall()
+            return self._read_events(rows)
+
+    def close(self):
+        with self._lock:
+            self._index.close()
+
+
+def format_event(event: dict) -> str:
+    """Représentation lisible d'un événement (utilisée par la CLI et le tableau de bord)."""
+    text = f"{event['ts']}  activité {event['activity_id']}  {event['action']}"
+    if event.get("sync_type"):
+        text += f"  ({event['sync_type']})"
+    if event.get("latency_ms") is not None:
+        text += f"  {event['latency_ms']} ms"
+    if event.get("error"):
+        text += f"  ERREUR: {event['error']}"
+    return text
+
+
+if __name__ == '__main__':
+    # Consultation en ligne de commande :
+    #   python -m models.sync_history <ID activité>
+    #   python -m models.sync_history <AAAA-MM-JJ> [<AAAA-MM-JJ>]
+    if len(sys.argv) < 2:
+        print("Usage : python -m models.sync_history <ID activité> | <date début> [<date fin>]")
+        sys.exit(1)
+
+    from models.config_manager import ConfigManager
+    history = SyncHistory(ConfigManager().get("SYNC_HISTORY_DIR"))
+    if sys.argv[1].isdigit():
+        events = history.history_for(int(sys.argv[1]))
+    else:
+        events = history.events_between(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else sys.argv[1])
+
+    for event in events:
+        print(format_event(event))
+    if not events:
+        print("Aucun événement trouvé.")
@@ -0,0 +1,134 @@
+# models/sync_profiler.py
+import os
+import re
+import io
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Segments d'URL variables (IDs numériques, UUID Notion) remplacés par {id} pour regrouper les endpoints
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{32}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$', re.IGNORECASE)
+
+
+def normalize_endpoint(method: str, url: str) -> str:
+    """Ex: POST https://api.notion.com/v1/databases/<uuid>/query -> 'POST api.notion.com/v1/databases/{id}/query'."""
+    parsed = urlparse(url)
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment
+                for segment in parsed.path.split('/')]
+    return f"{method.upper()} {parsed.netloc}{'/'.join(segments)}"
+
+
+class SyncProfiler:
+    """
+    Instrumentation opt-in d'une exécution de synchronisation : temps mural par étape
+    et par endpoint HTTP, avec capture cProfile ou pyinstrument optionnelle.
+    """
+
+    def __init__(self, run_name: str, backend: str = None):
+        self.run_name = run_name
+        self.backend = backend # None, 'cprofile' ou 'pyinstrument'
+        self._lock = threading.Lock()
+        self._stages = {}      # nom -> [appels, temps total]
+        self._endpoints = {}   # endpoint -> [appels, temps total, temps max, erreurs]
+        self._started_at = None
+        self._wall_time = 0.0
+        self._profiler = None
+
+    def start(self):
+        """Démarre la mesure (et le profileur Python si demandé)."""
+        self._started_at = time.perf_counter()
+        if self.backend == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.backend == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("AVERTISSEMENT: pyinstrument n'est pas installé. Profilage détaillé désactivé.")
+            else:
+                self._profiler = Profiler()
+                self._profiler.start()
+
+    def stop(self):
+        """Arrête la mesure."""
+        if self._started_at is not None:
+            self._wall_time = time.perf_counter() - self._started_at
+        if self.backend == 'cprofile' and self._profiler:
+            self._profiler.disable()
+        elif self.backend == 'pyinstrument' and self._profiler:
+            self._profiler.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mesure le temps mural passé dans une étape (cumulé sur tous les appels)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stages.setdefault(name, [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+
+    def record_request(self, method: str, url: str, elapsed: float, status_code=None):
+        """Enregistre la durée d'une requête HTTP, regroupée par endpoint."""
+        endpoint = normalize_endpoint(method, url)
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            if status_code is None or status_code >= 400:
+                stats[3] += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "run": self.run_name,
+                "wall_time_s": round(self._wall_time, 3),
+                "stages": {name: {"calls": calls, "total_s": round(total, 3)}
+                           for name, (calls, total) in self._stages.items()},
+                "endpoints": {endpoint: {"calls": calls, "total_s": round(total, 3),
+                                         "avg_ms": round(total / calls * 1000, 1),
+                                         "max_ms": round(worst * 1000, 1), "errors": errors}
+                              for endpoint, (calls, total, worst, errors) in self._endpoints.items()},
+            }
+
+    def report_lines(self) -> list:
+        """Tableau récapitulatif (une ligne par étape puis par endpoint), trié par temps décroissant."""
+        data = self.to_dict()
+        wall = data["wall_time_s"] or 1e-9
+        lines = [f"PROFIL '{self.run_name}' : durée totale {data['wall_time_s']:.2f} s",
+                 f"{'Étape':<40}{'Appels':>8}{'Total (s)':>12}{'% run':>8}"]
+        for name, stats in sorted(data["stages"].items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{name:<40}{stats['calls']:>8}{stats['total_s']:>12.2f}{stats['total_s'] / wall * 100:>7.1f}%")
+        lines.append(f"{'Endpoint HTTP':<60}{'Appels':>8}{'Total (s)':>12}{'Moy (ms)':>10}{'Max (ms)':>10}{'Err':>5}")
+        for endpoint, stats in sorted(data["endpoints"].items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{endpoint[:60]:<60}{stats['calls']:>8}{stats['total_s']:>12.2f}"
+                         f"{stats['avg_ms']:>10.1f}{stats['max_ms']:>10.1f}{stats['errors']:>5}")
+        return lines
+
+    def save(self, output_dir: str) -> str:
+        """Sauvegarde le rapport JSON (et le profil détaillé éventuel). Retourne le chemin du JSON."""
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{re.sub(r'[^A-Za-z0-9]+', '_', self.run_name)}"
+        json_path = os.path.join(output_dir, base_name + ".json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+        if self.backend == 'cprofile' and self._profiler:
+            import pstats
+            self._profiler.dump_stats(os.path.join(output_dir, base_name + ".prof"))
+            summary = io.StringIO()
+            pstats.Stats(self._profiler, stream=summary).sort_stats("cumulative").print_stats(30)
+            with open(os.path.join(output_dir, base_name + ".txt"), "w", encoding="utf-8") as f:
+                f.write(summary.getvalue())
+        elif self.backend == 'pyinstrument' and self._profiler:
+            with open(os.path.join(output_dir, base_name + ".html"), "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+        return json_path
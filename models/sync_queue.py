@@ -0,0 +1,72 @@
+# models/sync_queue.py
+import queue
+import itertools
+import threading
+
+# Priorités de la file (la plus petite valeur passe en premier)
+PRIORITY_HIGH = 0   # polling périodique, synchronisation rapide
+PRIORITY_LOW = 10   # synchronisation historique (rattrapage)
+
+
+class SyncBatch:
+    """
+    Lot d'activités soumis par une synchronisation (polling, rapide, historique).
+    Suit l'avancement du lot pendant que les workers le traitent et permet d'attendre sa fin.
+    """
+
+    def __init__(self, sync_type: str, total: int, synced_ids=None, routes=None):
+        self.sync_type = sync_type
+        self.total = total
+        self.synced_ids = synced_ids   # résultat du pré-scan Notion, ou None
+        self.routes = routes or {}     # ID Strava -> résumé du tracé (étape CPU)
+        self.done = 0
+        self.synced = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        if total == 0:
+            self._finished.set()
+
+    def task_done(self, synced: bool) -> int:
+        """Marque une activité comme traitée. Retourne le nombre d'activités traitées du lot."""
+        with self._lock:
+            self.done += 1
+            self.synced += int(synced)
+            if self.done >= self.total:
+                self._finished.set()
+            return self.done
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._finished.wait(timeout)
+
+
+class SyncQueue:
+    """
+    File de travail unique et priorisée entre les synchronisations et les workers Notion.
+    Les activités récentes (PRIORITY_HIGH) doublent le rattrapage historique (PRIORITY_LOW) ;
+    à priorité égale, l'ordre d'arrivée est conservé.
+    """
+
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+
+    def put(self, priority: int, activity, batch: SyncBatch):
+        self._queue.put((priority, next(self._counter), activity, batch))
+
+    def get(self, timeout: float = None):
+        """Retourne (activité, lot) de plus haute priorité. Lève queue.Empty après timeout."""
+        _, _, activity, batch = self._queue.get(timeout=timeout)
+        return activity, batch
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def drain(self) -> list:
+        """Retire sans attendre toutes les entrées restantes : liste de (activité, lot)."""
+        items = []
+        while True:
+            try:
+                _, _, activity, batch = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            items.append((activity, batch))
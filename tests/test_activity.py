@@ -0,0 +1,49 @@
+# tests/test_activity.py
+"""
+Décodage des pages /athlete/activities en Activity (models/activity.py) : le chemin msgspec
+(Activity.from_struct) et le chemin dict (Activity.from_strava) doivent donner les mêmes activités.
+
+Usage : python -m pytest tests/
+"""
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import json_codec
+from models.activity import decode_activities
+
+pytest.importorskip("msgspec")
+
+PAGE = json.dumps([
+    {"id": 1, "name": "Sortie", "type": "Ride", "sport_type": "Ride", "start_date": "2024-03-30T23:30:00Z",
+     "start_date_local": "2024-03-31T00:30:00Z", "distance": 42195.0, "moving_time": 5400,
+     "total_elevation_gain": 350.5, "average_heartrate": 142.0, "suffer_score": 87,
+     "map": {"id": "a1", "summary_polyline": "_p~iF~ps|U_ulLnnqC", "resource_state": 2},
+     "kudos_count": 12, "athlete": {"id": 7}},
+    {"id": 2, "name": None, "start_date": "2024-07-15T07:00:00Z", "map": None, "description": None},
+    {"id": 3},
+]).encode("utf-8")
+
+
+def test_struct_and_dict_paths_build_same_activities(monkeypatch):
+    assert json_codec.decode_activity_structs(PAGE) is not None
+    with_structs = decode_activities(PAGE)
+    monkeypatch.setattr(json_codec, "msgspec", None)
+    assert json_codec.decode_activity_structs(PAGE) is None
+    assert decode_activities(PAGE) == with_structs
+    assert with_structs[0].summary_polyline == "_p~iF~ps|U_ulLnnqC"
+    assert with_structs[0].distance_km == pytest.approx(42.195)
+    assert with_structs[1].name == "Activité sans nom"
+    assert with_structs[2].start_epoch == 0
+
+
+def test_unexpected_type_falls_back_to_dicts():
+    page = json.dumps([{"id": 1, "moving_time": 5400.5, "start_date": "2024-03-31T01:30:00Z"}]).encode("utf-8")
+    assert json_codec.decode_activity_structs(page) is None
+    activity, = decode_activities(page)
+    assert activity.duration_min == pytest.approx(90.008, abs=1e-3)
+    assert activity.start_epoch == 1711848600
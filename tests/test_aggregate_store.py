@@ -0,0 +1,40 @@
+# tests/test_aggregate_store.py
+"""
+Agrégats semaine/mois (models/aggregate_store.py) : jour de rattachement des activités.
+
+Usage : python -m pytest tests/
+"""
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.activity import Activity
+from models.aggregate_store import AggregateStore
+
+
+def test_dateless_activity_is_not_aggregated(tmp_path):
+    store = AggregateStore(str(tmp_path / "aggregates.json"))
+    affected = store.add_activities([Activity(id=1, distance_km=10.0, duration_min=60.0)])
+    assert affected == set()
+    assert "1970-01" not in store._state["periods"]
+    assert store._state["fitness"] == {}
+    assert store.pending_periods() == []
+
+
+def test_activity_without_local_date_uses_utc_day(tmp_path):
+    store = AggregateStore(str(tmp_path / "aggregates.json"))
+    today = date.today().isoformat()
+    store.add_activities([Activity(id=1, start_date=f"{today}T12:00:00Z", duration_min=30.0)])
+    assert store._state["activities"]["1"][0] == today
+    assert min(store._state["fitness"]) == today
+
+
+def test_local_day_is_used_when_known(tmp_path):
+    store = AggregateStore(str(tmp_path / "aggregates.json"))
+    # 23:30 UTC le 30/03 = 00:30 le 31/03 à Paris
+    store.add_activities([Activity(id=1, start_date="2024-03-30T23:30:00Z",
+                                   start_date_local="2024-03-31T00:30:00Z", duration_min=30.0)])
+    assert store._state["activities"]["1"][0] == "2024-03-31"
+    assert store.get_period("2024-03")["count"] == 1
@@ -0,0 +1,97 @@
+# tests/test_date_utils.py
+"""
+Conversions de dates Strava -> timestamps (models/date_utils.py), en particulier autour des changements
+d'heure : le jour local d'une activité doit être celui de l'heure murale enregistrée par Strava.
+
+Usage : python -m pytest tests/
+"""
+import os
+import sys
+from datetime import datetime, date, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import date_utils
+from models.date_utils import parse_epoch, parse_epochs, epoch_to_day, utc_offset_seconds
+
+PARIS = ZoneInfo("Europe/Paris")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def strava_dates(utc_text: str, zone: ZoneInfo):
+    """(start_date, start_date_local) tels que Strava les renvoie : l'heure locale est elle aussi suffixée par 'Z'."""
+    start = datetime.fromisoformat(utc_text).replace(tzinfo=timezone.utc)
+    local = start.astimezone(zone).replace(tzinfo=None)
+    return start.strftime("%Y-%m-%dT%H:%M:%SZ"), local.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# (départ UTC, fuseau, jour local attendu, jour UTC attendu, décalage attendu)
+DST_CASES = [
+    # Paris, passage à l'heure d'été le 31/03/2024 à 01:00 UTC (02:00 -> 03:00)
+    ("2024-03-31T00:30:00", PARIS, date(2024, 3, 31), date(2024, 3, 31), 3600),    # 01:30 CET
+    ("2024-03-31T01:30:00", PARIS, date(2024, 3, 31), date(2024, 3, 31), 7200),    # 03:30 CEST
+    ("2024-03-30T23:30:00", PARIS, date(2024, 3, 31), date(2024, 3, 30), 3600),    # 00:30, après minuit local
+    ("2024-03-30T22:45:00", PARIS, date(2024, 3, 30), date(2024, 3, 30), 3600),    # 23:45, traverse minuit
+    # Paris, retour à l'heure d'hiver le 27/10/2024 à 01:00 UTC (03:00 -> 02:00)
+    ("2024-10-27T00:30:00", PARIS, date(2024, 10, 27), date(2024, 10, 27), 7200),  # 02:30 CEST
+    ("2024-10-27T01:30:00", PARIS, date(2024, 10, 27), date(2024, 10, 27), 3600),  # 02:30 CET
+    ("2024-10-26T22:30:00", PARIS, date(2024, 10, 27), date(2024, 10, 26), 7200),  # 00:30, après minuit local
+    ("2024-10-27T22:45:00", PARIS, date(2024, 10, 27), date(2024, 10, 27), 3600),  # 23:45, traverse minuit
+    # New York, heure d'été le 10/03/2024 à 07:00 UTC (02:00 -> 03:00)
+    ("2024-03-10T06:30:00", NEW_YORK, date(2024, 3, 10), date(2024, 3, 10), -18000),  # 01:30 EST
+    ("2024-03-10T07:30:00", NEW_YORK, date(2024, 3, 10), date(2024, 3, 10), -14400),  # 03:30 EDT
+    ("2024-03-10T04:45:00", NEW_YORK, date(2024, 3, 9), date(2024, 3, 10), -18000),   # 23:45 la veille
+    # New York, heure d'hiver le 03/11/2024 à 06:00 UTC (02:00 -> 01:00)
+    ("2024-11-03T05:30:00", NEW_YORK, date(2024, 11, 3), date(2024, 11, 3), -14400),  # 01:30 EDT
+    ("2024-11-03T06:30:00", NEW_YORK, date(2024, 11, 3), date(2024, 11, 3), -18000),  # 01:30 EST
+    ("2024-11-03T03:45:00", NEW_YORK, date(2024, 11, 2), date(2024, 11, 3), -14400),  # 23:45 la veille
+]
+
+
+@pytest.mark.parametrize("utc_text, zone, local_day, utc_day, offset", DST_CASES)
+def test_local_day_around_dst_transitions(utc_text, zone, local_day, utc_day, offset):
+    start_date, start_date_local = strava_dates(utc_text, zone)
+    start_epoch, local_epoch = parse_epoch(start_date), parse_epoch(start_date_local)
+    assert epoch_to_day(local_epoch) == local_day
+    assert epoch_to_day(start_epoch) == utc_day
+    assert utc_offset_seconds(start_epoch, local_epoch) == offset
+
+
+def test_utc_offset_winter_and_summer():
+    winter = strava_dates("2024-01-15T07:00:00", PARIS)
+    summer = strava_dates("2024-07-15T07:00:00", PARIS)
+    assert utc_offset_seconds(parse_epoch(winter[0]), parse_epoch(winter[1])) == 3600
+    assert utc_offset_seconds(parse_epoch(summer[0]), parse_epoch(summer[1])) == 7200
+
+
+def test_parse_epoch_formats():
+    assert parse_epoch("") == 0
+    assert parse_epoch(None) == 0
+    assert parse_epoch("1970-01-01T00:00:00Z") == 0
+    assert parse_epoch("2024-03-31T01:30:00Z") == 1711848600
+    # Décalage explicite et date sans fuseau (comptée comme UTC)
+    assert parse_epoch("2024-03-31T03:30:00+02:00") == 1711848600
+    assert parse_epoch("2024-03-31T01:30:00") == 1711848600
+
+
+def test_parse_epochs_matches_parse_epoch():
+    values = [strava_dates(utc_text, zone)[i] for utc_text, zone, *_ in DST_CASES for i in (0, 1)]
+    assert parse_epochs(values) == [parse_epoch(v) for v in values]
+    assert parse_epochs(iter(values)) == [parse_epoch(v) for v in values]
+    assert parse_epochs([]) == []
+
+
+def test_parse_epochs_fallback_without_z_suffix():
+    # Une seule valeur sans 'Z' (ou vide) : conversion valeur par valeur, résultats identiques
+    values = ["2024-03-31T01:30:00Z", "2024-03-31T03:30:00+02:00", "", "2024-10-27T01:30:00Z"]
+    assert parse_epochs(values) == [1711848600, 1711848600, 0, 1729992600]
+
+
+def test_parse_epochs_without_numpy(monkeypatch):
+    values = [strava_dates(utc_text, zone)[1] for utc_text, zone, *_ in DST_CASES]
+    expected = parse_epochs(values)
+    monkeypatch.setattr(date_utils, "np", None)
+    assert parse_epochs(values) == expected == [parse_epoch(v) for v in values]
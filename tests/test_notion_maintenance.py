@@ -0,0 +1,35 @@
+# tests/test_notion_maintenance.py
+"""
+Détection des doublons (models/notion_maintenance.py) : page conservée = la plus ancienne,
+puis le plus petit ID de page.
+
+Usage : python -m pytest tests/
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.notion_maintenance import find_duplicates
+
+
+class FakeNotionClient:
+    """Ne fournit que l'API publique utilisée par find_duplicates."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def iter_strava_id_pages(self, progress_callback=None):
+        yield from self.pages
+
+
+def test_find_duplicates_keeps_oldest_page():
+    client = FakeNotionClient([
+        (1, "2024-05-02T10:00:00.000Z", "page-b"),
+        (2, "2024-05-01T10:00:00.000Z", "page-c"),
+        (1, "2024-05-01T10:00:00.000Z", "page-z"),
+        (1, "2024-05-01T10:00:00.000Z", "page-a"),
+    ])
+    assert find_duplicates(client) == {1: [("2024-05-01T10:00:00.000Z", "page-a"),
+                                           ("2024-05-01T10:00:00.000Z", "page-z"),
+                                           ("2024-05-02T10:00:00.000Z", "page-b")]}
@@ -0,0 +1,65 @@
+# tests/test_polyline.py
+"""
+Tracés (models/polyline.py) : le chemin NumPy et le repli en Python pur doivent donner le même résumé,
+sinon la détection des parcours identiques (route_index) dépendrait de la présence de NumPy.
+
+Usage : python -m pytest tests/
+"""
+import os
+import sys
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import polyline
+from models.polyline import encode, decode, route_summary
+
+pytest.importorskip("numpy")
+
+
+def make_route(seed: int, count: int = 300):
+    """Tracé irrégulier : points serrés au début (virages), espacés ensuite."""
+    rng = random.Random(seed)
+    lat, lon = 45.0 + rng.random(), 5.0 + rng.random()
+    points = []
+    for i in range(count):
+        step = 0.0002 if i < count // 2 else 0.01
+        lat += rng.uniform(-step, step * 2)
+        lon += rng.uniform(-step, step * 2)
+        points.append((lat, lon))
+    return encode(points)
+
+
+def summary_without_numpy(monkeypatch, encoded: str) -> dict:
+    with monkeypatch.context() as patch:
+        patch.setattr(polyline, "np", None)
+        return route_summary(encoded)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_route_summary_same_with_and_without_numpy(monkeypatch, seed):
+    encoded = make_route(seed)
+    vectorised = route_summary(encoded)
+    pure_python = summary_without_numpy(monkeypatch, encoded)
+    assert vectorised["points"] == pure_python["points"]
+    assert vectorised["route_distance_km"] == pytest.approx(pure_python["route_distance_km"], abs=1e-3)
+    for key in ("start_latlng", "mid_latlng", "end_latlng"):
+        assert vectorised[key] == pytest.approx(pure_python[key], abs=1e-9)
+
+
+def test_midpoint_is_taken_by_distance(monkeypatch):
+    # 100 points serrés sur ~110 m, puis 10 points espacés de ~1,1 km : la mi-distance (~5,6 km)
+    # tombe au 5e point espacé, alors que le point du milieu en nombre de points est encore au départ
+    points = [(45.0 + i * 0.00001, 5.0) for i in range(100)] + [(45.001 + i * 0.01, 5.0) for i in range(1, 11)]
+    encoded = encode(points)
+    expected = decode(encoded)[104]
+    assert route_summary(encoded)["mid_latlng"] == pytest.approx(expected)
+    assert summary_without_numpy(monkeypatch, encoded)["mid_latlng"] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("encoded", ["", "é€"])
+def test_missing_or_invalid_route(monkeypatch, encoded):
+    assert route_summary(encoded) is None
+    assert summary_without_numpy(monkeypatch, encoded) is None